@@ -2,8 +2,9 @@
 
 from datetime import datetime
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from fastapi.responses import RedirectResponse
+import orjson
 import structlog
 
 from core.usecases.auth_usecases import AuthenticationUseCases
@@ -82,35 +83,26 @@ async def create_account(
 )
 async def list_accounts(
     auth_usecases: AuthenticationUseCases = Depends(get_auth_usecases)
-) -> AccountListResponse:
+) -> Response:
     """List all accounts."""
     try:
         accounts_data = await auth_usecases.get_all_accounts()
         
-        account_responses = []
-        for account_data in accounts_data:
-            account = account_data["account"]
-            account_responses.append(
-                AccountResponse(
-                    id=account["id"],
-                    email=account["email"],
-                    user_id=account["user_id"],
-                    tenant_id=account["tenant_id"],
-                    client_id=account["client_id"],
-                    authentication_flow=account["authentication_flow"],
-                    status=account["status"],
-                    scopes=account["scopes"],
-                    created_at=account["created_at"],
-                    updated_at=account.get("updated_at"),
-                    last_authenticated_at=account.get("last_authenticated_at")
-                )
-            )
-        
-        return AccountListResponse(
-            accounts=account_responses,
-            total=len(account_responses)
+        # Account dicts already carry exactly the AccountResponse fields, so
+        # encode them directly instead of building a response model per row
+        accounts = [account_data["account"] for account_data in accounts_data]
+        payload = orjson.dumps(
+            {
+                "success": True,
+                "message": None,
+                "accounts": accounts,
+                "total": len(accounts)
+            },
+            option=orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
         )
         
+        return Response(content=payload, media_type="application/json")
+        
     except Exception as e:
         logger.error("Failed to list accounts", error=str(e))
         raise HTTPException(
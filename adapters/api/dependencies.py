@@ -1,18 +1,24 @@
 """FastAPI dependencies."""
 
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from config.settings import get_settings, Settings
 from adapters.db.database import get_database_adapter, DatabaseAdapter
+from adapters.db.repository_adapter import DatabaseRepositoryAdapter, get_repository_adapter
 from adapters.db.repositories import (
     AccountRepository, AuthFlowRepository, TokenRepository,
     MailRepository, MailQueryHistoryRepository, DeltaLinkRepository,
     WebhookRepository, ExternalAPIRepository, AuthenticationLogRepository
 )
 from adapters.external.oauth_client import OAuthClientAdapter
-from adapters.external.graph_client import GraphAPIClientAdapter
+from adapters.external.graph_client import GraphAPIClientAdapter, get_graph_client_adapter
+from adapters.external.external_api_client import (
+    ExternalAPIClientAdapter, get_external_api_client_adapter
+)
+from core.domain.entities import AuthenticationLog, ExternalAPICall, MailQueryHistory
+from core.services.write_queue import BatchingWriteQueue
 from core.usecases.auth_usecases import AuthenticationUseCases
 from core.usecases.mail_usecases import MailUseCases
 
@@ -89,6 +95,49 @@ async def get_auth_log_repository(
     return AuthenticationLogRepository(session)
 
 
+async def get_repositories() -> DatabaseRepositoryAdapter:
+    """Get the shared repository adapter.
+    
+    Unlike the session-bound repositories above, it opens a session per
+    call or unit of work, so use cases may call it from concurrent tasks.
+    """
+    settings = get_settings()
+    return get_repository_adapter(get_database_adapter(settings))
+
+
+_write_queue: Optional[BatchingWriteQueue] = None
+
+
+def get_write_queue() -> BatchingWriteQueue:
+    """Get the application's shared write queue.
+    
+    It batches authentication logs, external API call records and query
+    history across requests and writes them through the shared repository
+    adapter, never through a request's session. The application lifespan
+    starts and closes it.
+    """
+    global _write_queue
+    
+    if _write_queue is None:
+        repo_adapter = get_repository_adapter(get_database_adapter(get_settings()))
+        _write_queue = BatchingWriteQueue({
+            AuthenticationLog: repo_adapter.save_auth_logs,
+            ExternalAPICall: repo_adapter.save_api_calls,
+            MailQueryHistory: repo_adapter.save_query_histories
+        })
+    
+    return _write_queue
+
+
+async def close_write_queue() -> None:
+    """Write the shared queue's records and stop it."""
+    global _write_queue
+    
+    if _write_queue is not None:
+        await _write_queue.aclose()
+        _write_queue = None
+
+
 async def get_oauth_client() -> OAuthClientAdapter:
     """Get OAuth client."""
     settings = get_settings()
@@ -96,9 +145,15 @@ async def get_oauth_client() -> OAuthClientAdapter:
 
 
 async def get_graph_client() -> GraphAPIClientAdapter:
-    """Get Graph API client."""
+    """Get the shared Graph API client."""
     settings = get_settings()
-    return GraphAPIClientAdapter(settings)
+    return get_graph_client_adapter(settings)
+
+
+async def get_external_api_client() -> ExternalAPIClientAdapter:
+    """Get the shared external API client."""
+    settings = get_settings()
+    return get_external_api_client_adapter(settings)
 
 
 async def get_auth_usecases(
@@ -116,28 +171,32 @@ async def get_auth_usecases(
         token_repo=token_repo,
         auth_log_repo=auth_log_repo,
         oauth_client=oauth_client,
-        config=settings
+        config=settings,
+        write_queue=get_write_queue()
     )
 
 
 async def get_mail_usecases(
-    account_repo: AccountRepository = Depends(get_account_repository),
-    token_repo: TokenRepository = Depends(get_token_repository),
-    mail_repo: MailRepository = Depends(get_mail_repository),
-    mail_query_repo: MailQueryHistoryRepository = Depends(get_mail_query_history_repository),
-    delta_link_repo: DeltaLinkRepository = Depends(get_delta_link_repository),
-    webhook_repo: WebhookRepository = Depends(get_webhook_repository),
-    external_api_repo: ExternalAPIRepository = Depends(get_external_api_repository),
-    graph_client: GraphAPIClientAdapter = Depends(get_graph_client)
+    repo_adapter: DatabaseRepositoryAdapter = Depends(get_repositories),
+    graph_client: GraphAPIClientAdapter = Depends(get_graph_client),
+    external_api_client: ExternalAPIClientAdapter = Depends(get_external_api_client),
+    settings: Settings = Depends(get_settings)
 ) -> MailUseCases:
-    """Get mail use cases."""
+    """Get mail use cases.
+    
+    Accounts are processed concurrently, so the repositories are the shared
+    repository adapter rather than ones bound to the request's session.
+    """
     return MailUseCases(
-        account_repository=account_repo,
-        token_repository=token_repo,
-        mail_repository=mail_repo,
-        mail_query_history_repository=mail_query_repo,
-        delta_link_repository=delta_link_repo,
-        webhook_repository=webhook_repo,
-        external_api_repository=external_api_repo,
-        graph_client=graph_client
+        account_repo=repo_adapter,
+        token_repo=repo_adapter,
+        mail_repo=repo_adapter,
+        query_history_repo=repo_adapter,
+        delta_link_repo=repo_adapter,
+        webhook_repo=repo_adapter,
+        external_api_repo=repo_adapter,
+        graph_client=graph_client,
+        external_api_client=external_api_client,
+        config=settings,
+        write_queue=get_write_queue()
     )
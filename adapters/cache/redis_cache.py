@@ -1,5 +1,6 @@
 """Redis cache adapter implementation."""
 
+import fnmatch
 import json
 import logging
 from typing import Optional, Any, Dict, List, Union
@@ -14,6 +15,9 @@ from core.exceptions import SystemException
 
 logger = logging.getLogger(__name__)
 
+# Keys requested per SCAN call and unlinked per pipeline in scan_and_delete
+SCAN_BATCH_SIZE = 1000
+
 
 class RedisCacheAdapter(CachePort):
     """Redis caching adapter implementation."""
@@ -143,6 +147,78 @@ class RedisCacheAdapter(CachePort):
             logger.error(f"Unexpected error in cache set: {str(e)}")
             return False
     
+    async def mget(self, keys: List[str], prefix: str = "") -> List[Optional[Any]]:
+        """
+        Get several values from cache with a single MGET.
+        
+        Args:
+            keys: Cache keys
+            prefix: Key prefix type
+            
+        Returns:
+            Cached values in key order, None for missing or unreadable entries
+        """
+        if not keys:
+            return []
+        
+        try:
+            await self._ensure_connected()
+            cache_keys = [self._make_key(prefix, key) for key in keys]
+            
+            values = []
+            for cached_data in await self._redis.mget(cache_keys):
+                try:
+                    values.append(json.loads(cached_data) if cached_data else None)
+                except json.JSONDecodeError:
+                    values.append(None)
+            return values
+            
+        except RedisError as e:
+            logger.warning(f"Cache mget failed for {len(keys)} keys: {str(e)}")
+            return [None] * len(keys)
+        except Exception as e:
+            logger.error(f"Unexpected error in cache mget: {str(e)}")
+            return [None] * len(keys)
+    
+    async def mset(
+        self,
+        values: Dict[str, Any],
+        ttl: Optional[int] = None,
+        prefix: str = ""
+    ) -> bool:
+        """
+        Set several values in cache with one pipelined round trip.
+        
+        Args:
+            values: Values to cache by key
+            ttl: Time to live in seconds
+            prefix: Key prefix type
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        if not values:
+            return True
+        
+        try:
+            await self._ensure_connected()
+            ttl = ttl or self.default_ttl
+            
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for key, value in values.items():
+                    pipe.setex(self._make_key(prefix, key), ttl, json.dumps(value, default=str))
+                await pipe.execute()
+            
+            logger.debug(f"Cached {len(values)} values with TTL {ttl}")
+            return True
+            
+        except (RedisError, TypeError, ValueError) as e:
+            logger.warning(f"Cache mset failed for {len(values)} keys: {str(e)}")
+            return False
+        except Exception as e:
+            logger.error(f"Unexpected error in cache mset: {str(e)}")
+            return False
+    
     async def delete(self, key: str, prefix: str = "") -> bool:
         """
         Delete value from cache.
@@ -169,6 +245,77 @@ class RedisCacheAdapter(CachePort):
             logger.error(f"Unexpected error in cache delete: {str(e)}")
             return False
     
+    async def delete_many(self, keys: List[str], prefix: str = "") -> int:
+        """
+        Delete several values from cache with a single UNLINK.
+        
+        UNLINK frees the values in a Redis background thread, so large
+        evictions don't stall the server the way DEL does.
+        
+        Args:
+            keys: Cache keys
+            prefix: Key prefix type
+            
+        Returns:
+            Number of keys removed
+        """
+        if not keys:
+            return 0
+        
+        try:
+            await self._ensure_connected()
+            cache_keys = [self._make_key(prefix, key) for key in keys]
+            
+            deleted = await self._redis.unlink(*cache_keys)
+            logger.debug(f"Unlinked {deleted} of {len(keys)} cache keys")
+            return deleted
+            
+        except RedisError as e:
+            logger.warning(f"Cache delete_many failed for {len(keys)} keys: {str(e)}")
+            return 0
+        except Exception as e:
+            logger.error(f"Unexpected error in cache delete_many: {str(e)}")
+            return 0
+    
+    async def scan_and_delete(self, pattern: str) -> int:
+        """
+        Delete every key matching a glob pattern.
+        
+        Keys are walked with SCAN rather than KEYS, which blocks Redis for
+        the whole keyspace, and unlinked one pipelined batch at a time.
+        
+        Args:
+            pattern: Redis glob pattern of full cache keys
+            
+        Returns:
+            Number of keys removed
+        """
+        try:
+            await self._ensure_connected()
+            
+            deleted = 0
+            batch: List[str] = []
+            async with self._redis.pipeline(transaction=False) as pipe:
+                async for cache_key in self._redis.scan_iter(match=pattern, count=SCAN_BATCH_SIZE):
+                    batch.append(cache_key)
+                    if len(batch) >= SCAN_BATCH_SIZE:
+                        pipe.unlink(*batch)
+                        deleted += sum(await pipe.execute())
+                        batch = []
+                if batch:
+                    pipe.unlink(*batch)
+                    deleted += sum(await pipe.execute())
+            
+            logger.debug(f"Unlinked {deleted} cache keys matching {pattern}")
+            return deleted
+            
+        except RedisError as e:
+            logger.warning(f"Cache scan_and_delete failed for pattern {pattern}: {str(e)}")
+            return 0
+        except Exception as e:
+            logger.error(f"Unexpected error in cache scan_and_delete: {str(e)}")
+            return 0
+    
     async def exists(self, key: str, prefix: str = "") -> bool:
         """
         Check if key exists in cache.
@@ -455,12 +602,10 @@ class RedisCacheAdapter(CachePort):
             
             if prefix:
                 pattern = f"{self.prefixes.get(prefix, prefix)}*"
-                keys = await self._redis.keys(pattern)
-                if keys:
-                    deleted = await self._redis.delete(*keys)
+                deleted = await self.scan_and_delete(pattern)
+                if deleted:
                     logger.info(f"Cleared {deleted} cache keys with prefix {prefix}")
-                    return deleted
-                return 0
+                return deleted
             else:
                 # Clear all cache (use with caution)
                 await self._redis.flushdb()
@@ -536,6 +681,21 @@ class InMemoryCacheAdapter(CachePort):
         
         return True
     
+    async def mget(self, keys: List[str], prefix: str = "") -> List[Optional[Any]]:
+        """Get several values from in-memory cache."""
+        return [await self.get(key, prefix) for key in keys]
+    
+    async def mset(
+        self,
+        values: Dict[str, Any],
+        ttl: Optional[int] = None,
+        prefix: str = ""
+    ) -> bool:
+        """Set several values in in-memory cache."""
+        for key, value in values.items():
+            await self.set(key, value, ttl, prefix)
+        return True
+    
     async def delete(self, key: str, prefix: str = "") -> bool:
         """Delete value from in-memory cache."""
         cache_key = f"{prefix}{key}"
@@ -544,6 +704,21 @@ class InMemoryCacheAdapter(CachePort):
             return True
         return False
     
+    async def delete_many(self, keys: List[str], prefix: str = "") -> int:
+        """Delete several values from in-memory cache."""
+        deleted = 0
+        for key in keys:
+            if await self.delete(key, prefix):
+                deleted += 1
+        return deleted
+    
+    async def scan_and_delete(self, pattern: str) -> int:
+        """Delete every in-memory key matching a glob pattern."""
+        matched = fnmatch.filter(list(self._cache), pattern)
+        for cache_key in matched:
+            del self._cache[cache_key]
+        return len(matched)
+    
     async def exists(self, key: str, prefix: str = "") -> bool:
         """Check if key exists in in-memory cache."""
         self._cleanup_expired()
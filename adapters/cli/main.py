@@ -15,8 +15,9 @@ import structlog
 
 from config.settings import get_settings
 from adapters.db.database import get_database_adapter, migrate_database_sync
-from adapters.db.repositories import DatabaseRepositoryAdapter
+from adapters.db.repository_adapter import DatabaseRepositoryAdapter
 from adapters.external.graph_client import GraphAPIClientAdapter
+from adapters.external.external_api_client import ExternalAPIClientAdapter
 from adapters.external.oauth_client import OAuthClientAdapter
 from core.usecases.auth_usecases import AuthenticationUseCases
 from core.usecases.mail_usecases import MailUseCases
@@ -58,6 +59,24 @@ app.add_typer(auth_app)
 app.add_typer(mail_app)
 
 
+async def _run_auth(auth_usecases: AuthenticationUseCases, coro):
+    """Run an auth use case and write its queued logs before the loop closes."""
+    try:
+        return await coro
+    finally:
+        await auth_usecases.aclose()
+
+
+async def _run_mail(mail_usecases: MailUseCases, coro):
+    """Run a mail use case, then write its queued records and close its HTTP clients' connections before the loop closes."""
+    try:
+        return await coro
+    finally:
+        await mail_usecases.aclose()
+        await mail_usecases.graph_client.aclose()
+        await mail_usecases.external_api_client.aclose()
+
+
 def get_usecases():
     """Get use cases instances."""
     settings = get_settings()
@@ -66,6 +85,7 @@ def get_usecases():
     db_adapter = get_database_adapter(settings)
     repo_adapter = DatabaseRepositoryAdapter(db_adapter)
     graph_adapter = GraphAPIClientAdapter(settings)
+    external_api_adapter = ExternalAPIClientAdapter(settings)
     oauth_adapter = OAuthClientAdapter(settings)
     
     # Initialize use cases
@@ -86,7 +106,7 @@ def get_usecases():
         webhook_repo=repo_adapter,
         external_api_repo=repo_adapter,
         delta_link_repo=repo_adapter,
-        external_api_client=graph_adapter,  # Using graph_adapter as external API client
+        external_api_client=external_api_adapter,
         graph_client=graph_adapter,
         config=settings
     )
@@ -188,12 +208,12 @@ def create_account(
         ) as progress:
             task = progress.add_task("Creating account...", total=None)
             
-            result = asyncio.run(auth_usecases.register_account(
+            result = asyncio.run(_run_auth(auth_usecases, auth_usecases.register_account(
                 email=email,
                 user_id=email,  # Use email as user_id for simplicity
                 authentication_flow=auth_flow,
                 scopes=["offline_access", "User.Read", "Mail.Read", "Mail.ReadWrite", "Mail.Send"]
-            ))
+            )))
             
             progress.update(task, description="Account created successfully")
         
@@ -272,7 +292,7 @@ def authenticate_account(
         console.print(f"[bold blue]Authenticating account: {account.email}[/bold blue]")
         
         # Start authentication process
-        result = asyncio.run(auth_usecases.authenticate_account(account.id))
+        result = asyncio.run(_run_auth(auth_usecases, auth_usecases.authenticate_account(account.id)))
         
         if result.get("requires_user_action"):
             if account.authentication_flow == AuthenticationFlow.AUTHORIZATION_CODE:
@@ -371,14 +391,14 @@ def query_mail(
         ) as progress:
             task = progress.add_task("Querying mail...", total=None)
             
-            result = asyncio.run(mail_usecases.query_mail(
+            result = asyncio.run(_run_mail(mail_usecases, mail_usecases.query_mail(
                 account_id=account_id,
                 folder_id=folder,
                 date_from=date_from,
                 sender_email=sender,
                 is_read=False if unread_only else None,
                 top=limit
-            ))
+            )))
             
             progress.update(task, description="Query completed")
         
@@ -458,13 +478,13 @@ def send_mail(
         ) as progress:
             task = progress.add_task("Sending mail...", total=None)
             
-            result = asyncio.run(mail_usecases.send_mail(
+            result = asyncio.run(_run_mail(mail_usecases, mail_usecases.send_mail(
                 account_id=account_id,
                 to_recipients=[to],
                 subject=subject,
                 body=body,
                 body_type=body_type
-            ))
+            )))
             
             progress.update(task, description="Mail sent successfully")
         
@@ -494,10 +514,10 @@ def delta_sync(
         ) as progress:
             task = progress.add_task("Performing delta sync...", total=None)
             
-            result = asyncio.run(mail_usecases.delta_sync(
+            result = asyncio.run(_run_mail(mail_usecases, mail_usecases.delta_sync(
                 account_id=account_id,
                 folder_id=folder
-            ))
+            )))
             
             progress.update(task, description="Delta sync completed")
         
@@ -4,7 +4,7 @@ import asyncio
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator, Optional
 import structlog
-from sqlalchemy import create_engine, text
+from sqlalchemy import Connection, create_engine, inspect, text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
@@ -194,6 +194,42 @@ def get_database_adapter(settings: Optional[Settings] = None) -> DatabaseAdapter
     return _database_adapter
 
 
+# Unique index over (account_id, message_id) that mail upserts conflict on;
+# databases created before it was unique get it rebuilt on migration
+MAIL_MESSAGE_KEY_INDEX = "idx_mail_messages_account_message"
+
+
+def _migrate_mail_message_key_index(conn: Connection) -> None:
+    """Make the mail message key index unique on databases created without it.
+    
+    create_all does not alter existing tables, so duplicate messages are
+    removed first, keeping the earliest stored copy, and the index is then
+    recreated from the model.
+    """
+    from adapters.db.models import MailMessageModel
+    
+    indexes = {index["name"]: index for index in inspect(conn).get_indexes("mail_messages")}
+    if indexes.get(MAIL_MESSAGE_KEY_INDEX, {}).get("unique"):
+        return
+    
+    removed = conn.execute(text(
+        "DELETE FROM mail_messages WHERE id NOT IN "
+        "(SELECT MIN(id) FROM mail_messages GROUP BY account_id, message_id)"
+    )).rowcount
+    conn.execute(text(f"DROP INDEX IF EXISTS {MAIL_MESSAGE_KEY_INDEX}"))
+    
+    [key_index] = [
+        index for index in MailMessageModel.__table__.indexes
+        if index.name == MAIL_MESSAGE_KEY_INDEX
+    ]
+    key_index.create(conn)
+    
+    logger.info(
+        "Mail message key index made unique",
+        duplicates_removed=removed
+    )
+
+
 async def migrate_database(settings: Settings) -> None:
     """Run database migrations asynchronously."""
     try:
@@ -206,6 +242,7 @@ async def migrate_database(settings: Settings) -> None:
         # Create all tables
         async with adapter.async_engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(_migrate_mail_message_key_index)
         
         logger.info("Database migration completed")
         
@@ -244,7 +281,9 @@ def migrate_database_sync(settings: Settings) -> None:
                 )
         
         # Create all tables
-        Base.metadata.create_all(bind=adapter._sync_engine)
+        with adapter._sync_engine.begin() as conn:
+            Base.metadata.create_all(bind=conn)
+            _migrate_mail_message_key_index(conn)
         
         # Apply SQLite optimizations if needed
         if "sqlite" in settings.DATABASE_URL:
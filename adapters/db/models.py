@@ -188,7 +188,7 @@ class MailMessageModel(Base):
         Index('idx_mail_messages_direction', 'direction'),
         Index('idx_mail_messages_is_read', 'is_read'),
         Index('idx_mail_messages_importance', 'importance'),
-        Index('idx_mail_messages_account_message', 'account_id', 'message_id'),
+        Index('idx_mail_messages_account_message', 'account_id', 'message_id', unique=True),
     )
 
 
@@ -1,19 +1,24 @@
 """Database repository implementations."""
 
+import base64
 from datetime import datetime, UTC
-from typing import List, Optional, Dict, Any
-from sqlalchemy import select, update, delete, and_, or_, desc, asc
+from typing import AsyncGenerator, List, Optional, Dict, Any, Set, Tuple, Union
+from sqlalchemy import select, insert, update, delete, and_, or_, desc, asc, func
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 import structlog
 
+from core.domain.bloom_filter import BloomFilter
 from core.domain.entities import (
     Account, AuthorizationCodeAccount, DeviceCodeAccount, Token,
     MailMessage, MailQueryHistory, DeltaLink, WebhookSubscription,
-    ExternalAPICall, AuthenticationLog, AuthenticationFlow
+    ExternalAPICall, AuthenticationLog, AuthenticationFlow, TokenStatus,
+    MailDirection, MailImportance
 )
 from core.usecases.ports import (
-    AccountRepositoryPort, AuthFlowRepositoryPort, TokenRepositoryPort,
+    AccountWithTokenStatus, MailSummary, AccountRepositoryPort, AuthFlowRepositoryPort, TokenRepositoryPort,
     MailRepositoryPort, MailQueryHistoryRepositoryPort, DeltaLinkRepositoryPort,
     WebhookRepositoryPort, ExternalAPIRepositoryPort, AuthenticationLogRepositoryPort
 )
@@ -22,10 +27,52 @@ from adapters.db.models import (
     TokenModel, MailMessageModel, MailQueryHistoryModel, DeltaLinkModel,
     WebhookSubscriptionModel, ExternalAPICallModel, AuthenticationLogModel
 )
-from adapters.db.database import DatabaseAdapter
 
 logger = structlog.get_logger()
 
+# Message ID Bloom filters are sized for twice the stored messages, so
+# they stay accurate while new mail is added to them
+EXISTENCE_FILTER_HEADROOM = 2
+EXISTENCE_FILTER_MIN_CAPACITY = 1024
+EXISTENCE_FILTER_ERROR_RATE = 0.01
+
+# INSERT ... ON CONFLICT constructs of the supported databases
+_UPSERT_INSERTS = {"postgresql": postgresql_insert, "sqlite": sqlite_insert}
+
+# Mail rows per upsert statement, within SQLite's bound parameter limit
+MAIL_UPSERT_BATCH_SIZE = 500
+
+# Columns an upsert overwrites on an already stored mail; its row ID,
+# identity and creation time are kept
+_MAIL_UPSERT_COLUMNS = tuple(
+    column.key for column in MailMessageModel.__table__.columns
+    if column.key not in ("id", "account_id", "message_id", "created_at")
+)
+
+
+# Columns read for mail list views; bodies and recipient lists are left out
+_MAIL_SUMMARY_COLUMNS = (
+    MailMessageModel.id, MailMessageModel.message_id, MailMessageModel.account_id,
+    MailMessageModel.subject, MailMessageModel.sender_email, MailMessageModel.sender_name,
+    MailMessageModel.received_datetime, MailMessageModel.is_read,
+    MailMessageModel.has_attachments, MailMessageModel.importance, MailMessageModel.direction
+)
+
+
+def _encode_mail_cursor(received_datetime: datetime, row_id: int) -> str:
+    """Encode a mail's (received_datetime, id) sort key as a page cursor."""
+    raw = f"{received_datetime.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_mail_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a page cursor into the (received_datetime, id) it continues after."""
+    try:
+        received, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(received), int(row_id)
+    except ValueError as e:
+        raise ValueError(f"Invalid mail cursor: {cursor}") from e
+
 
 class AccountRepository(AccountRepositoryPort):
     """Account repository implementation."""
@@ -35,24 +82,61 @@ class AccountRepository(AccountRepositoryPort):
     
     async def create_account(self, account: Account) -> Account:
         """Create a new account."""
-        model = AccountModel(
-            id=account.id,
-            email=account.email,
-            user_id=account.user_id,
-            tenant_id=account.tenant_id,
-            client_id=account.client_id,
-            authentication_flow=account.authentication_flow,
-            status=account.status,
-            scopes=account.scopes,
-            created_at=account.created_at,
-            last_authenticated_at=account.last_authenticated_at
-        )
+        model = self._entity_to_model(account)
         
         self.session.add(model)
         await self.session.flush()
         
         return self._model_to_entity(model)
     
+    async def create_account_with_flow(
+        self,
+        account: Account,
+        flow_account: Union[AuthorizationCodeAccount, DeviceCodeAccount],
+        log_entry: Optional[AuthenticationLog] = None
+    ) -> Account:
+        """Create account, flow data and registration log in one flush."""
+        model = self._entity_to_model(account)
+        if isinstance(flow_account, AuthorizationCodeAccount):
+            flow_model = AuthFlowRepository._auth_code_entity_to_model(flow_account)
+        else:
+            flow_model = AuthFlowRepository._device_code_entity_to_model(flow_account)
+        
+        models = [model, flow_model]
+        if log_entry is not None:
+            models.append(AuthenticationLogRepository._entity_to_model(log_entry))
+        
+        self.session.add_all(models)
+        await self.session.flush()
+        
+        return self._model_to_entity(model)
+    
+    async def commit_authentication(
+        self,
+        account_id: str,
+        token: Token,
+        log_entry: AuthenticationLog,
+        authenticated_at: Optional[datetime] = None
+    ) -> Token:
+        """Save token, stamp last authentication time and record the auth log in one transaction."""
+        saved_token = await TokenRepository(self.session).save_token(token)
+        
+        if authenticated_at is not None:
+            stmt = (
+                update(AccountModel)
+                .where(AccountModel.id == account_id)
+                .values(
+                    last_authenticated_at=authenticated_at,
+                    updated_at=datetime.now(UTC)
+                )
+            )
+            await self.session.execute(stmt)
+        
+        self.session.add(AuthenticationLogRepository._entity_to_model(log_entry))
+        await self.session.flush()
+        
+        return saved_token
+    
     async def get_account_by_id(self, account_id: str) -> Optional[Account]:
         """Get account by ID."""
         stmt = select(AccountModel).where(AccountModel.id == account_id)
@@ -61,6 +145,17 @@ class AccountRepository(AccountRepositoryPort):
         
         return self._model_to_entity(model) if model else None
     
+    async def get_accounts_by_ids(self, account_ids: List[str]) -> Dict[str, Account]:
+        """Get several accounts in one query, keyed by account ID."""
+        if not account_ids:
+            return {}
+        
+        stmt = select(AccountModel).where(AccountModel.id.in_(account_ids))
+        result = await self.session.execute(stmt)
+        models = result.scalars().all()
+        
+        return {model.id: self._model_to_entity(model) for model in models}
+    
     async def get_account_by_email(self, email: str) -> Optional[Account]:
         """Get account by email."""
         stmt = select(AccountModel).where(AccountModel.email == email)
@@ -77,6 +172,24 @@ class AccountRepository(AccountRepositoryPort):
         
         return [self._model_to_entity(model) for model in models]
     
+    async def list_accounts_with_token_status(self) -> List[AccountWithTokenStatus]:
+        """Get all accounts joined with their token status and expiry."""
+        stmt = (
+            select(AccountModel, TokenModel.status, TokenModel.expires_at)
+            .outerjoin(TokenModel, TokenModel.account_id == AccountModel.id)
+            .order_by(AccountModel.created_at.desc())
+        )
+        result = await self.session.execute(stmt)
+        
+        return [
+            AccountWithTokenStatus(
+                account=self._model_to_entity(model),
+                token_status=status.value if isinstance(status, TokenStatus) else status,
+                token_expires_at=expires_at
+            )
+            for model, status, expires_at in result.all()
+        ]
+    
     async def update_account(self, account: Account) -> Account:
         """Update account."""
         stmt = (
@@ -146,6 +259,22 @@ class AccountRepository(AccountRepositoryPort):
         
         return [self._model_to_entity(model) for model in models]
     
+    @staticmethod
+    def _entity_to_model(account: Account) -> AccountModel:
+        """Convert entity to model."""
+        return AccountModel(
+            id=account.id,
+            email=account.email,
+            user_id=account.user_id,
+            tenant_id=account.tenant_id,
+            client_id=account.client_id,
+            authentication_flow=account.authentication_flow,
+            status=account.status,
+            scopes=account.scopes,
+            created_at=account.created_at,
+            last_authenticated_at=account.last_authenticated_at
+        )
+    
     def _model_to_entity(self, model: AccountModel) -> Account:
         """Convert model to entity."""
         return Account(
@@ -171,13 +300,7 @@ class AuthFlowRepository(AuthFlowRepositoryPort):
     
     async def create_auth_code_account(self, auth_account: AuthorizationCodeAccount) -> AuthorizationCodeAccount:
         """Create authorization code account."""
-        model = AuthorizationCodeAccountModel(
-            account_id=auth_account.account_id,
-            client_secret=auth_account.client_secret,
-            redirect_uri=auth_account.redirect_uri,
-            authority=auth_account.authority,
-            created_at=auth_account.created_at
-        )
+        model = self._auth_code_entity_to_model(auth_account)
         
         self.session.add(model)
         await self.session.flush()
@@ -196,15 +319,7 @@ class AuthFlowRepository(AuthFlowRepositoryPort):
     
     async def create_device_code_account(self, device_account: DeviceCodeAccount) -> DeviceCodeAccount:
         """Create device code account."""
-        model = DeviceCodeAccountModel(
-            account_id=device_account.account_id,
-            device_code=device_account.device_code,
-            user_code=device_account.user_code,
-            verification_uri=device_account.verification_uri,
-            expires_in=device_account.expires_in,
-            interval=device_account.interval,
-            created_at=device_account.created_at
-        )
+        model = self._device_code_entity_to_model(device_account)
         
         self.session.add(model)
         await self.session.flush()
@@ -239,6 +354,30 @@ class AuthFlowRepository(AuthFlowRepositoryPort):
         await self.session.execute(stmt)
         return await self.get_device_code_account(device_account.account_id)
     
+    @staticmethod
+    def _auth_code_entity_to_model(auth_account: AuthorizationCodeAccount) -> AuthorizationCodeAccountModel:
+        """Convert authorization code entity to model."""
+        return AuthorizationCodeAccountModel(
+            account_id=auth_account.account_id,
+            client_secret=auth_account.client_secret,
+            redirect_uri=auth_account.redirect_uri,
+            authority=auth_account.authority,
+            created_at=auth_account.created_at
+        )
+    
+    @staticmethod
+    def _device_code_entity_to_model(device_account: DeviceCodeAccount) -> DeviceCodeAccountModel:
+        """Convert device code entity to model."""
+        return DeviceCodeAccountModel(
+            account_id=device_account.account_id,
+            device_code=device_account.device_code,
+            user_code=device_account.user_code,
+            verification_uri=device_account.verification_uri,
+            expires_in=device_account.expires_in,
+            interval=device_account.interval,
+            created_at=device_account.created_at
+        )
+    
     def _auth_code_model_to_entity(self, model: AuthorizationCodeAccountModel) -> AuthorizationCodeAccount:
         """Convert auth code model to entity."""
         return AuthorizationCodeAccount(
@@ -309,6 +448,47 @@ class TokenRepository(TokenRepositoryPort):
         await self.session.flush()
         return await self.get_token_by_account_id(token.account_id)
     
+    async def save_tokens(self, tokens: List[Token]) -> int:
+        """Save or update several tokens with one lookup and one executemany per kind."""
+        if not tokens:
+            return 0
+        
+        # Last token wins when an account appears more than once
+        tokens_by_account = {token.account_id: token for token in tokens}
+        
+        existing_stmt = select(TokenModel.account_id).where(
+            TokenModel.account_id.in_(list(tokens_by_account))
+        )
+        result = await self.session.execute(existing_stmt)
+        existing_ids = set(result.scalars().all())
+        
+        now = datetime.now(UTC)
+        updates = []
+        inserts = []
+        for account_id, token in tokens_by_account.items():
+            values = {
+                "account_id": account_id,
+                "access_token": token.access_token,
+                "refresh_token": token.refresh_token,
+                "token_type": token.token_type,
+                "expires_at": token.expires_at,
+                "scopes": token.scopes,
+                "status": token.status
+            }
+            if account_id in existing_ids:
+                values["updated_at"] = now
+                updates.append(values)
+            else:
+                values["created_at"] = token.created_at or now
+                inserts.append(values)
+        
+        if updates:
+            await self.session.execute(update(TokenModel), updates)
+        if inserts:
+            await self.session.execute(insert(TokenModel), inserts)
+        
+        return len(tokens_by_account)
+    
     async def get_token_by_account_id(self, account_id: str) -> Optional[Token]:
         """Get token by account ID."""
         stmt = select(TokenModel).where(TokenModel.account_id == account_id)
@@ -317,6 +497,30 @@ class TokenRepository(TokenRepositoryPort):
         
         return self._model_to_entity(model) if model else None
     
+    async def get_token_status_by_account_id(self, account_id: str) -> Optional[Tuple[str, datetime]]:
+        """Get only a token's (status, expires_at) by account ID."""
+        stmt = select(TokenModel.status, TokenModel.expires_at).where(
+            TokenModel.account_id == account_id
+        )
+        result = await self.session.execute(stmt)
+        row = result.first()
+        
+        if row is None:
+            return None
+        status, expires_at = row
+        return (status.value if isinstance(status, TokenStatus) else status), expires_at
+    
+    async def get_tokens_by_account_ids(self, account_ids: List[str]) -> Dict[str, Token]:
+        """Get tokens for several accounts in one query, keyed by account ID."""
+        if not account_ids:
+            return {}
+        
+        stmt = select(TokenModel).where(TokenModel.account_id.in_(account_ids))
+        result = await self.session.execute(stmt)
+        models = result.scalars().all()
+        
+        return {model.account_id: self._model_to_entity(model) for model in models}
+    
     async def delete_token(self, account_id: str) -> bool:
         """Delete token."""
         stmt = delete(TokenModel).where(TokenModel.account_id == account_id)
@@ -341,6 +545,59 @@ class TokenRepository(TokenRepositoryPort):
         
         return [self._model_to_entity(model) for model in models]
     
+    async def get_expiring_tokens(
+        self,
+        expires_before: datetime,
+        after_account_id: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Token]:
+        """Get tokens expiring before a time, ordered by account ID."""
+        stmt = self._expiring_tokens_stmt(
+            select(TokenModel), expires_before, after_account_id, limit
+        )
+        result = await self.session.execute(stmt)
+        models = result.scalars().all()
+        
+        return [self._model_to_entity(model) for model in models]
+    
+    async def get_expiring_tokens_with_accounts(
+        self,
+        expires_before: datetime,
+        after_account_id: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Tuple[Token, Account]]:
+        """Get expiring tokens joined with their accounts in one query, ordered by account ID."""
+        stmt = self._expiring_tokens_stmt(
+            select(TokenModel, AccountModel).join(AccountModel, AccountModel.id == TokenModel.account_id),
+            expires_before, after_account_id, limit
+        )
+        result = await self.session.execute(stmt)
+        account_repo = AccountRepository(self.session)
+        
+        return [
+            (self._model_to_entity(token_model), account_repo._model_to_entity(account_model))
+            for token_model, account_model in result.all()
+        ]
+    
+    @staticmethod
+    def _expiring_tokens_stmt(
+        stmt,
+        expires_before: datetime,
+        after_account_id: Optional[str],
+        limit: Optional[int]
+    ):
+        """Restrict a token query to tokens expiring before a time, keyset paged by account ID."""
+        conditions = [TokenModel.expires_at <= expires_before]
+        if after_account_id:
+            conditions.append(TokenModel.account_id > after_account_id)
+        
+        stmt = stmt.where(and_(*conditions)).order_by(TokenModel.account_id.asc())
+        
+        if limit:
+            stmt = stmt.limit(limit)
+        
+        return stmt
+    
     def _model_to_entity(self, model: TokenModel) -> Token:
         """Convert model to entity."""
         return Token(
@@ -364,34 +621,80 @@ class MailRepository(MailRepositoryPort):
     
     async def save_mail_message(self, message: MailMessage) -> MailMessage:
         """Save mail message."""
-        model = MailMessageModel(
-            message_id=message.message_id,
-            internet_message_id=message.internet_message_id,
-            account_id=message.account_id,
-            subject=message.subject,
-            sender_email=message.sender_email,
-            sender_name=message.sender_name,
-            recipients=message.recipients,
-            cc_recipients=message.cc_recipients,
-            bcc_recipients=message.bcc_recipients,
-            body_preview=message.body_preview,
-            body_content=message.body_content,
-            body_content_type=message.body_content_type,
-            importance=message.importance,
-            is_read=message.is_read,
-            has_attachments=message.has_attachments,
-            received_datetime=message.received_datetime,
-            sent_datetime=message.sent_datetime,
-            direction=message.direction,
-            categories=message.categories,
-            created_at=message.created_at
-        )
+        model = self._entity_to_model(message)
         
         self.session.add(model)
         await self.session.flush()
         
         return self._model_to_entity(model)
     
+    async def save_mail_messages(self, messages: List[MailMessage]) -> List[MailMessage]:
+        """Save several mail messages with a single flush."""
+        if not messages:
+            return []
+        
+        models = [self._entity_to_model(message) for message in messages]
+        
+        self.session.add_all(models)
+        await self.session.flush()
+        
+        return [self._model_to_entity(model) for model in models]
+    
+    async def upsert_mail_messages(self, messages: List[MailMessage]) -> List[MailMessage]:
+        """Insert mail messages, updating those already stored; returns the inserted ones.
+        
+        Each batch is first inserted with ON CONFLICT DO NOTHING, whose
+        RETURNING lists exactly the rows it inserted. The rest are then
+        updated with ON CONFLICT DO UPDATE, keeping their created_at.
+        """
+        if not messages:
+            return []
+        
+        dialect = self.session.bind.dialect.name
+        upsert = _UPSERT_INSERTS.get(dialect)
+        if upsert is None:
+            raise NotImplementedError(f"Mail upsert is not supported on {dialect} databases")
+        
+        # A statement may touch each row once; the last copy of a message wins
+        now = datetime.now(UTC)
+        rows = {}
+        for message in messages:
+            model = self._entity_to_model(message)
+            row = {
+                column.key: getattr(model, column.key)
+                for column in MailMessageModel.__table__.columns
+                if column.key != "id"
+            }
+            # Column defaults don't apply to keys given explicitly
+            row["created_at"] = row["created_at"] or now
+            rows[(message.account_id, message.message_id)] = row
+        rows = list(rows.values())
+        
+        key_columns = [MailMessageModel.account_id, MailMessageModel.message_id]
+        inserted = []
+        for start in range(0, len(rows), MAIL_UPSERT_BATCH_SIZE):
+            batch = rows[start:start + MAIL_UPSERT_BATCH_SIZE]
+            insert_stmt = upsert(MailMessageModel).values(batch).on_conflict_do_nothing(
+                index_elements=key_columns
+            ).returning(*key_columns)
+            inserted_keys = set((await self.session.execute(insert_stmt)).tuples())
+            inserted.extend(
+                row for row in batch if (row["account_id"], row["message_id"]) in inserted_keys
+            )
+            
+            stored = [
+                row for row in batch if (row["account_id"], row["message_id"]) not in inserted_keys
+            ]
+            if stored:
+                update_stmt = upsert(MailMessageModel).values(stored)
+                update_stmt = update_stmt.on_conflict_do_update(
+                    index_elements=key_columns,
+                    set_={key: update_stmt.excluded[key] for key in _MAIL_UPSERT_COLUMNS}
+                )
+                await self.session.execute(update_stmt)
+        
+        return [self._model_to_entity(MailMessageModel(**row)) for row in inserted]
+    
     async def get_mail_by_message_id(self, message_id: str) -> Optional[MailMessage]:
         """Get mail by message ID."""
         stmt = select(MailMessageModel).where(MailMessageModel.message_id == message_id)
@@ -411,6 +714,55 @@ class MailRepository(MailRepositoryPort):
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none() is not None
     
+    async def get_existence_filter(self, account_id: str, batch_size: int = 5000) -> BloomFilter:
+        """Build a Bloom filter of an account's stored message IDs, streaming the IDs."""
+        count_stmt = select(func.count()).select_from(MailMessageModel).where(
+            MailMessageModel.account_id == account_id
+        )
+        stored = (await self.session.execute(count_stmt)).scalar_one()
+        
+        existence_filter = BloomFilter(
+            max(stored * EXISTENCE_FILTER_HEADROOM, EXISTENCE_FILTER_MIN_CAPACITY),
+            EXISTENCE_FILTER_ERROR_RATE
+        )
+        
+        stmt = select(MailMessageModel.message_id).where(MailMessageModel.account_id == account_id)
+        result = await self.session.stream_scalars(stmt.execution_options(yield_per=batch_size))
+        async for message_id in result:
+            existence_filter.add(message_id)
+        
+        return existence_filter
+    
+    async def get_existing_message_ids(self, account_id: str, message_ids: List[str]) -> Set[str]:
+        """Get which of the given message IDs already exist for an account, in one query."""
+        if not message_ids:
+            return set()
+        
+        stmt = select(MailMessageModel.message_id).where(
+            and_(
+                MailMessageModel.account_id == account_id,
+                MailMessageModel.message_id.in_(message_ids)
+            )
+        )
+        result = await self.session.execute(stmt)
+        return set(result.scalars().all())
+    
+    async def get_mails_by_message_ids(self, account_id: str, message_ids: List[str]) -> List[MailMessage]:
+        """Get an account's mails for several message IDs in one query."""
+        if not message_ids:
+            return []
+        
+        stmt = select(MailMessageModel).where(
+            and_(
+                MailMessageModel.account_id == account_id,
+                MailMessageModel.message_id.in_(message_ids)
+            )
+        )
+        result = await self.session.execute(stmt)
+        models = result.scalars().all()
+        
+        return [self._model_to_entity(model) for model in models]
+    
     async def get_mails_by_account(
         self,
         account_id: str,
@@ -432,6 +784,221 @@ class MailRepository(MailRepositoryPort):
         
         return [self._model_to_entity(model) for model in models]
     
+    async def get_mails_by_account_id(
+        self,
+        account_id: str,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[MailMessage], Optional[str]]:
+        """Get a keyset-paged page of an account's mails, newest first."""
+        conditions = [MailMessageModel.account_id == account_id]
+        if cursor:
+            last_received, last_id = _decode_mail_cursor(cursor)
+            conditions.append(or_(
+                MailMessageModel.received_datetime < last_received,
+                and_(
+                    MailMessageModel.received_datetime == last_received,
+                    MailMessageModel.id < last_id
+                )
+            ))
+        
+        stmt = (
+            select(MailMessageModel)
+            .where(and_(*conditions))
+            .order_by(MailMessageModel.received_datetime.desc(), MailMessageModel.id.desc())
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        models = result.scalars().all()
+        
+        next_cursor = None
+        if len(models) == limit:
+            next_cursor = _encode_mail_cursor(models[-1].received_datetime, models[-1].id)
+        
+        return [self._model_to_entity(model) for model in models], next_cursor
+    
+    async def iter_mails_by_account_id(
+        self,
+        account_id: str,
+        batch_size: int = 500
+    ) -> AsyncGenerator[MailMessage, None]:
+        """Stream an account's mails, newest first, through a server-side cursor."""
+        stmt = self._search_mails_stmt(account_id=account_id)
+        
+        result = await self.session.stream_scalars(stmt.execution_options(yield_per=batch_size))
+        async for model in result:
+            yield self._model_to_entity(model)
+    
+    async def search_mails(
+        self,
+        account_id: Optional[str] = None,
+        sender_email: Optional[str] = None,
+        subject_contains: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        is_read: Optional[bool] = None,
+        importance: Optional[MailImportance] = None,
+        direction: Optional[MailDirection] = None,
+        limit: Optional[int] = None
+    ) -> List[MailMessage]:
+        """Search mails with filters."""
+        stmt = self._search_mails_stmt(
+            account_id, sender_email, subject_contains, date_from, date_to,
+            is_read, importance, direction, limit
+        )
+        
+        result = await self.session.execute(stmt)
+        models = result.scalars().all()
+        
+        return [self._model_to_entity(model) for model in models]
+    
+    async def iter_search_mails(
+        self,
+        account_id: Optional[str] = None,
+        sender_email: Optional[str] = None,
+        subject_contains: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        is_read: Optional[bool] = None,
+        importance: Optional[MailImportance] = None,
+        direction: Optional[MailDirection] = None,
+        limit: Optional[int] = None,
+        batch_size: int = 500
+    ) -> AsyncGenerator[MailMessage, None]:
+        """Stream mails matching filters through a server-side cursor."""
+        stmt = self._search_mails_stmt(
+            account_id, sender_email, subject_contains, date_from, date_to,
+            is_read, importance, direction, limit
+        )
+        
+        result = await self.session.stream_scalars(stmt.execution_options(yield_per=batch_size))
+        async for model in result:
+            yield self._model_to_entity(model)
+    
+    async def search_mail_summaries(
+        self,
+        account_id: Optional[str] = None,
+        sender_email: Optional[str] = None,
+        subject_contains: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        is_read: Optional[bool] = None,
+        importance: Optional[MailImportance] = None,
+        direction: Optional[MailDirection] = None,
+        limit: Optional[int] = None
+    ) -> List[MailSummary]:
+        """Search mails with filters, selecting only the list view columns."""
+        stmt = self._search_mails_stmt(
+            account_id, sender_email, subject_contains, date_from, date_to,
+            is_read, importance, direction, limit,
+            columns=_MAIL_SUMMARY_COLUMNS
+        )
+        result = await self.session.execute(stmt)
+        
+        return [
+            MailSummary(
+                id=str(row.id),
+                message_id=row.message_id,
+                account_id=str(row.account_id),
+                subject=row.subject,
+                sender_email=row.sender_email,
+                sender_name=row.sender_name,
+                received_datetime=row.received_datetime,
+                is_read=row.is_read,
+                has_attachments=row.has_attachments,
+                importance=(
+                    row.importance.value if isinstance(row.importance, MailImportance) else row.importance
+                ),
+                direction=(
+                    row.direction.value if isinstance(row.direction, MailDirection) else row.direction
+                )
+            )
+            for row in result.all()
+        ]
+    
+    async def get_mail_body(self, account_id: str, message_id: str) -> Optional[Tuple[Optional[str], str]]:
+        """Get a stored mail's (body content, content type)."""
+        stmt = select(MailMessageModel.body_content, MailMessageModel.body_content_type).where(
+            and_(
+                MailMessageModel.account_id == account_id,
+                MailMessageModel.message_id == message_id
+            )
+        )
+        result = await self.session.execute(stmt)
+        row = result.first()
+        
+        return (row.body_content, row.body_content_type) if row else None
+    
+    @staticmethod
+    def _search_mails_stmt(
+        account_id: Optional[str] = None,
+        sender_email: Optional[str] = None,
+        subject_contains: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        is_read: Optional[bool] = None,
+        importance: Optional[MailImportance] = None,
+        direction: Optional[MailDirection] = None,
+        limit: Optional[int] = None,
+        columns: Optional[Tuple[Any, ...]] = None
+    ):
+        """Build the filtered mail query, newest first, over the given columns or whole rows."""
+        stmt = select(*columns) if columns else select(MailMessageModel)
+        
+        conditions = []
+        if account_id:
+            conditions.append(MailMessageModel.account_id == account_id)
+        if sender_email:
+            conditions.append(MailMessageModel.sender_email == sender_email)
+        if subject_contains:
+            conditions.append(MailMessageModel.subject.ilike(f"%{subject_contains}%"))
+        if date_from:
+            conditions.append(MailMessageModel.received_datetime >= date_from)
+        if date_to:
+            conditions.append(MailMessageModel.received_datetime < date_to)
+        if is_read is not None:
+            conditions.append(MailMessageModel.is_read == is_read)
+        if importance:
+            conditions.append(MailMessageModel.importance == importance)
+        if direction:
+            conditions.append(MailMessageModel.direction == direction)
+        
+        if conditions:
+            stmt = stmt.where(and_(*conditions))
+        
+        stmt = stmt.order_by(MailMessageModel.received_datetime.desc())
+        
+        if limit:
+            stmt = stmt.limit(limit)
+        
+        return stmt
+    
+    @staticmethod
+    def _entity_to_model(message: MailMessage) -> MailMessageModel:
+        """Convert entity to model."""
+        return MailMessageModel(
+            message_id=message.message_id,
+            internet_message_id=message.internet_message_id,
+            account_id=message.account_id,
+            subject=message.subject,
+            sender_email=message.sender_email,
+            sender_name=message.sender_name,
+            recipients=message.recipients,
+            cc_recipients=message.cc_recipients,
+            bcc_recipients=message.bcc_recipients,
+            body_preview=message.body_preview,
+            body_content=message.body_content,
+            body_content_type=message.body_content_type,
+            importance=message.importance,
+            is_read=message.is_read,
+            has_attachments=message.has_attachments,
+            received_datetime=message.received_datetime,
+            sent_datetime=message.sent_datetime,
+            direction=message.direction,
+            categories=message.categories,
+            created_at=message.created_at
+        )
+    
     def _model_to_entity(self, model: MailMessageModel) -> MailMessage:
         """Convert model to entity."""
         return MailMessage(
@@ -483,6 +1050,62 @@ class MailQueryHistoryRepository(MailQueryHistoryRepositoryPort):
         
         return self._model_to_entity(model)
     
+    async def save_query_histories(self, histories: List[MailQueryHistory]) -> int:
+        """Save several query history entries with a single executemany insert."""
+        if not histories:
+            return 0
+        
+        await self.session.execute(
+            insert(MailQueryHistoryModel),
+            [
+                {
+                    "account_id": history.account_id,
+                    "query_type": history.query_type,
+                    "query_parameters": history.query_parameters,
+                    "messages_found": history.messages_found,
+                    "new_messages": history.new_messages,
+                    "query_datetime": history.query_datetime,
+                    "execution_time_ms": history.execution_time_ms,
+                    "success": history.success,
+                    "error_message": history.error_message
+                }
+                for history in histories
+            ]
+        )
+        
+        return len(histories)
+    
+    async def get_query_history(
+        self,
+        account_id: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        limit: Optional[int] = None
+    ) -> List[MailQueryHistory]:
+        """Get query history with filters."""
+        stmt = select(MailQueryHistoryModel)
+        
+        conditions = []
+        if account_id:
+            conditions.append(MailQueryHistoryModel.account_id == account_id)
+        if date_from:
+            conditions.append(MailQueryHistoryModel.query_datetime >= date_from)
+        if date_to:
+            conditions.append(MailQueryHistoryModel.query_datetime <= date_to)
+        
+        if conditions:
+            stmt = stmt.where(and_(*conditions))
+        
+        stmt = stmt.order_by(MailQueryHistoryModel.query_datetime.desc())
+        
+        if limit:
+            stmt = stmt.limit(limit)
+        
+        result = await self.session.execute(stmt)
+        models = result.scalars().all()
+        
+        return [self._model_to_entity(model) for model in models]
+    
     async def get_query_histories(
         self,
         account_id: Optional[str] = None,
@@ -571,6 +1194,17 @@ class DeltaLinkRepository(DeltaLinkRepositoryPort):
         
         return self._model_to_entity(model) if model else None
     
+    async def delete_delta_link(self, account_id: str, folder_id: str = "Inbox") -> bool:
+        """Delete delta link."""
+        stmt = delete(DeltaLinkModel).where(
+            and_(
+                DeltaLinkModel.account_id == account_id,
+                DeltaLinkModel.folder_id == folder_id
+            )
+        )
+        result = await self.session.execute(stmt)
+        return result.rowcount > 0
+    
     def _model_to_entity(self, model: DeltaLinkModel) -> DeltaLink:
         """Convert model to entity."""
         return DeltaLink(
@@ -618,6 +1252,70 @@ class WebhookRepository(WebhookRepositoryPort):
         
         return self._model_to_entity(model) if model else None
     
+    async def get_webhook_subscriptions_by_ids(
+        self,
+        subscription_ids: List[str]
+    ) -> Dict[str, WebhookSubscription]:
+        """Get webhook subscriptions for several subscription IDs in one query."""
+        if not subscription_ids:
+            return {}
+        
+        stmt = select(WebhookSubscriptionModel).where(
+            WebhookSubscriptionModel.subscription_id.in_(subscription_ids)
+        )
+        result = await self.session.execute(stmt)
+        
+        return {
+            model.subscription_id: self._model_to_entity(model)
+            for model in result.scalars()
+        }
+    
+    async def get_expired_subscriptions(self) -> List[WebhookSubscription]:
+        """Get expired webhook subscriptions."""
+        stmt = select(WebhookSubscriptionModel).where(
+            WebhookSubscriptionModel.expires_datetime <= datetime.utcnow()
+        ).order_by(WebhookSubscriptionModel.expires_datetime.asc())
+        result = await self.session.execute(stmt)
+        models = result.scalars().all()
+        
+        return [self._model_to_entity(model) for model in models]
+    
+    async def get_expiring_subscriptions(
+        self,
+        expires_before: datetime,
+        after_subscription_id: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[WebhookSubscription]:
+        """Get active subscriptions expiring before a time, ordered by subscription ID."""
+        conditions = [
+            WebhookSubscriptionModel.is_active == True,
+            WebhookSubscriptionModel.expires_datetime <= expires_before
+        ]
+        if after_subscription_id:
+            conditions.append(WebhookSubscriptionModel.subscription_id > after_subscription_id)
+        
+        stmt = (
+            select(WebhookSubscriptionModel)
+            .where(and_(*conditions))
+            .order_by(WebhookSubscriptionModel.subscription_id.asc())
+        )
+        
+        if limit:
+            stmt = stmt.limit(limit)
+        
+        result = await self.session.execute(stmt)
+        models = result.scalars().all()
+        
+        return [self._model_to_entity(model) for model in models]
+    
+    async def delete_webhook_subscription(self, subscription_id: str) -> bool:
+        """Delete webhook subscription."""
+        stmt = delete(WebhookSubscriptionModel).where(
+            WebhookSubscriptionModel.subscription_id == subscription_id
+        )
+        result = await self.session.execute(stmt)
+        return result.rowcount > 0
+    
     def _model_to_entity(self, model: WebhookSubscriptionModel) -> WebhookSubscription:
         """Convert model to entity."""
         return WebhookSubscription(
@@ -659,12 +1357,42 @@ class ExternalAPIRepository(ExternalAPIRepositoryPort):
         
         return self._model_to_entity(model)
     
-    async def get_failed_api_calls(self, limit: Optional[int] = None) -> List[ExternalAPICall]:
+    async def save_api_calls(self, api_calls: List[ExternalAPICall]) -> int:
+        """Save several API call records with a single executemany insert."""
+        if not api_calls:
+            return 0
+        
+        await self.session.execute(
+            insert(ExternalAPICallModel),
+            [
+                {
+                    "message_id": api_call.message_id,
+                    "endpoint_url": api_call.endpoint_url,
+                    "http_method": api_call.http_method,
+                    "request_payload": api_call.request_payload,
+                    "response_status": api_call.response_status,
+                    "response_body": api_call.response_body,
+                    "success": api_call.success,
+                    "retry_count": api_call.retry_count,
+                    "created_at": api_call.created_at,
+                    "completed_at": api_call.completed_at
+                }
+                for api_call in api_calls
+            ]
+        )
+        
+        return len(api_calls)
+    
+    async def get_failed_api_calls(
+        self,
+        limit: Optional[int] = None,
+        max_retries: int = 3
+    ) -> List[ExternalAPICall]:
         """Get failed API calls for retry."""
         stmt = select(ExternalAPICallModel).where(
             and_(
                 ExternalAPICallModel.success == False,
-                ExternalAPICallModel.retry_count < 3
+                ExternalAPICallModel.retry_count < max_retries
             )
         ).order_by(ExternalAPICallModel.created_at.asc())
         
@@ -700,23 +1428,38 @@ class AuthenticationLogRepository(AuthenticationLogRepositoryPort):
     
     async def save_auth_log(self, log: AuthenticationLog) -> AuthenticationLog:
         """Save authentication log."""
-        model = AuthenticationLogModel(
-            account_id=log.account_id,
-            event_type=log.event_type,
-            authentication_flow=log.authentication_flow,
-            success=log.success,
-            error_code=log.error_code,
-            error_message=log.error_message,
-            ip_address=log.ip_address,
-            user_agent=log.user_agent,
-            timestamp=log.timestamp
-        )
+        model = self._entity_to_model(log)
         
         self.session.add(model)
         await self.session.flush()
         
         return self._model_to_entity(model)
     
+    async def save_auth_logs(self, logs: List[AuthenticationLog]) -> int:
+        """Save several authentication logs with a single executemany insert."""
+        if not logs:
+            return 0
+        
+        await self.session.execute(
+            insert(AuthenticationLogModel),
+            [
+                {
+                    "account_id": log.account_id,
+                    "event_type": log.event_type,
+                    "authentication_flow": log.authentication_flow,
+                    "success": log.success,
+                    "error_code": log.error_code,
+                    "error_message": log.error_message,
+                    "ip_address": log.ip_address,
+                    "user_agent": log.user_agent,
+                    "timestamp": log.timestamp
+                }
+                for log in logs
+            ]
+        )
+        
+        return len(logs)
+    
     async def get_auth_logs(
         self,
         account_id: Optional[str] = None,
@@ -726,6 +1469,37 @@ class AuthenticationLogRepository(AuthenticationLogRepositoryPort):
         limit: Optional[int] = None
     ) -> List[AuthenticationLog]:
         """Get authentication logs with filters."""
+        stmt = self._auth_logs_stmt(account_id, date_from, date_to, success, limit)
+        
+        result = await self.session.execute(stmt)
+        models = result.scalars().all()
+        
+        return [self._model_to_entity(model) for model in models]
+    
+    async def iter_auth_logs(
+        self,
+        account_id: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        success: Optional[bool] = None,
+        limit: Optional[int] = None
+    ) -> AsyncGenerator[AuthenticationLog, None]:
+        """Stream authentication logs with filters through a server-side cursor."""
+        stmt = self._auth_logs_stmt(account_id, date_from, date_to, success, limit)
+        
+        result = await self.session.stream_scalars(stmt)
+        async for model in result:
+            yield self._model_to_entity(model)
+    
+    @staticmethod
+    def _auth_logs_stmt(
+        account_id: Optional[str],
+        date_from: Optional[datetime],
+        date_to: Optional[datetime],
+        success: Optional[bool],
+        limit: Optional[int]
+    ):
+        """Build the filtered authentication log query, newest first."""
         stmt = select(AuthenticationLogModel)
         
         conditions = []
@@ -746,10 +1520,22 @@ class AuthenticationLogRepository(AuthenticationLogRepositoryPort):
         if limit:
             stmt = stmt.limit(limit)
         
-        result = await self.session.execute(stmt)
-        models = result.scalars().all()
-        
-        return [self._model_to_entity(model) for model in models]
+        return stmt
+    
+    @staticmethod
+    def _entity_to_model(log: AuthenticationLog) -> AuthenticationLogModel:
+        """Convert entity to model."""
+        return AuthenticationLogModel(
+            account_id=log.account_id,
+            event_type=log.event_type,
+            authentication_flow=log.authentication_flow,
+            success=log.success,
+            error_code=log.error_code,
+            error_message=log.error_message,
+            ip_address=log.ip_address,
+            user_agent=log.user_agent,
+            timestamp=log.timestamp
+        )
     
     def _model_to_entity(self, model: AuthenticationLogModel) -> AuthenticationLog:
         """Convert model to entity."""
@@ -764,94 +1550,3 @@ class AuthenticationLogRepository(AuthenticationLogRepositoryPort):
             user_agent=model.user_agent,
             timestamp=model.timestamp
         )
-
-
-class DatabaseRepositoryAdapter:
-    """Database repository adapter that implements all repository ports."""
-    
-    def __init__(self, db_adapter: DatabaseAdapter):
-        self.db_adapter = db_adapter
-    
-    async def create_account(self, account: Account) -> Account:
-        """Create account."""
-        async with self.db_adapter.session_scope() as session:
-            repo = AccountRepository(session)
-            return await repo.create_account(account)
-    
-    async def get_account_by_id(self, account_id: str) -> Optional[Account]:
-        """Get account by ID."""
-        async with self.db_adapter.session_scope() as session:
-            repo = AccountRepository(session)
-            return await repo.get_account_by_id(account_id)
-    
-    async def get_account_by_email(self, email: str) -> Optional[Account]:
-        """Get account by email."""
-        async with self.db_adapter.session_scope() as session:
-            repo = AccountRepository(session)
-            return await repo.get_account_by_email(email)
-    
-    async def get_all_accounts(self) -> List[Account]:
-        """Get all accounts."""
-        async with self.db_adapter.session_scope() as session:
-            repo = AccountRepository(session)
-            return await repo.get_all_accounts()
-    
-    async def update_account(self, account: Account) -> Account:
-        """Update account."""
-        async with self.db_adapter.session_scope() as session:
-            repo = AccountRepository(session)
-            return await repo.update_account(account)
-    
-    async def delete_account(self, account_id: str) -> bool:
-        """Delete account."""
-        async with self.db_adapter.session_scope() as session:
-            repo = AccountRepository(session)
-            return await repo.delete_account(account_id)
-    
-    async def create_auth_code_account(self, auth_account: AuthorizationCodeAccount) -> AuthorizationCodeAccount:
-        """Create authorization code account."""
-        async with self.db_adapter.session_scope() as session:
-            repo = AuthFlowRepository(session)
-            return await repo.create_auth_code_account(auth_account)
-    
-    async def get_auth_code_account(self, account_id: str) -> Optional[AuthorizationCodeAccount]:
-        """Get authorization code account."""
-        async with self.db_adapter.session_scope() as session:
-            repo = AuthFlowRepository(session)
-            return await repo.get_auth_code_account(account_id)
-    
-    async def create_device_code_account(self, device_account: DeviceCodeAccount) -> DeviceCodeAccount:
-        """Create device code account."""
-        async with self.db_adapter.session_scope() as session:
-            repo = AuthFlowRepository(session)
-            return await repo.create_device_code_account(device_account)
-    
-    async def get_device_code_account(self, account_id: str) -> Optional[DeviceCodeAccount]:
-        """Get device code account."""
-        async with self.db_adapter.session_scope() as session:
-            repo = AuthFlowRepository(session)
-            return await repo.get_device_code_account(account_id)
-    
-    async def update_device_code_account(self, device_account: DeviceCodeAccount) -> DeviceCodeAccount:
-        """Update device code account."""
-        async with self.db_adapter.session_scope() as session:
-            repo = AuthFlowRepository(session)
-            return await repo.update_device_code_account(device_account)
-    
-    async def save_token(self, token: Token) -> Token:
-        """Save token."""
-        async with self.db_adapter.session_scope() as session:
-            repo = TokenRepository(session)
-            return await repo.save_token(token)
-    
-    async def get_token_by_account_id(self, account_id: str) -> Optional[Token]:
-        """Get token by account ID."""
-        async with self.db_adapter.session_scope() as session:
-            repo = TokenRepository(session)
-            return await repo.get_token_by_account_id(account_id)
-    
-    async def delete_token(self, account_id: str) -> bool:
-        """Delete token."""
-        async with self.db_adapter.session_scope() as session:
-            repo = TokenRepository(session)
-            return await repo.delete_token(account_id)
@@ -1,131 +1,343 @@
 """Database repository adapter implementation."""
 
-from typing import List, Optional
-from adapters.db.database import DatabaseAdapter
+import asyncio
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, AsyncGenerator, Dict, List, Optional, Set, Tuple, Union
+from sqlalchemy.ext.asyncio import AsyncSession
+from adapters.db.database import DatabaseAdapter, get_database_adapter
 from adapters.db.repositories import (
     AccountRepository, AuthFlowRepository, TokenRepository,
     MailRepository, MailQueryHistoryRepository, DeltaLinkRepository,
     WebhookRepository, ExternalAPIRepository, AuthenticationLogRepository
 )
+from core.usecases.ports import AccountWithTokenStatus, MailSummary, UnitOfWorkPort
+from core.domain.bloom_filter import BloomFilter
 from core.domain.entities import (
     Account, AuthorizationCodeAccount, DeviceCodeAccount, Token,
     MailMessage, MailQueryHistory, DeltaLink, WebhookSubscription,
-    ExternalAPICall, AuthenticationLog
+    ExternalAPICall, AuthenticationLog, MailDirection, MailImportance
 )
 
 
-class DatabaseRepositoryAdapter:
+# Session of the open unit of work and the task that opened it
+_unit_of_work: ContextVar[Optional[Tuple[asyncio.Task, AsyncSession]]] = ContextVar(
+    "unit_of_work", default=None
+)
+
+# session.info key of the (account_id, message_id) pairs saved in a
+# session, added to the existence filters once the session commits
+_SAVED_MAIL_IDS = "saved_mail_ids"
+
+
+class DatabaseRepositoryAdapter(UnitOfWorkPort):
     """Database repository adapter that implements all repository ports."""
     
     def __init__(self, db_adapter: DatabaseAdapter):
         self.db_adapter = db_adapter
+        # account_id -> (UTC time built, filter of stored message IDs); kept
+        # current with this process's commits, but not with other processes'
+        self._existence_filters: Dict[str, Tuple[datetime, BloomFilter]] = {}
+        # account_id -> message IDs committed while a filter for it is being built
+        self._filter_builds: Dict[str, Dict[int, Set[str]]] = {}
+    
+    @asynccontextmanager
+    async def begin(self) -> AsyncGenerator[None, None]:
+        """Run the enclosed repository calls on one session and transaction."""
+        if self._current_unit_of_work() is not None:
+            yield
+            return
+        
+        async with self.db_adapter.session_scope() as session:
+            reset_token = _unit_of_work.set((asyncio.current_task(), session))
+            try:
+                yield
+            finally:
+                _unit_of_work.reset(reset_token)
+        self._note_saved_mails(session.info.pop(_SAVED_MAIL_IDS, ()))
+    
+    @asynccontextmanager
+    async def _session_scope(self) -> AsyncGenerator[AsyncSession, None]:
+        """Use the open unit of work's session, or a session of its own."""
+        session = self._current_unit_of_work()
+        if session is not None:
+            yield session
+            return
+        
+        async with self.db_adapter.session_scope() as session:
+            yield session
+        self._note_saved_mails(session.info.pop(_SAVED_MAIL_IDS, ()))
+    
+    @staticmethod
+    def _current_unit_of_work() -> Optional[AsyncSession]:
+        """Get the open unit of work's session if this task opened it.
+        
+        Tasks spawned inside a unit of work inherit the context variable, but
+        an AsyncSession must not be used concurrently, so they get their own.
+        """
+        unit_of_work = _unit_of_work.get()
+        if unit_of_work is None or unit_of_work[0] is not asyncio.current_task():
+            return None
+        return unit_of_work[1]
     
     # Account methods
     async def create_account(self, account: Account) -> Account:
         """Create account."""
-        async with self.db_adapter.session_scope() as session:
+        async with self._session_scope() as session:
             repo = AccountRepository(session)
             return await repo.create_account(account)
     
+    async def create_account_with_flow(
+        self,
+        account: Account,
+        flow_account: Union[AuthorizationCodeAccount, DeviceCodeAccount],
+        log_entry: Optional[AuthenticationLog] = None
+    ) -> Account:
+        """Create account with flow data and registration log."""
+        async with self._session_scope() as session:
+            repo = AccountRepository(session)
+            return await repo.create_account_with_flow(account, flow_account, log_entry)
+    
+    async def commit_authentication(
+        self,
+        account_id: str,
+        token: Token,
+        log_entry: AuthenticationLog,
+        authenticated_at: Optional[datetime] = None
+    ) -> Token:
+        """Save token, account authentication time and auth log together."""
+        async with self._session_scope() as session:
+            repo = AccountRepository(session)
+            return await repo.commit_authentication(account_id, token, log_entry, authenticated_at)
+    
     async def get_account_by_id(self, account_id: str) -> Optional[Account]:
         """Get account by ID."""
-        async with self.db_adapter.session_scope() as session:
+        async with self._session_scope() as session:
             repo = AccountRepository(session)
             return await repo.get_account_by_id(account_id)
     
+    async def get_accounts_by_ids(self, account_ids: List[str]) -> Dict[str, Account]:
+        """Get several accounts by ID."""
+        async with self._session_scope() as session:
+            repo = AccountRepository(session)
+            return await repo.get_accounts_by_ids(account_ids)
+    
     async def get_account_by_email(self, email: str) -> Optional[Account]:
         """Get account by email."""
-        async with self.db_adapter.session_scope() as session:
+        async with self._session_scope() as session:
             repo = AccountRepository(session)
             return await repo.get_account_by_email(email)
     
     async def get_all_accounts(self) -> List[Account]:
         """Get all accounts."""
-        async with self.db_adapter.session_scope() as session:
+        async with self._session_scope() as session:
             repo = AccountRepository(session)
             return await repo.get_all_accounts()
     
+    async def list_accounts_with_token_status(self) -> List[AccountWithTokenStatus]:
+        """Get all accounts with token status."""
+        async with self._session_scope() as session:
+            repo = AccountRepository(session)
+            return await repo.list_accounts_with_token_status()
+    
+    async def search_accounts(self, filters: Dict[str, Any]) -> List[Account]:
+        """Search accounts with filters."""
+        async with self._session_scope() as session:
+            repo = AccountRepository(session)
+            return await repo.search_accounts(filters)
+    
     async def update_account(self, account: Account) -> Account:
         """Update account."""
-        async with self.db_adapter.session_scope() as session:
+        async with self._session_scope() as session:
             repo = AccountRepository(session)
             return await repo.update_account(account)
     
     async def delete_account(self, account_id: str) -> bool:
         """Delete account."""
-        async with self.db_adapter.session_scope() as session:
+        async with self._session_scope() as session:
             repo = AccountRepository(session)
             return await repo.delete_account(account_id)
     
     # Auth flow methods
     async def create_auth_code_account(self, auth_account: AuthorizationCodeAccount) -> AuthorizationCodeAccount:
         """Create authorization code account."""
-        async with self.db_adapter.session_scope() as session:
+        async with self._session_scope() as session:
             repo = AuthFlowRepository(session)
             return await repo.create_auth_code_account(auth_account)
     
     async def get_auth_code_account(self, account_id: str) -> Optional[AuthorizationCodeAccount]:
         """Get authorization code account."""
-        async with self.db_adapter.session_scope() as session:
+        async with self._session_scope() as session:
             repo = AuthFlowRepository(session)
             return await repo.get_auth_code_account(account_id)
     
     async def create_device_code_account(self, device_account: DeviceCodeAccount) -> DeviceCodeAccount:
         """Create device code account."""
-        async with self.db_adapter.session_scope() as session:
+        async with self._session_scope() as session:
             repo = AuthFlowRepository(session)
             return await repo.create_device_code_account(device_account)
     
     async def get_device_code_account(self, account_id: str) -> Optional[DeviceCodeAccount]:
         """Get device code account."""
-        async with self.db_adapter.session_scope() as session:
+        async with self._session_scope() as session:
             repo = AuthFlowRepository(session)
             return await repo.get_device_code_account(account_id)
     
     async def update_device_code_account(self, device_account: DeviceCodeAccount) -> DeviceCodeAccount:
         """Update device code account."""
-        async with self.db_adapter.session_scope() as session:
+        async with self._session_scope() as session:
             repo = AuthFlowRepository(session)
             return await repo.update_device_code_account(device_account)
     
     # Token methods
     async def save_token(self, token: Token) -> Token:
         """Save token."""
-        async with self.db_adapter.session_scope() as session:
+        async with self._session_scope() as session:
             repo = TokenRepository(session)
             return await repo.save_token(token)
     
+    async def save_tokens(self, tokens: List[Token]) -> int:
+        """Save several tokens."""
+        async with self._session_scope() as session:
+            repo = TokenRepository(session)
+            return await repo.save_tokens(tokens)
+    
     async def get_token_by_account_id(self, account_id: str) -> Optional[Token]:
         """Get token by account ID."""
-        async with self.db_adapter.session_scope() as session:
+        async with self._session_scope() as session:
             repo = TokenRepository(session)
             return await repo.get_token_by_account_id(account_id)
     
+    async def get_token_status_by_account_id(self, account_id: str) -> Optional[Tuple[str, datetime]]:
+        """Get token status and expiry by account ID."""
+        async with self._session_scope() as session:
+            repo = TokenRepository(session)
+            return await repo.get_token_status_by_account_id(account_id)
+    
+    async def get_tokens_by_account_ids(self, account_ids: List[str]) -> Dict[str, Token]:
+        """Get tokens for several accounts, keyed by account ID."""
+        async with self._session_scope() as session:
+            repo = TokenRepository(session)
+            return await repo.get_tokens_by_account_ids(account_ids)
+    
     async def delete_token(self, account_id: str) -> bool:
         """Delete token."""
-        async with self.db_adapter.session_scope() as session:
+        async with self._session_scope() as session:
             repo = TokenRepository(session)
             return await repo.delete_token(account_id)
     
+    async def get_expiring_tokens(
+        self,
+        expires_before: datetime,
+        after_account_id: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Token]:
+        """Get tokens expiring before a time."""
+        async with self._session_scope() as session:
+            repo = TokenRepository(session)
+            return await repo.get_expiring_tokens(expires_before, after_account_id, limit)
+    
+    async def get_expiring_tokens_with_accounts(
+        self,
+        expires_before: datetime,
+        after_account_id: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Tuple[Token, Account]]:
+        """Get expiring tokens with their accounts."""
+        async with self._session_scope() as session:
+            repo = TokenRepository(session)
+            return await repo.get_expiring_tokens_with_accounts(expires_before, after_account_id, limit)
+    
     # Mail methods
     async def save_mail_message(self, message: MailMessage) -> MailMessage:
         """Save mail message."""
-        async with self.db_adapter.session_scope() as session:
+        async with self._session_scope() as session:
+            repo = MailRepository(session)
+            saved = await repo.save_mail_message(message)
+            session.info.setdefault(_SAVED_MAIL_IDS, []).append((saved.account_id, saved.message_id))
+            return saved
+    
+    async def save_mail_messages(self, messages: List[MailMessage]) -> List[MailMessage]:
+        """Save several mail messages."""
+        async with self._session_scope() as session:
+            repo = MailRepository(session)
+            saved = await repo.save_mail_messages(messages)
+            session.info.setdefault(_SAVED_MAIL_IDS, []).extend(
+                (message.account_id, message.message_id) for message in saved
+            )
+            return saved
+    
+    async def upsert_mail_messages(self, messages: List[MailMessage]) -> List[MailMessage]:
+        """Save mail messages, updating those already stored."""
+        async with self._session_scope() as session:
             repo = MailRepository(session)
-            return await repo.save_mail_message(message)
+            inserted = await repo.upsert_mail_messages(messages)
+            session.info.setdefault(_SAVED_MAIL_IDS, []).extend(
+                (message.account_id, message.message_id) for message in messages
+            )
+            return inserted
     
     async def get_mail_by_message_id(self, message_id: str) -> Optional[MailMessage]:
         """Get mail by message ID."""
-        async with self.db_adapter.session_scope() as session:
+        async with self._session_scope() as session:
             repo = MailRepository(session)
             return await repo.get_mail_by_message_id(message_id)
     
     async def mail_exists(self, message_id: str, account_id: str) -> bool:
         """Check if mail exists."""
-        async with self.db_adapter.session_scope() as session:
+        async with self._session_scope() as session:
             repo = MailRepository(session)
             return await repo.mail_exists(message_id, account_id)
     
+    async def get_existence_filter(self, account_id: str, built_after: datetime) -> BloomFilter:
+        """Get a Bloom filter of an account's stored message IDs, rebuilt if built before built_after."""
+        cached = self._existence_filters.get(account_id)
+        if cached is not None and cached[0] >= built_after and not cached[1].is_full:
+            return cached[1]
+        
+        # Taken before the read, so the filter claims no more than it covers
+        built_at = datetime.utcnow()
+        
+        # IDs committed while the stored IDs are being read may be missed by
+        # the read, so they are collected and added afterwards
+        committed: Set[str] = set()
+        builds = self._filter_builds.setdefault(account_id, {})
+        builds[id(committed)] = committed
+        try:
+            async with self._session_scope() as session:
+                repo = MailRepository(session)
+                existence_filter = await repo.get_existence_filter(account_id)
+        finally:
+            del builds[id(committed)]
+            if not builds:
+                self._filter_builds.pop(account_id, None)
+        
+        existence_filter.update(committed)
+        self._existence_filters[account_id] = (built_at, existence_filter)
+        return existence_filter
+    
+    def _note_saved_mails(self, saved: List[Tuple[str, str]]) -> None:
+        """Add committed mail message IDs to the cached and in-progress existence filters."""
+        for account_id, message_id in saved:
+            cached = self._existence_filters.get(account_id)
+            if cached is not None:
+                cached[1].add(message_id)
+            for committed in self._filter_builds.get(account_id, {}).values():
+                committed.add(message_id)
+    
+    async def get_existing_message_ids(self, account_id: str, message_ids: List[str]) -> Set[str]:
+        """Get existing message IDs for an account."""
+        async with self._session_scope() as session:
+            repo = MailRepository(session)
+            return await repo.get_existing_message_ids(account_id, message_ids)
+    
+    async def get_mails_by_message_ids(self, account_id: str, message_ids: List[str]) -> List[MailMessage]:
+        """Get an account's mails by message IDs."""
+        async with self._session_scope() as session:
+            repo = MailRepository(session)
+            return await repo.get_mails_by_message_ids(account_id, message_ids)
+    
     async def get_mails_by_account(
         self,
         account_id: str,
@@ -133,34 +345,116 @@ class DatabaseRepositoryAdapter:
         offset: Optional[int] = None
     ) -> List[MailMessage]:
         """Get mails by account."""
-        async with self.db_adapter.session_scope() as session:
+        async with self._session_scope() as session:
             repo = MailRepository(session)
             return await repo.get_mails_by_account(account_id, limit, offset)
     
+    async def search_mail_summaries(
+        self,
+        account_id: Optional[str] = None,
+        sender_email: Optional[str] = None,
+        subject_contains: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        is_read: Optional[bool] = None,
+        importance: Optional[MailImportance] = None,
+        direction: Optional[MailDirection] = None,
+        limit: Optional[int] = None
+    ) -> List[MailSummary]:
+        """Search mail summaries with filters."""
+        async with self._session_scope() as session:
+            repo = MailRepository(session)
+            return await repo.search_mail_summaries(
+                account_id, sender_email, subject_contains, date_from, date_to,
+                is_read, importance, direction, limit
+            )
+    
+    async def get_mail_body(self, account_id: str, message_id: str) -> Optional[Tuple[Optional[str], str]]:
+        """Get a mail's body."""
+        async with self._session_scope() as session:
+            repo = MailRepository(session)
+            return await repo.get_mail_body(account_id, message_id)
+    
+    async def get_mails_by_account_id(
+        self,
+        account_id: str,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[MailMessage], Optional[str]]:
+        """Get a page of mails by account ID."""
+        async with self._session_scope() as session:
+            repo = MailRepository(session)
+            return await repo.get_mails_by_account_id(account_id, limit, cursor)
+    
+    async def iter_mails_by_account_id(
+        self,
+        account_id: str,
+        batch_size: int = 500
+    ) -> AsyncGenerator[MailMessage, None]:
+        """Stream mails by account ID."""
+        async with self._session_scope() as session:
+            repo = MailRepository(session)
+            async for message in repo.iter_mails_by_account_id(account_id, batch_size):
+                yield message
+    
+    async def iter_search_mails(
+        self,
+        account_id: Optional[str] = None,
+        sender_email: Optional[str] = None,
+        subject_contains: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        is_read: Optional[bool] = None,
+        importance: Optional[MailImportance] = None,
+        direction: Optional[MailDirection] = None,
+        limit: Optional[int] = None,
+        batch_size: int = 500
+    ) -> AsyncGenerator[MailMessage, None]:
+        """Stream mails matching filters."""
+        async with self._session_scope() as session:
+            repo = MailRepository(session)
+            async for message in repo.iter_search_mails(
+                account_id, sender_email, subject_contains, date_from, date_to,
+                is_read, importance, direction, limit, batch_size
+            ):
+                yield message
+    
     # Query history methods
     async def save_query_history(self, history: MailQueryHistory) -> MailQueryHistory:
         """Save query history."""
-        async with self.db_adapter.session_scope() as session:
+        async with self._session_scope() as session:
             repo = MailQueryHistoryRepository(session)
             return await repo.save_query_history(history)
     
+    async def save_query_histories(self, histories: List[MailQueryHistory]) -> int:
+        """Save several query history entries."""
+        async with self._session_scope() as session:
+            repo = MailQueryHistoryRepository(session)
+            return await repo.save_query_histories(histories)
+    
     async def get_query_histories(
         self,
         account_id: Optional[str] = None,
         limit: Optional[int] = None
     ) -> List[MailQueryHistory]:
         """Get query histories."""
-        async with self.db_adapter.session_scope() as session:
+        async with self._session_scope() as session:
             repo = MailQueryHistoryRepository(session)
             return await repo.get_query_histories(account_id, limit)
     
     # Auth log methods
     async def save_auth_log(self, log: AuthenticationLog) -> AuthenticationLog:
         """Save authentication log."""
-        async with self.db_adapter.session_scope() as session:
+        async with self._session_scope() as session:
             repo = AuthenticationLogRepository(session)
             return await repo.save_auth_log(log)
     
+    async def save_auth_logs(self, logs: List[AuthenticationLog]) -> int:
+        """Save several authentication logs."""
+        async with self._session_scope() as session:
+            repo = AuthenticationLogRepository(session)
+            return await repo.save_auth_logs(logs)
+    
     async def get_auth_logs(
         self,
         account_id: Optional[str] = None,
@@ -170,42 +464,98 @@ class DatabaseRepositoryAdapter:
         limit: Optional[int] = None
     ) -> List[AuthenticationLog]:
         """Get authentication logs."""
-        async with self.db_adapter.session_scope() as session:
+        async with self._session_scope() as session:
             repo = AuthenticationLogRepository(session)
             return await repo.get_auth_logs(account_id, date_from, date_to, success, limit)
     
+    async def iter_auth_logs(
+        self,
+        account_id: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        success: Optional[bool] = None,
+        limit: Optional[int] = None
+    ) -> AsyncGenerator[AuthenticationLog, None]:
+        """Stream authentication logs."""
+        async with self._session_scope() as session:
+            repo = AuthenticationLogRepository(session)
+            async for log in repo.iter_auth_logs(account_id, date_from, date_to, success, limit):
+                yield log
+    
     # Delta link methods
     async def save_delta_link(self, delta_link: DeltaLink) -> DeltaLink:
         """Save delta link."""
-        async with self.db_adapter.session_scope() as session:
+        async with self._session_scope() as session:
             repo = DeltaLinkRepository(session)
             return await repo.save_delta_link(delta_link)
     
     async def get_delta_link(self, account_id: str, folder_id: str) -> Optional[DeltaLink]:
         """Get delta link."""
-        async with self.db_adapter.session_scope() as session:
+        async with self._session_scope() as session:
             repo = DeltaLinkRepository(session)
             return await repo.get_delta_link(account_id, folder_id)
     
+    async def delete_delta_link(self, account_id: str, folder_id: str = "Inbox") -> bool:
+        """Delete delta link."""
+        async with self._session_scope() as session:
+            repo = DeltaLinkRepository(session)
+            return await repo.delete_delta_link(account_id, folder_id)
+    
     # Webhook methods
     async def save_webhook_subscription(self, subscription: WebhookSubscription) -> WebhookSubscription:
         """Save webhook subscription."""
-        async with self.db_adapter.session_scope() as session:
+        async with self._session_scope() as session:
             repo = WebhookRepository(session)
             return await repo.save_webhook_subscription(subscription)
     
     async def get_webhook_subscription(self, subscription_id: str) -> Optional[WebhookSubscription]:
         """Get webhook subscription."""
-        async with self.db_adapter.session_scope() as session:
+        async with self._session_scope() as session:
             repo = WebhookRepository(session)
             return await repo.get_webhook_subscription(subscription_id)
     
+    async def get_webhook_subscriptions_by_ids(
+        self,
+        subscription_ids: List[str]
+    ) -> Dict[str, WebhookSubscription]:
+        """Get webhook subscriptions for several subscription IDs."""
+        async with self._session_scope() as session:
+            repo = WebhookRepository(session)
+            return await repo.get_webhook_subscriptions_by_ids(subscription_ids)
+    
+    async def get_expiring_subscriptions(
+        self,
+        expires_before: datetime,
+        after_subscription_id: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[WebhookSubscription]:
+        """Get active webhook subscriptions expiring before a time."""
+        async with self._session_scope() as session:
+            repo = WebhookRepository(session)
+            return await repo.get_expiring_subscriptions(expires_before, after_subscription_id, limit)
+    
     # External API methods
-    async def save_external_api_call(self, api_call: ExternalAPICall) -> ExternalAPICall:
+    async def save_api_call(self, api_call: ExternalAPICall) -> ExternalAPICall:
         """Save external API call."""
-        async with self.db_adapter.session_scope() as session:
+        async with self._session_scope() as session:
+            repo = ExternalAPIRepository(session)
+            return await repo.save_api_call(api_call)
+    
+    async def save_api_calls(self, api_calls: List[ExternalAPICall]) -> int:
+        """Save several external API calls."""
+        async with self._session_scope() as session:
+            repo = ExternalAPIRepository(session)
+            return await repo.save_api_calls(api_calls)
+    
+    async def get_failed_api_calls(
+        self,
+        limit: Optional[int] = None,
+        max_retries: int = 3
+    ) -> List[ExternalAPICall]:
+        """Get failed external API calls for retry."""
+        async with self._session_scope() as session:
             repo = ExternalAPIRepository(session)
-            return await repo.save_external_api_call(api_call)
+            return await repo.get_failed_api_calls(limit, max_retries)
     
     async def get_external_api_calls(
         self,
@@ -213,6 +563,21 @@ class DatabaseRepositoryAdapter:
         limit: Optional[int] = None
     ) -> List[ExternalAPICall]:
         """Get external API calls."""
-        async with self.db_adapter.session_scope() as session:
+        async with self._session_scope() as session:
             repo = ExternalAPIRepository(session)
             return await repo.get_external_api_calls(account_id, limit)
+
+
+_repository_adapter: Optional[DatabaseRepositoryAdapter] = None
+
+
+def get_repository_adapter(db_adapter: Optional[DatabaseAdapter] = None) -> DatabaseRepositoryAdapter:
+    """Get or create the shared repository adapter instance."""
+    global _repository_adapter
+    
+    if _repository_adapter is None:
+        if db_adapter is None:
+            db_adapter = get_database_adapter()
+        _repository_adapter = DatabaseRepositoryAdapter(db_adapter)
+    
+    return _repository_adapter
@@ -0,0 +1,150 @@
+"""External API client adapter (embedding service)."""
+
+import asyncio
+from typing import Dict, Any, List, Optional, Tuple
+import httpx
+import orjson
+import structlog
+
+from config.settings import Settings, get_settings
+
+logger = structlog.get_logger()
+
+# Connection pool of the shared HTTP client
+EXTERNAL_API_MAX_CONNECTIONS = 20
+EXTERNAL_API_MAX_KEEPALIVE_CONNECTIONS = 10
+
+# Batch bodies are encoded item by item, yielding to the event loop after
+# every this many encoded bytes so large batches don't stall other tasks
+ENCODE_YIELD_BYTES = 64 * 1024
+
+
+class ExternalAPIClientAdapter:
+    """External API client implementation of ExternalAPIClientPort."""
+    
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self.timeout = httpx.Timeout(float(settings.EXTERNAL_API_TIMEOUT))
+        self._client: Optional[httpx.AsyncClient] = None
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the shared HTTP client, creating it on first use."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=EXTERNAL_API_MAX_CONNECTIONS,
+                    max_keepalive_connections=EXTERNAL_API_MAX_KEEPALIVE_CONNECTIONS
+                )
+            )
+        return self._client
+    
+    async def aclose(self) -> None:
+        """Close the shared HTTP client and its pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    async def send_mail_data(
+        self,
+        endpoint_url: str,
+        mail_data: Dict[str, Any],
+        timeout: int = 30
+    ) -> Dict[str, Any]:
+        """Send mail data to external API as an orjson-encoded body."""
+        status_code, body = await self._post(endpoint_url, mail_data, timeout)
+        
+        return {
+            "status_code": status_code,
+            "body": body
+        }
+    
+    async def send_mail_data_batch(
+        self,
+        endpoint_url: str,
+        mail_data: List[Dict[str, Any]],
+        timeout: int = 30
+    ) -> List[Dict[str, Any]]:
+        """Send several mail data items to external API as one JSON array.
+        
+        A response array with one entry per item is split across the items;
+        any other response body is shared by all of them.
+        """
+        status_code, body = await self._post(endpoint_url, mail_data, timeout)
+        
+        if isinstance(body, list) and len(body) == len(mail_data):
+            return [{"status_code": status_code, "body": item_body} for item_body in body]
+        return [{"status_code": status_code, "body": body} for _ in mail_data]
+    
+    @staticmethod
+    async def _encode(data: Any) -> bytes:
+        """Encode a request body with orjson, a list item at a time."""
+        if not isinstance(data, list):
+            return orjson.dumps(data, option=orjson.OPT_NAIVE_UTC)
+        
+        parts = []
+        pending = 0
+        for item in data:
+            part = orjson.dumps(item, option=orjson.OPT_NAIVE_UTC)
+            parts.append(part)
+            pending += len(part)
+            if pending >= ENCODE_YIELD_BYTES:
+                pending = 0
+                await asyncio.sleep(0)
+        
+        return b"[" + b",".join(parts) + b"]"
+    
+    async def _post(self, endpoint_url: str, data: Any, timeout: int) -> Tuple[int, Any]:
+        """POST an orjson-encoded body; returns (status code, decoded response body)."""
+        content = await self._encode(data)
+        
+        try:
+            response = await self._get_client().post(
+                endpoint_url,
+                content=content,
+                headers={
+                    "Content-Type": "application/json",
+                    "Accept": "application/json",
+                    "User-Agent": f"GraphAPIQuery/{self.settings.APP_VERSION}"
+                },
+                timeout=timeout
+            )
+            response.raise_for_status()
+            
+            body = None
+            if response.content:
+                try:
+                    body = orjson.loads(response.content)
+                except orjson.JSONDecodeError:
+                    body = response.text
+            
+            return response.status_code, body
+            
+        except Exception as e:
+            logger.error(
+                "Failed to send mail data to external API",
+                error=str(e),
+                endpoint_url=endpoint_url
+            )
+            raise
+
+
+_external_api_client_adapter: Optional[ExternalAPIClientAdapter] = None
+
+
+def get_external_api_client_adapter(settings: Optional[Settings] = None) -> ExternalAPIClientAdapter:
+    """Get or create the shared external API client adapter instance."""
+    global _external_api_client_adapter
+    
+    if _external_api_client_adapter is None:
+        if settings is None:
+            settings = get_settings()
+        _external_api_client_adapter = ExternalAPIClientAdapter(settings)
+    
+    return _external_api_client_adapter
+
+
+async def close_external_api_client_adapter() -> None:
+    """Close the shared external API client adapter's connections."""
+    if _external_api_client_adapter is not None:
+        await _external_api_client_adapter.aclose()
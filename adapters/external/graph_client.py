@@ -1,12 +1,14 @@
 """Microsoft Graph API client adapter."""
 
 import asyncio
-import json
+import os
 import uuid
+from collections import Counter
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Sequence, Union, AsyncGenerator
 from urllib.parse import urlencode, urlparse, parse_qs
 import httpx
+import orjson
 import structlog
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
@@ -15,10 +17,38 @@ from core.domain.entities import (
     DeltaLink, WebhookSubscription
 )
 from core.usecases.ports import GraphAPIClientPort
-from config.settings import Settings
+from config.settings import Settings, get_settings
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
 logger = structlog.get_logger()
 
+# Graph JSON batching limits: subrequests per $batch call, and concurrent
+# requests Exchange Online accepts against a single mailbox
+GRAPH_BATCH_MAX_REQUESTS = 20
+GRAPH_BATCH_MAX_PER_MAILBOX = 4
+
+# Connection pool of the shared HTTP client
+GRAPH_MAX_CONNECTIONS = 100
+GRAPH_MAX_KEEPALIVE_CONNECTIONS = 50
+
+# Default bound on concurrent requests in get_messages_for_many
+GRAPH_FANOUT_CONCURRENCY = min(2 * (os.cpu_count() or 1), GRAPH_MAX_CONNECTIONS)
+
+# $select used when the caller does not name the message fields
+DEFAULT_MESSAGE_SELECT = (
+    "id,internetMessageId,subject,from,toRecipients,ccRecipients,"
+    "bccRecipients,bodyPreview,body,importance,isRead,hasAttachments,"
+    "receivedDateTime,sentDateTime,categories"
+)
+
+# Attachment metadata inlined into message pages; content bytes are left out
+ATTACHMENTS_EXPAND = "attachments($select=id,name,contentType,size,isInline)"
+
 
 class GraphAPIClientAdapter(GraphAPIClientPort):
     """Microsoft Graph API client implementation."""
@@ -27,14 +57,36 @@ class GraphAPIClientAdapter(GraphAPIClientPort):
         self.settings = settings
         self.base_url = "https://graph.microsoft.com/v1.0"
         self.timeout = httpx.Timeout(30.0)
-        
+        self._client: Optional[httpx.AsyncClient] = None
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the shared HTTP client, creating it on first use."""
+        if self._client is None or self._client.is_closed:
+            # Requests for all accounts share the pool without any lock; with
+            # HTTP/2 they are multiplexed over a few connections to Graph
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_connections=GRAPH_MAX_CONNECTIONS,
+                    max_keepalive_connections=GRAPH_MAX_KEEPALIVE_CONNECTIONS
+                )
+            )
+        return self._client
+    
+    async def aclose(self) -> None:
+        """Close the shared HTTP client and its pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
     async def _get_headers(self, token: Token) -> Dict[str, str]:
         """Get headers for Graph API requests."""
         return {
             "Authorization": f"{token.token_type} {token.access_token}",
             "Content-Type": "application/json",
             "Accept": "application/json",
-            "User-Agent": f"GraphAPIQuery/{self.settings.VERSION}",
+            "User-Agent": f"GraphAPIQuery/{self.settings.APP_VERSION}",
             "Prefer": "outlook.body-content-type=\"text\""
         }
     
@@ -51,33 +103,33 @@ class GraphAPIClientAdapter(GraphAPIClientPort):
         params: Optional[Dict[str, Any]] = None,
         json_data: Optional[Dict[str, Any]] = None
     ) -> httpx.Response:
-        """Make HTTP request with retry logic."""
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.request(
-                method=method,
-                url=url,
-                headers=headers,
-                params=params,
-                json=json_data
+        """Make HTTP request with retry logic; request bodies are orjson-encoded."""
+        client = self._get_client()
+        response = await client.request(
+            method=method,
+            url=url,
+            headers=headers,
+            params=params,
+            content=orjson.dumps(json_data) if json_data is not None else None
+        )
+        
+        # Handle rate limiting
+        if response.status_code == 429:
+            retry_after = int(response.headers.get("Retry-After", 60))
+            logger.warning(
+                "Rate limited by Graph API",
+                retry_after=retry_after,
+                url=url
             )
-            
-            # Handle rate limiting
-            if response.status_code == 429:
-                retry_after = int(response.headers.get("Retry-After", 60))
-                logger.warning(
-                    "Rate limited by Graph API",
-                    retry_after=retry_after,
-                    url=url
-                )
-                await asyncio.sleep(retry_after)
-                raise httpx.HTTPStatusError(
-                    "Rate limited",
-                    request=response.request,
-                    response=response
-                )
-            
-            response.raise_for_status()
-            return response
+            await asyncio.sleep(retry_after)
+            raise httpx.HTTPStatusError(
+                "Rate limited",
+                request=response.request,
+                response=response
+            )
+        
+        response.raise_for_status()
+        return response
     
     async def get_user_info(self, token: Token) -> Dict[str, Any]:
         """Get user information from Graph API."""
@@ -86,7 +138,7 @@ class GraphAPIClientAdapter(GraphAPIClientPort):
         
         try:
             response = await self._make_request("GET", url, headers)
-            user_data = response.json()
+            user_data = orjson.loads(response.content)
             
             logger.info(
                 "Retrieved user info from Graph API",
@@ -112,9 +164,10 @@ class GraphAPIClientAdapter(GraphAPIClientPort):
         filters: Optional[Dict[str, Any]] = None,
         select_fields: Optional[List[str]] = None,
         top: Optional[int] = None,
-        skip: Optional[int] = None
+        skip: Optional[int] = None,
+        include_attachments: bool = False
     ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
-        """Get messages from Graph API."""
+        """Get messages from Graph API, with attachment metadata inlined if requested."""
         headers = await self._get_headers(token)
         
         # Build URL
@@ -126,14 +179,10 @@ class GraphAPIClientAdapter(GraphAPIClientPort):
         # Build query parameters
         params = {}
         
-        if select_fields:
-            params["$select"] = ",".join(select_fields)
-        else:
-            params["$select"] = (
-                "id,internetMessageId,subject,from,toRecipients,ccRecipients,"
-                "bccRecipients,bodyPreview,body,importance,isRead,hasAttachments,"
-                "receivedDateTime,sentDateTime,categories"
-            )
+        params["$select"] = self._select_param(select_fields)
+        
+        if include_attachments:
+            params["$expand"] = ATTACHMENTS_EXPAND
         
         if filters:
             filter_parts = []
@@ -174,7 +223,7 @@ class GraphAPIClientAdapter(GraphAPIClientPort):
         
         try:
             response = await self._make_request("GET", url, headers, params)
-            data = response.json()
+            data = orjson.loads(response.content)
             
             messages = data.get("value", [])
             next_link = data.get("@odata.nextLink")
@@ -280,17 +329,11 @@ class GraphAPIClientAdapter(GraphAPIClientPort):
             params = {"$deltatoken": delta_token}
         else:
             url = f"{base_url}/delta"
-            params = {
-                "$select": (
-                    "id,internetMessageId,subject,from,toRecipients,ccRecipients,"
-                    "bccRecipients,bodyPreview,body,importance,isRead,hasAttachments,"
-                    "receivedDateTime,sentDateTime,categories"
-                )
-            }
+            params = {"$select": DEFAULT_MESSAGE_SELECT}
         
         try:
             response = await self._make_request("GET", url, headers, params)
-            data = response.json()
+            data = orjson.loads(response.content)
             
             messages = data.get("value", [])
             next_link = data.get("@odata.nextLink")
@@ -321,6 +364,194 @@ class GraphAPIClientAdapter(GraphAPIClientPort):
             )
             raise
     
+    async def batch_get_messages(
+        self,
+        access_token: str,
+        requests: List[Dict[str, Any]]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Get message pages for several mailboxes through Graph JSON batching.
+        
+        Each request carries an ``id`` plus ``user_id``, ``folder`` and the
+        optional ``filter_query``, ``select_fields``, ``top`` and ``order_by``.
+        Returns a ``{"status": ..., "body": ...}`` subresponse per request id.
+        """
+        url = f"{self.base_url}/$batch"
+        
+        batches = self._chunk_batch_requests([
+            (request["user_id"], {
+                "id": request["id"],
+                "method": "GET",
+                "url": self._batch_messages_url(request),
+                "headers": {"Prefer": "outlook.body-content-type=\"text\""}
+            })
+            for request in requests
+        ])
+        
+        try:
+            results = await self._send_batches(access_token, batches)
+            
+            logger.info(
+                "Retrieved batched messages from Graph API",
+                requests=len(requests),
+                batches=len(batches)
+            )
+            
+            return results
+            
+        except Exception as e:
+            logger.error(
+                "Failed to get batched messages from Graph API",
+                error=str(e),
+                url=url,
+                requests=len(requests)
+            )
+            raise
+    
+    async def get_messages_for_many(
+        self,
+        requests: List[Dict[str, Any]],
+        concurrency: Optional[int] = None
+    ) -> AsyncGenerator[Tuple[str, Any], None]:
+        """Get message pages for several mailboxes concurrently, yielding each as it arrives.
+        
+        Each request carries an ``id`` and ``access_token`` plus the fields
+        batch_get_messages takes. Yields (request id, page), with the error
+        raised for a request in place of its page.
+        """
+        semaphore = asyncio.Semaphore(concurrency or GRAPH_FANOUT_CONCURRENCY)
+        pages: asyncio.Queue = asyncio.Queue()
+        
+        async def _fetch(request: Dict[str, Any]) -> None:
+            headers = self._bearer_headers(request["access_token"])
+            headers["Prefer"] = "outlook.body-content-type=\"text\""
+            url = f"{self.base_url}{self._batch_messages_url(request)}"
+            
+            try:
+                async with semaphore:
+                    response = await self._make_request("GET", url, headers)
+                page = orjson.loads(response.content)
+            except Exception as e:
+                logger.error(
+                    "Failed to get messages from Graph API",
+                    error=str(e),
+                    url=url
+                )
+                page = e
+            await pages.put((request["id"], page))
+        
+        async with asyncio.TaskGroup() as fetch_tasks:
+            for request in requests:
+                fetch_tasks.create_task(_fetch(request))
+            for _ in requests:
+                yield await pages.get()
+    
+    async def _send_batches(
+        self,
+        access_token: str,
+        batches: List[List[Dict[str, Any]]]
+    ) -> Dict[str, Dict[str, Any]]:
+        """POST $batch bodies concurrently; returns a {"status", "body"} subresponse per request id."""
+        headers = self._bearer_headers(access_token)
+        url = f"{self.base_url}/$batch"
+        
+        async def _send(batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            response = await self._make_request("POST", url, headers, json_data={"requests": batch})
+            return orjson.loads(response.content).get("responses", [])
+        
+        results = {}
+        for responses in await asyncio.gather(*map(_send, batches)):
+            for subresponse in responses:
+                results[subresponse["id"]] = {
+                    "status": subresponse.get("status", 500),
+                    "body": subresponse.get("body") or {}
+                }
+        return results
+    
+    async def iter_message_pages(
+        self,
+        access_token: str,
+        next_link: str
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """Follow @odata.nextLink from a message page, yielding each further page."""
+        headers = self._bearer_headers(access_token)
+        headers["Prefer"] = "outlook.body-content-type=\"text\""
+        
+        while next_link:
+            try:
+                response = await self._make_request("GET", next_link, headers)
+                page = orjson.loads(response.content)
+                
+            except Exception as e:
+                logger.error(
+                    "Failed to get next message page from Graph API",
+                    error=str(e),
+                    url=next_link
+                )
+                raise
+            
+            yield page
+            next_link = page.get("@odata.nextLink")
+    
+    def _bearer_headers(self, access_token: str) -> Dict[str, str]:
+        """Get headers for Graph API requests made with a raw access token."""
+        return {
+            "Authorization": f"Bearer {access_token}",
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+            "User-Agent": f"GraphAPIQuery/{self.settings.APP_VERSION}"
+        }
+    
+    def _batch_messages_url(self, request: Dict[str, Any]) -> str:
+        """Build the relative messages URL of a batch subrequest."""
+        params = {
+            "$select": self._select_param(request.get("select_fields")),
+            "$orderby": request.get("order_by") or "receivedDateTime desc"
+        }
+        if request.get("filter_query"):
+            params["$filter"] = request["filter_query"]
+        if request.get("top"):
+            params["$top"] = request["top"]
+        
+        return (
+            f"/users/{request['user_id']}/mailFolders/{request.get('folder', 'inbox')}/messages"
+            f"?{urlencode(params, safe='$,')}"
+        )
+    
+    @staticmethod
+    def _select_param(select_fields: Optional[Union[str, Sequence[str]]]) -> str:
+        """Get the $select value; a pre-joined string is used as is."""
+        if not select_fields:
+            return DEFAULT_MESSAGE_SELECT
+        if isinstance(select_fields, str):
+            return select_fields
+        return ",".join(select_fields)
+    
+    @staticmethod
+    def _chunk_subrequests(subrequests: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Split subrequests into $batch bodies of at most GRAPH_BATCH_MAX_REQUESTS."""
+        return [
+            subrequests[start:start + GRAPH_BATCH_MAX_REQUESTS]
+            for start in range(0, len(subrequests), GRAPH_BATCH_MAX_REQUESTS)
+        ]
+    
+    @staticmethod
+    def _chunk_batch_requests(
+        subrequests: List[Tuple[str, Dict[str, Any]]]
+    ) -> List[List[Dict[str, Any]]]:
+        """Split (mailbox, subrequest) pairs into $batch bodies within Graph's limits."""
+        batches = []
+        for mailbox, subrequest in subrequests:
+            for batch, per_mailbox in batches:
+                if len(batch) < GRAPH_BATCH_MAX_REQUESTS and per_mailbox[mailbox] < GRAPH_BATCH_MAX_PER_MAILBOX:
+                    break
+            else:
+                batch, per_mailbox = [], Counter()
+                batches.append((batch, per_mailbox))
+            batch.append(subrequest)
+            per_mailbox[mailbox] += 1
+        
+        return [batch for batch, _ in batches]
+    
     async def create_webhook_subscription(
         self,
         token: Token,
@@ -335,7 +566,7 @@ class GraphAPIClientAdapter(GraphAPIClientPort):
         url = f"{self.base_url}/subscriptions"
         
         if not client_state:
-            client_state = str(uuid.uuid4())
+            client_state = uuid.uuid4().hex
         
         payload = {
             "changeType": ",".join(change_types),
@@ -347,7 +578,7 @@ class GraphAPIClientAdapter(GraphAPIClientPort):
         
         try:
             response = await self._make_request("POST", url, headers, json_data=payload)
-            subscription_data = response.json()
+            subscription_data = orjson.loads(response.content)
             
             logger.info(
                 "Created webhook subscription",
@@ -383,7 +614,7 @@ class GraphAPIClientAdapter(GraphAPIClientPort):
         
         try:
             response = await self._make_request("PATCH", url, headers, json_data=payload)
-            subscription_data = response.json()
+            subscription_data = orjson.loads(response.content)
             
             logger.info(
                 "Renewed webhook subscription",
@@ -428,6 +659,87 @@ class GraphAPIClientAdapter(GraphAPIClientPort):
             )
             return False
     
+    async def renew_webhook_subscriptions_bulk(
+        self,
+        access_token: str,
+        subscription_ids: List[str],
+        expiration_datetime: datetime
+    ) -> Dict[str, Dict[str, Any]]:
+        """Renew several webhook subscriptions through Graph JSON batching.
+        
+        Returns a ``{"status": ..., "body": ...}`` subresponse per subscription ID.
+        """
+        payload = {"expirationDateTime": expiration_datetime.isoformat() + "Z"}
+        subrequests = [
+            {
+                "id": subscription_id,
+                "method": "PATCH",
+                "url": f"/subscriptions/{subscription_id}",
+                "headers": {"Content-Type": "application/json"},
+                "body": payload
+            }
+            for subscription_id in subscription_ids
+        ]
+        
+        try:
+            results = await self._send_batches(access_token, self._chunk_subrequests(subrequests))
+            
+            logger.info(
+                "Renewed webhook subscriptions in batches",
+                subscriptions=len(subscription_ids),
+                failed=sum(1 for result in results.values() if result["status"] >= 400),
+                new_expiration=expiration_datetime
+            )
+            
+            return results
+            
+        except Exception as e:
+            logger.error(
+                "Failed to renew webhook subscriptions in batches",
+                error=str(e),
+                subscriptions=len(subscription_ids)
+            )
+            raise
+    
+    async def delete_webhook_subscriptions_bulk(
+        self,
+        access_token: str,
+        subscription_ids: List[str]
+    ) -> Dict[str, bool]:
+        """Delete several webhook subscriptions through Graph JSON batching."""
+        subrequests = [
+            {
+                "id": subscription_id,
+                "method": "DELETE",
+                "url": f"/subscriptions/{subscription_id}"
+            }
+            for subscription_id in subscription_ids
+        ]
+        
+        try:
+            results = await self._send_batches(access_token, self._chunk_subrequests(subrequests))
+            
+            deleted = {
+                subscription_id: results.get(subscription_id, {}).get("status", 500) < 400
+                for subscription_id in subscription_ids
+            }
+            
+            logger.info(
+                "Deleted webhook subscriptions in batches",
+                subscriptions=len(subscription_ids),
+                deleted=sum(deleted.values())
+            )
+            
+            return deleted
+            
+        except Exception as e:
+            logger.error(
+                "Failed to delete webhook subscriptions in batches",
+                error=str(e),
+                subscriptions=len(subscription_ids)
+            )
+            return dict.fromkeys(subscription_ids, False)
+    
     async def revoke_user_sessions(
         self,
         token: Token,
@@ -443,7 +755,7 @@ class GraphAPIClientAdapter(GraphAPIClientPort):
         
         try:
             response = await self._make_request("POST", url, headers)
-            result = response.json()
+            result = orjson.loads(response.content)
             
             logger.info(
                 "Revoked user sessions",
@@ -471,7 +783,8 @@ class GraphAPIClientAdapter(GraphAPIClientPort):
         sender_email: Optional[str] = None,
         is_read: Optional[bool] = None,
         search: Optional[str] = None,
-        top: Optional[int] = None
+        top: Optional[int] = None,
+        include_attachments: bool = False
     ) -> List[MailMessage]:
         """Query messages and return as MailMessage entities."""
         # Build filters
@@ -492,7 +805,8 @@ class GraphAPIClientAdapter(GraphAPIClientPort):
             token=token,
             folder_id=folder_id,
             filters=filters,
-            top=top
+            top=top,
+            include_attachments=include_attachments
         )
         
         # Parse to MailMessage entities
@@ -583,3 +897,24 @@ class GraphAPIClientAdapter(GraphAPIClientPort):
             categories=message_data.get("categories"),
             created_at=datetime.utcnow()
         )
+
+
+_graph_client_adapter: Optional[GraphAPIClientAdapter] = None
+
+
+def get_graph_client_adapter(settings: Optional[Settings] = None) -> GraphAPIClientAdapter:
+    """Get or create the shared Graph API client adapter instance."""
+    global _graph_client_adapter
+    
+    if _graph_client_adapter is None:
+        if settings is None:
+            settings = get_settings()
+        _graph_client_adapter = GraphAPIClientAdapter(settings)
+    
+    return _graph_client_adapter
+
+
+async def close_graph_client_adapter() -> None:
+    """Close the shared Graph API client adapter's connections."""
+    if _graph_client_adapter is not None:
+        await _graph_client_adapter.aclose()
@@ -193,10 +193,12 @@ class EnhancedSettings(BaseSettings):
     EXTERNAL_API_ENDPOINT: str = Field(default="", env="EXTERNAL_API_ENDPOINT")
     EXTERNAL_API_TIMEOUT: int = Field(default=30, env="EXTERNAL_API_TIMEOUT")
     EXTERNAL_API_RETRY_ATTEMPTS: int = Field(default=3, env="EXTERNAL_API_RETRY_ATTEMPTS")
+    EXTERNAL_API_BATCH_SIZE: int = Field(default=1, env="EXTERNAL_API_BATCH_SIZE")
     
     # Server
     HOST: str = Field(default="127.0.0.1", env="HOST")
     PORT: int = Field(default=8000, env="PORT")
+    TRUST_PROXY_HEADERS: bool = Field(default=False, env="TRUST_PROXY_HEADERS")
     MAX_CONCURRENT_REQUESTS: int = Field(default=100, env="MAX_CONCURRENT_REQUESTS")
     REQUEST_TIMEOUT: int = Field(default=30, env="REQUEST_TIMEOUT")
     
@@ -1,11 +1,14 @@
 """Application settings with environment-based configuration."""
 
 import os
+from functools import cached_property
 from typing import List, Optional
 from pydantic import Field, field_validator, model_validator
 from pydantic_settings import BaseSettings
 from enum import Enum
 
+from core.usecases.ports import ExternalAPIConfig, GraphConfig
+
 
 class Environment(str, Enum):
     """Environment types."""
@@ -44,10 +47,12 @@ class Settings(BaseSettings):
     EXTERNAL_API_ENDPOINT: Optional[str] = None
     EXTERNAL_API_TIMEOUT: int = 30
     EXTERNAL_API_RETRY_ATTEMPTS: int = 3
+    EXTERNAL_API_BATCH_SIZE: int = 1  # Mails per POST; above 1 the endpoint gets a JSON array
     
     # Server
     HOST: str = "127.0.0.1"
     PORT: int = 8000
+    TRUST_PROXY_HEADERS: bool = False  # Honor X-Forwarded-* headers; only behind a reverse proxy
     
     # CORS
     CORS_ORIGINS: List[str] = ["*"]
@@ -174,18 +179,37 @@ class Settings(BaseSettings):
         
         return self
     
-    def get_microsoft_graph_config(self) -> dict:
+    def get_microsoft_graph_config(self) -> GraphConfig:
         """Get Microsoft Graph configuration."""
-        return {
-            "client_id": self.CLIENT_ID,
-            "tenant_id": self.TENANT_ID,
-            "client_secret": self.CLIENT_SECRET,
-            "authority": self.AUTHORITY,
-            "redirect_uri": self.REDIRECT_URI,
-            "graph_api_endpoint": self.GRAPH_API_ENDPOINT,
-            "scopes": self.SCOPES,
-            "token_cache_file": self.TOKEN_CACHE_FILE
-        }
+        return self._graph_config
+    
+    def get_external_api_config(self) -> ExternalAPIConfig:
+        """Get external API configuration."""
+        return self._external_api_config
+    
+    @cached_property
+    def _graph_config(self) -> GraphConfig:
+        """Microsoft Graph configuration, built on first use."""
+        return GraphConfig(
+            client_id=self.CLIENT_ID,
+            tenant_id=self.TENANT_ID,
+            client_secret=self.CLIENT_SECRET,
+            authority=self.AUTHORITY,
+            redirect_uri=self.REDIRECT_URI,
+            graph_api_endpoint=self.GRAPH_API_ENDPOINT,
+            scopes=tuple(self.SCOPES),
+            token_cache_file=self.TOKEN_CACHE_FILE
+        )
+    
+    @cached_property
+    def _external_api_config(self) -> ExternalAPIConfig:
+        """External API configuration, built on first use."""
+        return ExternalAPIConfig(
+            endpoint_url=self.EXTERNAL_API_ENDPOINT or None,
+            timeout=self.EXTERNAL_API_TIMEOUT,
+            retry_attempts=self.EXTERNAL_API_RETRY_ATTEMPTS,
+            batch_size=self.EXTERNAL_API_BATCH_SIZE
+        )
     
     def get_database_config(self) -> dict:
         """Get database configuration."""
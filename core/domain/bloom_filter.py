@@ -0,0 +1,51 @@
+"""Bloom filter for approximate set membership checks."""
+
+import hashlib
+import math
+from typing import Iterable, List
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings.
+    
+    A miss means the item was never added; a hit may be a false positive,
+    at roughly error_rate while no more than capacity items were added.
+    """
+    
+    __slots__ = ("capacity", "error_rate", "count", "_num_bits", "_num_hashes", "_bits")
+    
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self.capacity = max(capacity, 1)
+        self.error_rate = error_rate
+        self.count = 0
+        self._num_bits = max(8, math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self._num_hashes = max(1, round(self._num_bits / self.capacity * math.log(2)))
+        self._bits = bytearray((self._num_bits + 7) // 8)
+    
+    def _positions(self, item: str) -> List[int]:
+        """Bit positions of an item, by double hashing one 128-bit digest."""
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self._num_bits for i in range(self._num_hashes)]
+    
+    def add(self, item: str) -> None:
+        """Add an item."""
+        bits = self._bits
+        for position in self._positions(item):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+    
+    def update(self, items: Iterable[str]) -> None:
+        """Add several items."""
+        for item in items:
+            self.add(item)
+    
+    def __contains__(self, item: str) -> bool:
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+    
+    @property
+    def is_full(self) -> bool:
+        """Whether more items were added than the filter was sized for."""
+        return self.count > self.capacity
@@ -1,10 +1,17 @@
 """Background task management service."""
 
 import asyncio
+import functools
+import heapq
 import logging
-from typing import Dict, List, Optional, Callable, Any
-from datetime import datetime, timedelta
-from dataclasses import dataclass
+import os
+import re
+import uuid
+import zlib
+from collections import Counter, deque
+from typing import Dict, List, Optional, Callable, Any, Tuple
+from datetime import datetime, timedelta, timezone
+from dataclasses import dataclass, field
 from enum import Enum
 
 from core.usecases.auth_usecases import AuthenticationUseCases
@@ -15,6 +22,15 @@ from adapters.monitoring.metrics import get_metrics_collector
 
 logger = logging.getLogger(__name__)
 
+# Matches *.tmp, *.temp and *.log.old (hidden files excluded, like glob)
+TEMP_FILE_PATTERN = re.compile(r"[^.].*\.(?:tmp|temp|log\.old)\Z", re.DOTALL)
+
+# Number of TaskInfo records kept across start()/stop() cycles
+TASK_HISTORY_SIZE = 256
+
+# Seconds stop() waits for the scheduler to exit before cancelling it
+SHUTDOWN_GRACE_PERIOD = 5
+
 
 class TaskStatus(str, Enum):
     """Background task status."""
@@ -25,9 +41,13 @@ class TaskStatus(str, Enum):
     CANCELLED = "cancelled"
 
 
-@dataclass
+@dataclass(slots=True)
 class TaskInfo:
-    """Background task information."""
+    """Background task information.
+    
+    ISO strings for the timestamps are cached when they are set so that
+    status reporting does not re-format them on every read.
+    """
     task_id: str
     task_type: str
     status: TaskStatus
@@ -36,6 +56,24 @@ class TaskInfo:
     completed_at: Optional[datetime] = None
     error: Optional[str] = None
     metadata: Optional[Dict[str, Any]] = None
+    created_at_iso: str = field(init=False)
+    started_at_iso: Optional[str] = field(default=None, init=False)
+    completed_at_iso: Optional[str] = field(default=None, init=False)
+    
+    def __post_init__(self):
+        self.created_at_iso = self.created_at.isoformat()
+    
+    def mark_started(self, started_at: datetime):
+        """Mark the task as running."""
+        self.status = TaskStatus.RUNNING
+        self.started_at = started_at
+        self.started_at_iso = started_at.isoformat()
+    
+    def mark_completed(self, status: TaskStatus, completed_at: datetime):
+        """Record the final status of the task."""
+        self.status = status
+        self.completed_at = completed_at
+        self.completed_at_iso = completed_at.isoformat()
 
 
 class BackgroundTaskService:
@@ -52,8 +90,17 @@ class BackgroundTaskService:
         self.metrics_collector = metrics_collector
         
         self.running = False
-        self.tasks: Dict[str, asyncio.Task] = {}
+        self._shutdown = asyncio.Event()
+        self._runner: Optional[asyncio.Task] = None
         self.task_info: Dict[str, TaskInfo] = {}
+        self._task_history: deque = deque(maxlen=TASK_HISTORY_SIZE)
+        self.jobs: List[Tuple[str, Callable]] = []
+        
+        # Metric updates buffered during a task iteration, as (method, args)
+        self._metric_buf: List[Tuple[str, tuple]] = []
+        
+        # Caps concurrent network calls within a single task iteration
+        self._concurrency = asyncio.Semaphore(10)
         
         # Task intervals (in seconds)
         self.intervals = {
@@ -71,9 +118,10 @@ class BackgroundTaskService:
             return
         
         self.running = True
+        self._shutdown.clear()
         logger.info("Starting background task service")
         
-        # Start individual tasks
+        # Register individual tasks
         task_configs = [
             ("token_refresh", self._token_refresh_task),
             ("webhook_renewal", self._webhook_renewal_task),
@@ -82,28 +130,30 @@ class BackgroundTaskService:
             ("health_check", self._health_check_task)
         ]
         
+        jobs = self.jobs = []
+        created_at = datetime.utcnow()
         for task_type, task_func in task_configs:
-            task_id = f"{task_type}_{datetime.utcnow().isoformat()}"
+            task_id = f"{task_type}_{uuid.uuid4().hex}"
             
             # Create task info
-            self.task_info[task_id] = TaskInfo(
+            self._record_task_info(TaskInfo(
                 task_id=task_id,
                 task_type=task_type,
                 status=TaskStatus.PENDING,
-                created_at=datetime.utcnow()
-            )
-            
-            # Start task
-            task = asyncio.create_task(self._run_periodic_task(task_id, task_func))
-            self.tasks[task_id] = task
+                created_at=created_at
+            ))
+            jobs.append((task_id, task_func))
             
-            logger.info(f"Started background task: {task_type}")
+            logger.info("Registered background task: %s", task_type)
+        
+        # All periodic tasks share a single scheduler task
+        self._runner = asyncio.create_task(self._scheduler_loop(jobs))
         
         # Update metrics
         if self.metrics_collector:
-            self.metrics_collector.set_background_tasks("total", len(self.tasks))
+            self.metrics_collector.set_background_tasks("total", len(jobs))
         
-        logger.info(f"Background task service started with {len(self.tasks)} tasks")
+        logger.info("Background task service started with %d tasks", len(jobs))
     
     async def stop(self):
         """Stop all background tasks."""
@@ -114,18 +164,17 @@ class BackgroundTaskService:
         self.running = False
         logger.info("Stopping background task service")
         
-        # Cancel all tasks
-        for task_id, task in self.tasks.items():
-            if not task.done():
-                task.cancel()
-                self.task_info[task_id].status = TaskStatus.CANCELLED
-                self.task_info[task_id].completed_at = datetime.utcnow()
+        # Ask the scheduler to exit after the task it is running, if any.
+        # Cancel only if it has not finished within the grace period.
+        self._shutdown.set()
+        runner, self._runner = self._runner, None
+        if runner is not None and not runner.done():
+            done, _ = await asyncio.wait({runner}, timeout=SHUTDOWN_GRACE_PERIOD)
+            if not done:
+                runner.cancel()
+                await asyncio.wait({runner})
         
-        # Wait for tasks to complete
-        if self.tasks:
-            await asyncio.gather(*self.tasks.values(), return_exceptions=True)
-        
-        self.tasks.clear()
+        self.jobs = []
         
         # Update metrics
         if self.metrics_collector:
@@ -133,200 +182,276 @@ class BackgroundTaskService:
         
         logger.info("Background task service stopped")
     
-    async def _run_periodic_task(self, task_id: str, task_func: Callable):
-        """Run a periodic task with error handling."""
-        task_info = self.task_info[task_id]
-        task_info.status = TaskStatus.RUNNING
-        task_info.started_at = datetime.utcnow()
+    def _record_task_info(self, info: TaskInfo):
+        """Track task info, evicting the oldest record once history is full."""
+        if len(self._task_history) == self._task_history.maxlen:
+            evicted = self._task_history[0]
+            self.task_info.pop(evicted.task_id, None)
+        self._task_history.append(info)
+        self.task_info[info.task_id] = info
+    
+    async def _scheduler_loop(self, jobs: List[Tuple[str, Callable]]):
+        """Run all periodic tasks from a single min-heap of deadlines.
+        
+        Each heap entry is ``(next_run, task_id, task_func)``; the loop sleeps
+        until the earliest deadline, runs that task and reschedules it one
+        interval after it finished.
         
-        interval = self.intervals.get(task_info.task_type, 300)
+        First runs are staggered by a fixed per-type offset within the task's
+        interval, so tasks whose intervals share a multiple do not all wake
+        on the same tick.
+        """
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        started_at = datetime.utcnow()
+        heap = []
+        for task_id, task_func in jobs:
+            task_info = self.task_info[task_id]
+            task_info.mark_started(started_at)
+            interval = self.intervals.get(task_info.task_type, 300)
+            heap.append((now + self._initial_offset(task_info.task_type, interval), task_id, task_func))
+        heapq.heapify(heap)
         
+        final_status = TaskStatus.CANCELLED
         try:
-            while self.running:
-                try:
-                    await task_func()
-                    
-                    # Update metrics on successful execution
-                    if self.metrics_collector:
-                        self.metrics_collector.set_background_tasks(
-                            task_info.task_type, 1
-                        )
-                    
-                except Exception as e:
-                    logger.error(
-                        f"Error in background task {task_info.task_type}: {str(e)}",
-                        exc_info=True
-                    )
-                    
-                    # Record error in metrics
-                    if self.metrics_collector:
-                        self.metrics_collector.record_error(
-                            error_type=type(e).__name__,
-                            component="background_task"
-                        )
-                    
-                    # Don't stop the task for individual errors
-                    task_info.error = str(e)
+            while self.running and heap:
+                when, task_id, task_func = heap[0]
+                delay = when - loop.time()
+                if delay > 0:
+                    try:
+                        await asyncio.wait_for(self._shutdown.wait(), timeout=delay)
+                        break
+                    except asyncio.TimeoutError:
+                        pass
+                
+                task_info = self.task_info[task_id]
+                await self._invoke_safe(task_info, task_func)
                 
                 # Wait for next iteration
-                await asyncio.sleep(interval)
+                interval = self.intervals.get(task_info.task_type, 300)
+                heapq.heapreplace(heap, (loop.time() + interval, task_id, task_func))
                 
         except asyncio.CancelledError:
-            logger.info(f"Background task {task_info.task_type} cancelled")
-            task_info.status = TaskStatus.CANCELLED
+            logger.info("Background task scheduler cancelled")
+        except Exception as e:
+            logger.error(
+                "Fatal error in background task scheduler: %s", e,
+                exc_info=True
+            )
+            final_status = TaskStatus.FAILED
+            for task_id, _ in jobs:
+                self.task_info[task_id].error = str(e)
+        finally:
+            completed_at = datetime.utcnow()
+            for task_id, _ in jobs:
+                self.task_info[task_id].mark_completed(final_status, completed_at)
+    
+    @staticmethod
+    def _initial_offset(task_type: str, interval: float) -> float:
+        """Deterministic start offset in [0, interval) for a task type."""
+        return (zlib.crc32(task_type.encode()) & 0xFFFF) / 0x10000 * interval
+    
+    async def _invoke_safe(self, task_info: TaskInfo, task_func: Callable):
+        """Run one iteration of a periodic task with error handling."""
+        try:
+            await task_func()
+            
+            # Update metrics on successful execution
+            if self.metrics_collector:
+                self._metric_buf.append(
+                    ("set_background_tasks", (task_info.task_type, 1))
+                )
+            
         except Exception as e:
             logger.error(
-                f"Fatal error in background task {task_info.task_type}: {str(e)}",
+                "Error in background task %s: %s", task_info.task_type, e,
                 exc_info=True
             )
-            task_info.status = TaskStatus.FAILED
+            
+            # Record error in metrics
+            if self.metrics_collector:
+                self._metric_buf.append(
+                    ("record_error", (type(e).__name__, "background_task"))
+                )
+            
+            # Don't stop the task for individual errors
             task_info.error = str(e)
         finally:
-            task_info.completed_at = datetime.utcnow()
+            self._flush_metrics()
+    
+    def _flush_metrics(self):
+        """Emit all buffered metric updates and clear the buffer."""
+        buf = self._metric_buf
+        mc = self.metrics_collector
+        if mc and buf:
+            for method_name, args in buf:
+                getattr(mc, method_name)(*args)
+        buf.clear()
     
     async def _token_refresh_task(self):
         """Automatically refresh expiring tokens."""
         try:
-            # Get tokens expiring in the next 5 minutes
-            expiring_tokens = await self.auth_usecases.get_expiring_tokens(
-                minutes_before=5
+            refresh_results = {"success": 0, "failed": 0}
+            
+            # Resolve metric hooks once rather than per token
+            record_ok = record_fail = None
+            if self.metrics_collector:
+                emit = self._metric_buf.append
+                record_ok = functools.partial(emit, ("record_token_refresh", ("success",)))
+                record_fail = functools.partial(emit, ("record_token_refresh", ("failed",)))
+            refresh_one = functools.partial(
+                self._refresh_one, record_ok=record_ok, record_fail=record_fail
             )
             
-            if not expiring_tokens:
+            # Stream tokens expiring in the next 5 minutes, with their accounts,
+            # in bounded batches
+            async for batch in self.auth_usecases.iter_expiring_tokens_with_accounts(
+                minutes_before=5, batch_size=500
+            ):
+                logger.info("Found %d tokens requiring refresh", len(batch))
+                results = await asyncio.gather(*(
+                    refresh_one(token, account) for token, account in batch
+                ))
+                succeeded = sum(results)
+                refresh_results["success"] += succeeded
+                refresh_results["failed"] += len(results) - succeeded
+            
+            if not refresh_results["success"] and not refresh_results["failed"]:
                 logger.debug("No tokens require refresh")
                 return
             
-            logger.info(f"Found {len(expiring_tokens)} tokens requiring refresh")
-            
-            refresh_results = {"success": 0, "failed": 0}
-            
-            for token in expiring_tokens:
-                try:
-                    await self.auth_usecases.refresh_token(token.account_id)
-                    refresh_results["success"] += 1
-                    
-                    # Record successful refresh
-                    if self.metrics_collector:
-                        self.metrics_collector.record_token_refresh("success")
-                    
-                    logger.debug(f"Successfully refreshed token for account {token.account_id}")
-                    
-                except Exception as e:
-                    refresh_results["failed"] += 1
-                    
-                    # Record failed refresh
-                    if self.metrics_collector:
-                        self.metrics_collector.record_token_refresh("failed")
-                    
-                    logger.error(
-                        f"Failed to refresh token for account {token.account_id}: {str(e)}"
-                    )
-            
             logger.info(
-                f"Token refresh completed: {refresh_results['success']} success, "
-                f"{refresh_results['failed']} failed"
+                "Token refresh completed: %d success, %d failed",
+                refresh_results["success"], refresh_results["failed"]
             )
             
         except Exception as e:
-            logger.error(f"Token refresh task failed: {str(e)}", exc_info=True)
+            logger.error("Token refresh task failed: %s", e, exc_info=True)
             raise
     
+    async def _refresh_one(
+        self,
+        token,
+        account,
+        record_ok: Optional[Callable[[], None]] = None,
+        record_fail: Optional[Callable[[], None]] = None
+    ) -> bool:
+        """Refresh a single token, returning whether it succeeded."""
+        async with self._concurrency:
+            try:
+                await self.auth_usecases.refresh_token(
+                    token.account_id, account=account, token=token
+                )
+            except Exception as e:
+                # Record failed refresh
+                if record_fail:
+                    record_fail()
+                
+                logger.error(
+                    "Failed to refresh token for account %s: %s", token.account_id, e
+                )
+                return False
+            
+            # Record successful refresh
+            if record_ok:
+                record_ok()
+            
+            logger.debug("Successfully refreshed token for account %s", token.account_id)
+            return True
+    
     async def _webhook_renewal_task(self):
         """Automatically renew expiring webhook subscriptions."""
         try:
-            # Get webhook subscriptions expiring in the next 30 minutes
-            expiring_webhooks = await self.mail_usecases.get_expiring_webhooks(
-                minutes_before=30
-            )
+            renewal_results = {"success": 0, "failed": 0}
             
-            if not expiring_webhooks:
+            # Stream webhook subscriptions expiring in the next 30 minutes
+            async for batch in self.mail_usecases.iter_expiring_webhooks(
+                minutes_before=30, batch_size=500
+            ):
+                logger.info("Found %d webhook subscriptions requiring renewal", len(batch))
+                results = await asyncio.gather(*map(self._renew_one, batch))
+                succeeded = sum(results)
+                renewal_results["success"] += succeeded
+                renewal_results["failed"] += len(results) - succeeded
+            
+            if not renewal_results["success"] and not renewal_results["failed"]:
                 logger.debug("No webhook subscriptions require renewal")
                 return
             
-            logger.info(f"Found {len(expiring_webhooks)} webhook subscriptions requiring renewal")
-            
-            renewal_results = {"success": 0, "failed": 0}
-            
-            for webhook in expiring_webhooks:
-                try:
-                    await self.mail_usecases.renew_webhook_subscription(
-                        webhook.account_id,
-                        webhook.subscription_id
-                    )
-                    renewal_results["success"] += 1
-                    
-                    logger.debug(
-                        f"Successfully renewed webhook subscription {webhook.subscription_id} "
-                        f"for account {webhook.account_id}"
-                    )
-                    
-                except Exception as e:
-                    renewal_results["failed"] += 1
-                    
-                    logger.error(
-                        f"Failed to renew webhook subscription {webhook.subscription_id} "
-                        f"for account {webhook.account_id}: {str(e)}"
-                    )
-            
             # Update webhook metrics
             if self.metrics_collector:
                 active_webhooks = await self.mail_usecases.get_active_webhook_count()
-                self.metrics_collector.set_webhook_subscriptions(active_webhooks)
+                self._metric_buf.append(("set_webhook_subscriptions", (active_webhooks,)))
             
             logger.info(
-                f"Webhook renewal completed: {renewal_results['success']} success, "
-                f"{renewal_results['failed']} failed"
+                "Webhook renewal completed: %d success, %d failed",
+                renewal_results["success"], renewal_results["failed"]
             )
             
         except Exception as e:
-            logger.error(f"Webhook renewal task failed: {str(e)}", exc_info=True)
+            logger.error("Webhook renewal task failed: %s", e, exc_info=True)
             raise
     
+    async def _renew_one(self, webhook) -> bool:
+        """Renew a single webhook subscription, returning whether it succeeded."""
+        async with self._concurrency:
+            try:
+                await self.mail_usecases.renew_webhook_subscription(
+                    webhook.account_id,
+                    webhook.subscription_id
+                )
+            except Exception as e:
+                logger.error(
+                    "Failed to renew webhook subscription %s for account %s: %s",
+                    webhook.subscription_id, webhook.account_id, e
+                )
+                return False
+            
+            logger.debug(
+                "Successfully renewed webhook subscription %s for account %s",
+                webhook.subscription_id, webhook.account_id
+            )
+            return True
+    
     async def _failed_api_retry_task(self):
         """Retry failed external API calls."""
         try:
-            # Get failed API calls that are ready for retry
-            failed_calls = await self.mail_usecases.get_failed_api_calls_for_retry()
+            # Get failed API calls that are ready for retry (max 5 retries)
+            failed_calls = await self.mail_usecases.get_failed_api_calls_for_retry(
+                max_retries=5
+            )
             
             if not failed_calls:
                 logger.debug("No failed API calls require retry")
                 return
             
-            logger.info(f"Found {len(failed_calls)} failed API calls for retry")
+            logger.info("Found %d failed API calls for retry", len(failed_calls))
             
-            retry_results = {"success": 0, "failed": 0, "skipped": 0}
-            
-            for failed_call in failed_calls:
-                try:
-                    # Check if retry limit exceeded
-                    if failed_call.retry_count >= 5:  # Max 5 retries
-                        retry_results["skipped"] += 1
-                        logger.warning(
-                            f"Skipping retry for API call {failed_call.id}: "
-                            f"retry limit exceeded ({failed_call.retry_count})"
+            async def _one(failed_call) -> bool:
+                async with self._concurrency:
+                    try:
+                        # Retry the API call
+                        await self.mail_usecases.retry_failed_api_call(failed_call.id)
+                    except Exception as e:
+                        logger.error(
+                            "Failed to retry API call %s: %s", failed_call.id, e
                         )
-                        continue
-                    
-                    # Retry the API call
-                    await self.mail_usecases.retry_failed_api_call(failed_call.id)
-                    retry_results["success"] += 1
-                    
-                    logger.debug(f"Successfully retried API call {failed_call.id}")
+                        return False
                     
-                except Exception as e:
-                    retry_results["failed"] += 1
-                    
-                    logger.error(
-                        f"Failed to retry API call {failed_call.id}: {str(e)}"
-                    )
+                    logger.debug("Successfully retried API call %s", failed_call.id)
+                    return True
+            
+            results = await asyncio.gather(*map(_one, failed_calls))
+            succeeded = sum(results)
+            retry_results = {"success": succeeded, "failed": len(results) - succeeded}
             
             logger.info(
-                f"API retry completed: {retry_results['success']} success, "
-                f"{retry_results['failed']} failed, {retry_results['skipped']} skipped"
+                "API retry completed: %d success, %d failed",
+                retry_results["success"], retry_results["failed"]
             )
             
         except Exception as e:
-            logger.error(f"Failed API retry task failed: {str(e)}", exc_info=True)
+            logger.error("Failed API retry task failed: %s", e, exc_info=True)
             raise
     
     async def _cleanup_task(self):
@@ -339,50 +464,64 @@ class BackgroundTaskService:
                 "old_webhooks": 0
             }
             
+            # Derive all cutoffs from a single clock read
+            now = datetime.utcnow()
+            cutoff_tokens = now - timedelta(days=30)
+            cutoff_logs = now - timedelta(days=90)
+            cutoff_webhooks = now - timedelta(days=7)
+            
             # Clean up expired tokens (older than 30 days)
-            cutoff_date = datetime.utcnow() - timedelta(days=30)
-            deleted_tokens = await self.auth_usecases.cleanup_expired_tokens(cutoff_date)
+            deleted_tokens = await self.auth_usecases.cleanup_expired_tokens(cutoff_tokens)
             cleanup_results["old_tokens"] = deleted_tokens
             
             # Clean up old mail logs (older than 90 days)
-            log_cutoff_date = datetime.utcnow() - timedelta(days=90)
-            deleted_logs = await self.mail_usecases.cleanup_old_mail_logs(log_cutoff_date)
+            deleted_logs = await self.mail_usecases.cleanup_old_mail_logs(cutoff_logs)
             cleanup_results["old_logs"] = deleted_logs
             
             # Clean up old webhook subscriptions (inactive for 7 days)
-            webhook_cutoff_date = datetime.utcnow() - timedelta(days=7)
-            deleted_webhooks = await self.mail_usecases.cleanup_inactive_webhooks(webhook_cutoff_date)
+            deleted_webhooks = await self.mail_usecases.cleanup_inactive_webhooks(cutoff_webhooks)
             cleanup_results["old_webhooks"] = deleted_webhooks
             
-            # Clean up temporary files
-            import os
-            import glob
-            temp_files_deleted = 0
-            
-            for pattern in ["*.tmp", "*.temp", "*.log.old"]:
-                for file_path in glob.glob(pattern):
-                    try:
-                        if os.path.isfile(file_path):
-                            file_age = datetime.fromtimestamp(os.path.getmtime(file_path))
-                            if file_age < cutoff_date:
-                                os.remove(file_path)
-                                temp_files_deleted += 1
-                    except Exception as e:
-                        logger.warning(f"Failed to delete temp file {file_path}: {str(e)}")
+            # Clean up temporary files (older than 30 days) off the event loop;
+            # now is naive UTC, so pin the zone before converting to epoch
+            cutoff_tokens_ts = cutoff_tokens.replace(tzinfo=timezone.utc).timestamp()
+            temp_files_deleted = await asyncio.to_thread(
+                self._sweep_temp_files, cutoff_tokens_ts
+            )
             
             cleanup_results["temp_files"] = temp_files_deleted
             
             logger.info(
-                f"Cleanup completed: {cleanup_results['old_tokens']} tokens, "
-                f"{cleanup_results['old_logs']} logs, "
-                f"{cleanup_results['temp_files']} temp files, "
-                f"{cleanup_results['old_webhooks']} webhooks"
+                "Cleanup completed: %s tokens, %s logs, %s temp files, %s webhooks",
+                cleanup_results["old_tokens"],
+                cleanup_results["old_logs"],
+                cleanup_results["temp_files"],
+                cleanup_results["old_webhooks"]
             )
             
         except Exception as e:
-            logger.error(f"Cleanup task failed: {str(e)}", exc_info=True)
+            logger.error("Cleanup task failed: %s", e, exc_info=True)
             raise
     
+    @staticmethod
+    def _sweep_temp_files(cutoff_ts: float) -> int:
+        """Delete temporary files older than cutoff_ts from the working directory.
+        
+        Blocking; run it in a worker thread.
+        """
+        deleted = 0
+        with os.scandir(".") as entries:
+            for entry in entries:
+                if not TEMP_FILE_PATTERN.match(entry.name):
+                    continue
+                try:
+                    if entry.is_file() and entry.stat().st_mtime < cutoff_ts:
+                        os.remove(entry.path)
+                        deleted += 1
+                except OSError as e:
+                    logger.warning("Failed to delete temp file %s: %s", entry.path, e)
+        return deleted
+    
     async def _health_check_task(self):
         """Perform periodic health checks."""
         try:
@@ -393,21 +532,20 @@ class BackgroundTaskService:
             if health_status["status"] == "healthy":
                 logger.debug("System health check: All systems operational")
             elif health_status["status"] == "degraded":
-                logger.warning(f"System health check: Degraded - {health_status.get('issues', [])}")
+                logger.warning("System health check: Degraded - %s", health_status.get("issues", []))
             else:
-                logger.error(f"System health check: Unhealthy - {health_status.get('issues', [])}")
+                logger.error("System health check: Unhealthy - %s", health_status.get("issues", []))
             
             # Update health metrics
             if self.metrics_collector:
                 for component, status in health_status.get("components", {}).items():
                     if status != "healthy":
-                        self.metrics_collector.record_error(
-                            error_type="health_check_failed",
-                            component=component
+                        self._metric_buf.append(
+                            ("record_error", ("health_check_failed", component))
                         )
             
         except Exception as e:
-            logger.error(f"Health check task failed: {str(e)}", exc_info=True)
+            logger.error("Health check task failed: %s", e, exc_info=True)
             raise
     
     async def _check_system_health(self) -> Dict[str, Any]:
@@ -419,17 +557,24 @@ class BackgroundTaskService:
         }
         
         try:
-            # Check database connectivity
-            db_healthy = await self.auth_usecases.check_database_health()
-            health_status["components"]["database"] = "healthy" if db_healthy else "unhealthy"
-            if not db_healthy:
-                health_status["issues"].append("Database connectivity issues")
-            
-            # Check external API connectivity
-            api_healthy = await self.mail_usecases.check_graph_api_health()
-            health_status["components"]["graph_api"] = "healthy" if api_healthy else "unhealthy"
-            if not api_healthy:
-                health_status["issues"].append("Graph API connectivity issues")
+            # Probe database and external API connectivity concurrently
+            db_result, api_result = await asyncio.gather(
+                self.auth_usecases.check_database_health(),
+                self.mail_usecases.check_graph_api_health(),
+                return_exceptions=True
+            )
+            
+            checks = (
+                ("database", db_result, "Database connectivity issues"),
+                ("graph_api", api_result, "Graph API connectivity issues"),
+            )
+            for component, result, issue in checks:
+                healthy = not isinstance(result, BaseException) and bool(result)
+                health_status["components"][component] = "healthy" if healthy else "unhealthy"
+                if isinstance(result, BaseException):
+                    health_status["issues"].append(f"{issue}: {result!r}")
+                elif not healthy:
+                    health_status["issues"].append(issue)
             
             # Determine overall status
             if health_status["issues"]:
@@ -448,14 +593,14 @@ class BackgroundTaskService:
         """Get status of all background tasks."""
         return {
             "running": self.running,
-            "total_tasks": len(self.tasks),
+            "total_tasks": len(self.jobs),
             "task_details": {
                 task_id: {
                     "task_type": info.task_type,
                     "status": info.status.value,
-                    "created_at": info.created_at.isoformat(),
-                    "started_at": info.started_at.isoformat() if info.started_at else None,
-                    "completed_at": info.completed_at.isoformat() if info.completed_at else None,
+                    "created_at": info.created_at_iso,
+                    "started_at": info.started_at_iso,
+                    "completed_at": info.completed_at_iso,
                     "error": info.error,
                     "metadata": info.metadata
                 }
@@ -465,14 +610,12 @@ class BackgroundTaskService:
     
     def get_task_summary(self) -> Dict[str, Any]:
         """Get summary of background task status."""
-        status_counts = {}
-        for info in self.task_info.values():
-            status_counts[info.status.value] = status_counts.get(info.status.value, 0) + 1
+        status_counts = Counter(info.status.value for info in self.task_info.values())
         
         return {
             "running": self.running,
             "total_tasks": len(self.task_info),
-            "status_counts": status_counts,
+            "status_counts": dict(status_counts),
             "intervals": self.intervals
         }
 
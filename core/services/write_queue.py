@@ -0,0 +1,140 @@
+"""Batched write queue for fire-and-forget record writes."""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional
+
+from core.usecases.ports import WriteAheadQueuePort
+
+
+logger = logging.getLogger(__name__)
+
+# Default bounds for queued record writes
+WRITE_QUEUE_SIZE = 10_000
+WRITE_BATCH_SIZE = 256
+WRITE_FLUSH_INTERVAL = 0.1  # seconds
+
+BulkWriter = Callable[[List[Any]], Awaitable[Any]]
+
+
+class BatchingWriteQueue(WriteAheadQueuePort):
+    """In-process write queue that hands records to bulk writers in batches.
+    
+    A worker task groups each batch by record type and passes it to that
+    type's bulk writer. The owner starts it with start(), or it starts on
+    the first enqueue, and stops it with aclose() once queued records are
+    written. A record that finds the queue full is written inline instead,
+    so enqueue never waits on other records.
+    """
+    
+    def __init__(
+        self,
+        writers: Mapping[type, BulkWriter],
+        maxsize: int = WRITE_QUEUE_SIZE,
+        batch_size: int = WRITE_BATCH_SIZE,
+        flush_interval: float = WRITE_FLUSH_INTERVAL
+    ):
+        self._writers = dict(writers)
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._worker: Optional[asyncio.Task] = None
+        # Set while a flush waits, so the worker writes without waiting for
+        # its batch to fill
+        self._flushing = asyncio.Event()
+        self._flush_waiters = 0
+    
+    def start(self) -> None:
+        """Start the worker task if it is not running."""
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+    
+    async def enqueue(self, record: Any) -> None:
+        """Queue a record for its type's bulk writer, or write it now if the queue is full."""
+        if type(record) not in self._writers:
+            raise TypeError(f"No writer registered for {type(record).__name__}")
+        
+        self.start()
+        try:
+            self._queue.put_nowait(record)
+        except asyncio.QueueFull:
+            logger.warning(
+                "Write queue full, writing record inline type=%s", type(record).__name__
+            )
+            await self._write([record])
+    
+    async def flush(self) -> None:
+        """Wait until every queued record has been written, without waiting for batches to fill."""
+        if self._worker is None:
+            return
+        
+        self._flush_waiters += 1
+        self._flushing.set()
+        try:
+            await self._queue.join()
+        finally:
+            self._flush_waiters -= 1
+            if not self._flush_waiters:
+                self._flushing.clear()
+    
+    async def aclose(self) -> None:
+        """Write the queued records, then stop the worker task."""
+        await self.flush()
+        worker, self._worker = self._worker, None
+        if worker is not None:
+            worker.cancel()
+            await asyncio.wait({worker})
+    
+    async def _run(self) -> None:
+        """Write queued records in batches until cancelled.
+        
+        A batch is written once it holds batch_size records, flush_interval
+        has passed since its first record was taken, or a flush is waiting.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self._flush_interval
+            while len(batch) < self._batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                
+                timeout = deadline - loop.time()
+                if timeout <= 0 or self._flushing.is_set():
+                    break
+                
+                # A cancelled get leaves its record queued
+                get = asyncio.ensure_future(self._queue.get())
+                flushing = asyncio.ensure_future(self._flushing.wait())
+                try:
+                    await asyncio.wait({get, flushing}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    flushing.cancel()
+                    get.cancel()
+                if not get.done() or get.cancelled():
+                    break
+                batch.append(get.result())
+            
+            try:
+                await self._write(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+    
+    async def _write(self, batch: List[Any]) -> None:
+        """Pass a batch to the bulk writers, one call per record type."""
+        by_type: Dict[type, List[Any]] = {}
+        for record in batch:
+            by_type.setdefault(type(record), []).append(record)
+        
+        for record_type, records in by_type.items():
+            try:
+                await self._writers[record_type](records)
+            except Exception as e:
+                logger.error(
+                    "Failed to write queued records type=%s count=%s error=%s",
+                    record_type.__name__, len(records), e
+                )
@@ -1,8 +1,10 @@
 """Authentication use cases for Microsoft Graph API Mail Collection System."""
 
+import logging
+import time
 import uuid
 from datetime import datetime, timedelta, UTC
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, AsyncGenerator, Tuple, Callable, Awaitable
 import structlog
 
 from core.domain.entities import (
@@ -11,10 +13,55 @@ from core.domain.entities import (
 )
 from core.usecases.ports import (
     AccountRepositoryPort, AuthFlowRepositoryPort, TokenRepositoryPort,
-    AuthenticationLogRepositoryPort, OAuthClientPort, ConfigPort
+    AuthenticationLogRepositoryPort, OAuthClientPort, ConfigPort, GraphConfig,
+    WriteAheadQueuePort
 )
+from core.services.write_queue import BatchingWriteQueue
 
 logger = structlog.get_logger()
+# Plain stdlib logger for hot success paths; structlog is kept for error context
+_log = logging.getLogger(__name__)
+
+# In-process cache of token expiry per account for account info reads
+TOKEN_STATUS_CACHE_TTL = 30  # seconds
+TOKEN_STATUS_CACHE_SIZE = 10_000
+
+# Authentication logs are queued and written in batches off the request path
+AUTH_LOG_QUEUE_SIZE = 10_000
+AUTH_LOG_BATCH_SIZE = 256
+AUTH_LOG_FLUSH_INTERVAL = 0.1  # seconds
+# Upper bound on rows returned by get_authentication_logs when no limit is given
+AUTH_LOG_DEFAULT_LIMIT = 1000
+
+
+# Log-friendly string form of each flow; also accepts plain string values
+_FLOW_STR = {flow: flow.value for flow in AuthenticationFlow}
+
+# OAuth scope strings are space-delimited
+_join_scopes = " ".join
+
+# Account fields returned by the account info use cases
+_ACCOUNT_FIELDS = tuple(Account.model_fields)
+
+
+def _account_to_dict(account: Account) -> Dict[str, Any]:
+    """Project an account's fields into a dict without a model_dump walk."""
+    return {field: getattr(account, field) for field in _ACCOUNT_FIELDS}
+
+
+def _token_status(expires_at: Optional[datetime]) -> Tuple[str, Optional[int]]:
+    """Compute (token_status, token_expires_in) from a token's expiry time."""
+    if expires_at is None:
+        return "none", None
+    
+    # SQLite returns naive datetimes; they are stored as UTC
+    if expires_at.tzinfo is None:
+        expires_at = expires_at.replace(tzinfo=UTC)
+    
+    remaining = (expires_at - datetime.now(UTC)).total_seconds()
+    if remaining <= 0:
+        return "expired", 0
+    return "valid", int(remaining)
 
 
 class AuthenticationUseCases:
@@ -27,7 +74,8 @@ class AuthenticationUseCases:
         token_repo: TokenRepositoryPort,
         auth_log_repo: AuthenticationLogRepositoryPort,
         oauth_client: OAuthClientPort,
-        config: ConfigPort
+        config: ConfigPort,
+        write_queue: Optional[WriteAheadQueuePort] = None
     ):
         self.account_repo = account_repo
         self.auth_flow_repo = auth_flow_repo
@@ -35,6 +83,51 @@ class AuthenticationUseCases:
         self.auth_log_repo = auth_log_repo
         self.oauth_client = oauth_client
         self.config = config
+        self._graph_config: Optional[GraphConfig] = None
+        # account_id -> (cached_until monotonic time, token expires_at or None)
+        self._token_expiry_cache: Dict[str, Tuple[float, Optional[datetime]]] = {}
+        # A write queue created here, rather than passed in, is stopped by aclose()
+        self._owned_write_queue = None if write_queue else BatchingWriteQueue(
+            {AuthenticationLog: auth_log_repo.save_auth_logs},
+            maxsize=AUTH_LOG_QUEUE_SIZE,
+            batch_size=AUTH_LOG_BATCH_SIZE,
+            flush_interval=AUTH_LOG_FLUSH_INTERVAL
+        )
+        self.write_queue = write_queue or self._owned_write_queue
+        self._auth_dispatch = {
+            AuthenticationFlow.AUTHORIZATION_CODE: self._authenticate_authorization_code,
+            AuthenticationFlow.DEVICE_CODE: self._authenticate_device_code
+        }
+    
+    def _get_graph_config(self) -> GraphConfig:
+        """Get Microsoft Graph config, reading it from the config port once."""
+        if self._graph_config is None:
+            self._graph_config = self.config.get_microsoft_graph_config()
+        return self._graph_config
+    
+    async def _get_token_expiry(self, account_id: str) -> Optional[datetime]:
+        """Get the account's token expiry, served from a short-lived cache."""
+        now = time.monotonic()
+        cached = self._token_expiry_cache.get(account_id)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+        
+        token_status = await self.token_repo.get_token_status_by_account_id(account_id)
+        expires_at = token_status[1] if token_status else None
+        
+        if len(self._token_expiry_cache) >= TOKEN_STATUS_CACHE_SIZE:
+            # Evict the oldest entry (dicts keep insertion order)
+            self._token_expiry_cache.pop(next(iter(self._token_expiry_cache)))
+        self._token_expiry_cache[account_id] = (now + TOKEN_STATUS_CACHE_TTL, expires_at)
+        return expires_at
+    
+    def _invalidate_token_cache(self, account_id: str) -> None:
+        """Forget the cached token expiry for an account."""
+        self._token_expiry_cache.pop(account_id, None)
+    
+    def reload_config(self) -> None:
+        """Drop cached configuration so the next use re-reads it."""
+        self._graph_config = None
     
     async def register_account(
         self,
@@ -46,61 +139,63 @@ class AuthenticationUseCases:
     ) -> Dict[str, Any]:
         """AUTH001 - Register new account with authentication flow."""
         try:
+            now = datetime.now(UTC)
+            
             # Check if account already exists
             existing_account = await self.account_repo.get_account_by_email(email)
             if existing_account:
                 raise ValueError(f"Account with email {email} already exists")
             
             # Get Microsoft Graph config
-            graph_config = self.config.get_microsoft_graph_config()
+            graph_config = self._get_graph_config()
             
             # Create base account
             account = Account(
                 id=str(uuid.uuid4()),
                 email=email,
                 user_id=user_id,
-                tenant_id=graph_config["tenant_id"],
-                client_id=graph_config["client_id"],
+                tenant_id=graph_config.tenant_id,
+                client_id=graph_config.client_id,
                 authentication_flow=authentication_flow,
                 status=AccountStatus.ACTIVE,
                 scopes=scopes,
-                created_at=datetime.now(UTC)
+                created_at=now
             )
             
-            # Save account
-            saved_account = await self.account_repo.create_account(account)
-            
             # Create flow-specific data
             if authentication_flow == AuthenticationFlow.AUTHORIZATION_CODE:
-                auth_code_account = AuthorizationCodeAccount(
-                    account_id=saved_account.id,
-                    client_secret=graph_config["client_secret"],
-                    redirect_uri=graph_config["redirect_uri"],
-                    authority=graph_config["authority"],
-                    created_at=datetime.now(UTC)
+                flow_account = AuthorizationCodeAccount(
+                    account_id=account.id,
+                    client_secret=graph_config.client_secret,
+                    redirect_uri=graph_config.redirect_uri,
+                    authority=graph_config.authority,
+                    created_at=now
                 )
-                await self.auth_flow_repo.create_auth_code_account(auth_code_account)
-                
             elif authentication_flow == AuthenticationFlow.DEVICE_CODE:
-                device_code_account = DeviceCodeAccount(
-                    account_id=saved_account.id
+                flow_account = DeviceCodeAccount(
+                    account_id=account.id
                 )
-                await self.auth_flow_repo.create_device_code_account(device_code_account)
+            else:
+                raise ValueError(f"Unsupported authentication flow: {authentication_flow}")
             
-            # Log successful registration
-            await self._log_auth_event(
-                account_id=saved_account.id,
-                event_type="registration",
-                authentication_flow=authentication_flow,
-                success=True
+            # Save account, flow data and registration log in one transaction
+            saved_account = await self.account_repo.create_account_with_flow(
+                account,
+                flow_account,
+                AuthenticationLog(
+                    account_id=account.id,
+                    event_type="registration",
+                    authentication_flow=authentication_flow,
+                    success=True,
+                    timestamp=now
+                )
             )
             
-            logger.info(
-                "Account registered successfully",
-                account_id=saved_account.id,
-                email=email,
-                authentication_flow=authentication_flow.value
-            )
+            if _log.isEnabledFor(logging.INFO):
+                _log.info(
+                    "Account registered successfully account_id=%s email=%s authentication_flow=%s",
+                    saved_account.id, email, _FLOW_STR[authentication_flow]
+                )
             
             return {
                 "success": True,
@@ -108,11 +203,15 @@ class AuthenticationUseCases:
                 "message": "Account registered successfully"
             }
             
+        except ValueError:
+            # Expected validation failure (duplicate email, unknown flow)
+            raise
         except Exception as e:
             logger.error(
                 "Failed to register account",
                 email=email,
-                error=str(e)
+                error=str(e),
+                exc_info=True
             )
             raise
     
@@ -132,20 +231,14 @@ class AuthenticationUseCases:
                 return None
             
             # Get token status
-            token = await self.token_repo.get_token_by_account_id(account.id)
-            token_status = None
-            if token:
-                if token.is_expired:
-                    token_status = "expired"
-                else:
-                    token_status = "valid"
-            else:
-                token_status = "none"
+            token_status, token_expires_in = _token_status(
+                await self._get_token_expiry(account.id)
+            )
             
             return {
-                "account": account.model_dump(),
+                "account": _account_to_dict(account),
                 "token_status": token_status,
-                "token_expires_in": token.expires_in_seconds if token else None
+                "token_expires_in": token_expires_in
             }
             
         except Exception as e:
@@ -160,24 +253,15 @@ class AuthenticationUseCases:
     async def get_all_accounts(self) -> List[Dict[str, Any]]:
         """AUTH002 - Get all accounts with token status."""
         try:
-            accounts = await self.account_repo.get_all_accounts()
+            rows = await self.account_repo.list_accounts_with_token_status()
             result = []
             
-            for account in accounts:
-                token = await self.token_repo.get_token_by_account_id(account.id)
-                token_status = None
-                if token:
-                    if token.is_expired:
-                        token_status = "expired"
-                    else:
-                        token_status = "valid"
-                else:
-                    token_status = "none"
-                
+            for row in rows:
+                token_status, token_expires_in = _token_status(row.token_expires_at)
                 result.append({
-                    "account": account.model_dump(),
+                    "account": _account_to_dict(row.account),
                     "token_status": token_status,
-                    "token_expires_in": token.expires_in_seconds if token else None
+                    "token_expires_in": token_expires_in
                 })
             
             return result
@@ -186,6 +270,25 @@ class AuthenticationUseCases:
             logger.error("Failed to get all accounts", error=str(e))
             raise
     
+    async def _with_token_status(self, accounts: List[Account]) -> List[Dict[str, Any]]:
+        """Pair each account with its token status, fetching tokens in bulk."""
+        tokens = await self.token_repo.get_tokens_by_account_ids([account.id for account in accounts])
+        result = []
+        
+        for account in accounts:
+            token = tokens.get(account.id)
+            token_status, token_expires_in = _token_status(
+                token.expires_at if token else None
+            )
+            
+            result.append({
+                "account": _account_to_dict(account),
+                "token_status": token_status,
+                "token_expires_in": token_expires_in
+            })
+        
+        return result
+    
     async def get_account_by_email(self, email: str) -> Optional[Account]:
         """Get account by email address."""
         try:
@@ -200,31 +303,35 @@ class AuthenticationUseCases:
         **kwargs
     ) -> Dict[str, Any]:
         """AUTH003 - Authenticate account based on flow type."""
+        account = None
         try:
             account = await self.account_repo.get_account_by_id(account_id)
             if not account:
                 raise ValueError(f"Account {account_id} not found")
             
-            if account.authentication_flow == AuthenticationFlow.AUTHORIZATION_CODE:
-                return await self._authenticate_authorization_code(account, **kwargs)
-            elif account.authentication_flow == AuthenticationFlow.DEVICE_CODE:
-                return await self._authenticate_device_code(account, **kwargs)
-            else:
+            handler = self._auth_dispatch.get(account.authentication_flow)
+            if not handler:
                 raise ValueError(f"Unsupported authentication flow: {account.authentication_flow}")
+            
+            return await handler(account, **kwargs)
                 
         except Exception as e:
             await self._log_auth_event(
                 account_id=account_id,
                 event_type="authentication",
-                authentication_flow=account.authentication_flow if 'account' in locals() else None,
+                authentication_flow=account.authentication_flow if account else None,
                 success=False,
                 error_message=str(e)
             )
-            logger.error(
-                "Authentication failed",
-                account_id=account_id,
-                error=str(e)
-            )
+            # ValueError covers expected failures (unknown account, missing token)
+            # that are already recorded in the auth log
+            if not isinstance(e, ValueError):
+                logger.error(
+                    "Authentication failed",
+                    account_id=account_id,
+                    error=str(e),
+                    exc_info=True
+                )
             raise
     
     async def _authenticate_authorization_code(
@@ -262,20 +369,8 @@ class AuthenticationUseCases:
                 state=state or ""  # State should be validated here
             )
             
-            # Save token
-            await self._save_token(account.id, token_data)
-            
-            # Update account last authenticated time
-            account.last_authenticated_at = datetime.now(UTC)
-            await self.account_repo.update_account(account)
-            
-            # Log successful authentication
-            await self._log_auth_event(
-                account_id=account.id,
-                event_type="authentication",
-                authentication_flow=account.authentication_flow,
-                success=True
-            )
+            # Save token, update last authenticated time and log success together
+            await self._commit_authentication(account, token_data, "authentication")
             
             return {
                 "success": True,
@@ -331,24 +426,12 @@ class AuthenticationUseCases:
                 "access_token": "placeholder_access_token",
                 "refresh_token": "placeholder_refresh_token",
                 "expires_in": 3600,
-                "scope": " ".join(account.scopes)
+                "scope": _join_scopes(account.scopes)
             }
             
             if "access_token" in token_data:
-                # Save token
-                await self._save_token(account.id, token_data)
-                
-                # Update account last authenticated time
-                account.last_authenticated_at = datetime.now(UTC)
-                await self.account_repo.update_account(account)
-                
-                # Log successful authentication
-                await self._log_auth_event(
-                    account_id=account.id,
-                    event_type="authentication",
-                    authentication_flow=account.authentication_flow,
-                    success=True
-                )
+                # Save token, update last authenticated time and log success together
+                await self._commit_authentication(account, token_data, "authentication")
                 
                 return {
                     "success": True,
@@ -362,44 +445,40 @@ class AuthenticationUseCases:
                     "message": "Authentication pending. Please complete the device code flow."
                 }
     
-    async def refresh_token(self, account_id: str) -> Dict[str, Any]:
-        """AUTH004 - Refresh access token."""
+    async def refresh_token(
+        self,
+        account_id: str,
+        account: Optional[Account] = None,
+        token: Optional[Token] = None
+    ) -> Dict[str, Any]:
+        """AUTH004 - Refresh access token.
+        
+        Callers that already loaded the account and token (e.g. a refresh
+        sweep) can pass them to skip the lookups.
+        """
         try:
-            account = await self.account_repo.get_account_by_id(account_id)
+            if account is None:
+                account = await self.account_repo.get_account_by_id(account_id)
             if not account:
                 raise ValueError(f"Account {account_id} not found")
             
-            token = await self.token_repo.get_token_by_account_id(account_id)
+            if token is None:
+                token = await self.token_repo.get_token_by_account_id(account_id)
             if not token or not token.refresh_token:
                 raise ValueError("No refresh token available")
             
-            # Get client secret for authorization code flow
-            client_secret = None
-            if account.authentication_flow == AuthenticationFlow.AUTHORIZATION_CODE:
-                auth_data = await self.auth_flow_repo.get_auth_code_account(account_id)
-                if auth_data:
-                    client_secret = auth_data.client_secret
-            
             # Refresh token
             token_data = await self.oauth_client.refresh_token(
                 refresh_token=token.refresh_token
             )
             
-            # Save new token
-            await self._save_token(account_id, token_data)
-            
-            # Log successful token refresh
-            await self._log_auth_event(
-                account_id=account_id,
-                event_type="token_refresh",
-                authentication_flow=account.authentication_flow,
-                success=True
+            # Save new token and log successful token refresh together
+            await self._commit_authentication(
+                account, token_data, "token_refresh", update_last_authenticated=False
             )
             
-            logger.info(
-                "Token refreshed successfully",
-                account_id=account_id
-            )
+            if _log.isEnabledFor(logging.INFO):
+                _log.info("Token refreshed successfully account_id=%s", account_id)
             
             return {
                 "success": True,
@@ -410,19 +489,22 @@ class AuthenticationUseCases:
             await self._log_auth_event(
                 account_id=account_id,
                 event_type="token_refresh",
-                authentication_flow=account.authentication_flow if 'account' in locals() else None,
+                authentication_flow=account.authentication_flow if account else None,
                 success=False,
                 error_message=str(e)
             )
-            logger.error(
-                "Token refresh failed",
-                account_id=account_id,
-                error=str(e)
-            )
+            if not isinstance(e, ValueError):
+                logger.error(
+                    "Token refresh failed",
+                    account_id=account_id,
+                    error=str(e),
+                    exc_info=True
+                )
             raise
     
     async def revoke_token(self, account_id: str) -> Dict[str, Any]:
         """AUTH006 - Revoke access and refresh tokens."""
+        account = None
         try:
             account = await self.account_repo.get_account_by_id(account_id)
             if not account:
@@ -435,6 +517,7 @@ class AuthenticationUseCases:
                 
                 # Delete local token
                 await self.token_repo.delete_token(account_id)
+                self._invalidate_token_cache(account_id)
             
             # Log successful logout
             await self._log_auth_event(
@@ -444,10 +527,8 @@ class AuthenticationUseCases:
                 success=True
             )
             
-            logger.info(
-                "Token revoked successfully",
-                account_id=account_id
-            )
+            if _log.isEnabledFor(logging.INFO):
+                _log.info("Token revoked successfully account_id=%s", account_id)
             
             return {
                 "success": True,
@@ -458,15 +539,17 @@ class AuthenticationUseCases:
             await self._log_auth_event(
                 account_id=account_id,
                 event_type="logout",
-                authentication_flow=account.authentication_flow if 'account' in locals() else None,
+                authentication_flow=account.authentication_flow if account else None,
                 success=False,
                 error_message=str(e)
             )
-            logger.error(
-                "Token revocation failed",
-                account_id=account_id,
-                error=str(e)
-            )
+            if not isinstance(e, ValueError):
+                logger.error(
+                    "Token revocation failed",
+                    account_id=account_id,
+                    error=str(e),
+                    exc_info=True
+                )
             raise
     
     async def get_authentication_logs(
@@ -479,12 +562,15 @@ class AuthenticationUseCases:
     ) -> List[AuthenticationLog]:
         """AUTH007 - Get authentication logs with filters."""
         try:
+            # Make queued events visible to the query
+            await self.flush_auth_logs()
+            
             logs = await self.auth_log_repo.get_auth_logs(
                 account_id=account_id,
                 date_from=date_from,
                 date_to=date_to,
                 success=success,
-                limit=limit
+                limit=limit or AUTH_LOG_DEFAULT_LIMIT
             )
             return logs
             
@@ -495,23 +581,114 @@ class AuthenticationUseCases:
             )
             raise
     
-    async def _save_token(self, account_id: str, token_data: Dict[str, Any]) -> Token:
-        """Save token data to repository."""
+    async def iter_authentication_logs(
+        self,
+        account_id: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        success: Optional[bool] = None,
+        limit: Optional[int] = None
+    ) -> AsyncGenerator[AuthenticationLog, None]:
+        """Stream authentication logs with filters, without loading them all at once."""
+        await self.flush_auth_logs()
+        
+        async for log in self.auth_log_repo.iter_auth_logs(
+            account_id=account_id,
+            date_from=date_from,
+            date_to=date_to,
+            success=success,
+            limit=limit
+        ):
+            yield log
+    
+    async def iter_expiring_tokens(
+        self,
+        minutes_before: int = 5,
+        batch_size: int = 500
+    ) -> AsyncGenerator[List[Token], None]:
+        """Yield tokens expiring within the given window in batches of batch_size."""
+        async for batch in self._iter_expiring_batches(
+            self.token_repo.get_expiring_tokens, minutes_before, batch_size,
+            lambda token: token.account_id
+        ):
+            yield batch
+    
+    async def iter_expiring_tokens_with_accounts(
+        self,
+        minutes_before: int = 5,
+        batch_size: int = 500
+    ) -> AsyncGenerator[List[Tuple[Token, Account]], None]:
+        """Yield (token, account) pairs expiring within the given window in batches."""
+        async for batch in self._iter_expiring_batches(
+            self.token_repo.get_expiring_tokens_with_accounts, minutes_before, batch_size,
+            lambda pair: pair[0].account_id
+        ):
+            yield batch
+    
+    async def _iter_expiring_batches(
+        self,
+        fetch: Callable[..., Awaitable[List[Any]]],
+        minutes_before: int,
+        batch_size: int,
+        account_id_of: Callable[[Any], str]
+    ) -> AsyncGenerator[List[Any], None]:
+        """Page through a keyset-paged expiring token query until it runs out."""
+        expires_before = datetime.now(UTC) + timedelta(minutes=minutes_before)
+        after_account_id = None
+        
+        while True:
+            batch = await fetch(
+                expires_before=expires_before,
+                after_account_id=after_account_id,
+                limit=batch_size
+            )
+            if not batch:
+                return
+            
+            yield batch
+            
+            if len(batch) < batch_size:
+                return
+            after_account_id = account_id_of(batch[-1])
+    
+    async def _commit_authentication(
+        self,
+        account: Account,
+        token_data: Dict[str, Any],
+        event_type: str,
+        update_last_authenticated: bool = True
+    ) -> Token:
+        """Save token data, stamp the account and log success in one transaction."""
+        now = datetime.now(UTC)
         expires_in = token_data.get("expires_in", 3600)
-        expires_at = datetime.now(UTC) + timedelta(seconds=expires_in)
+        expires_at = now + timedelta(seconds=expires_in)
         
         token = Token(
-            account_id=account_id,
+            account_id=account.id,
             access_token=token_data["access_token"],
             refresh_token=token_data.get("refresh_token"),
             token_type=token_data.get("token_type", "Bearer"),
             expires_at=expires_at,
-            scopes=token_data.get("scope", "").split(" ") if token_data.get("scope") else [],
+            scopes=(token_data.get("scope") or "").split(),
             status=TokenStatus.VALID,
-            created_at=datetime.now(UTC)
+            created_at=now
+        )
+        log_entry = AuthenticationLog(
+            account_id=account.id,
+            event_type=event_type,
+            authentication_flow=account.authentication_flow,
+            success=True,
+            timestamp=now
         )
         
-        return await self.token_repo.save_token(token)
+        saved_token = await self.account_repo.commit_authentication(
+            account.id,
+            token,
+            log_entry,
+            authenticated_at=now if update_last_authenticated else None
+        )
+        self._invalidate_token_cache(account.id)
+        return saved_token
     
     async def _log_auth_event(
         self,
@@ -538,45 +715,34 @@ class AuthenticationUseCases:
                 timestamp=datetime.now(UTC)
             )
             
-            await self.auth_log_repo.save_auth_log(log)
+            await self.write_queue.enqueue(log)
             
         except Exception as e:
-            logger.error(
-                "Failed to log authentication event",
-                account_id=account_id,
-                event_type=event_type,
-                error=str(e)
+            _log.error(
+                "Failed to log authentication event account_id=%s event_type=%s error=%s",
+                account_id, event_type, e
             )
     
-    # Additional methods needed by tests
-    async def get_all_accounts_info(self) -> List[Dict[str, Any]]:
-        """Get all accounts info - alias for get_all_accounts."""
-        return await self.get_all_accounts()
+    async def flush_auth_logs(self) -> None:
+        """Wait until all queued authentication logs have been written."""
+        await self.write_queue.flush()
     
-    async def refresh_account_token(self, account_id: str) -> Dict[str, Any]:
-        """Refresh account token - alias for refresh_token."""
-        return await self.refresh_token(account_id)
+    async def aclose(self) -> None:
+        """Write pending authentication logs and stop the write queue, if owned."""
+        if self._owned_write_queue is not None:
+            await self._owned_write_queue.aclose()
     
-    async def revoke_account_tokens(self, account_id: str) -> Dict[str, Any]:
-        """Revoke account tokens - alias for revoke_token."""
-        return await self.revoke_token(account_id)
+    # Additional names needed by tests - aliases, not wrappers
+    get_all_accounts_info = get_all_accounts
+    refresh_account_token = refresh_token
+    revoke_account_tokens = revoke_token
     
     async def search_accounts(self, criteria: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Search accounts by criteria."""
         try:
-            # Simple implementation - can be enhanced later
-            all_accounts = await self.get_all_accounts()
-            
-            # Filter by email if provided
-            if "email" in criteria:
-                email_filter = criteria["email"].lower()
-                filtered_accounts = [
-                    acc for acc in all_accounts 
-                    if email_filter in acc["account"]["email"].lower()
-                ]
-                return filtered_accounts
-            
-            return all_accounts
+            # Filtering (case-insensitive email match, limit) runs in the repository
+            accounts = await self.account_repo.search_accounts(criteria)
+            return await self._with_token_status(accounts)
             
         except Exception as e:
             logger.error("Failed to search accounts", criteria=criteria, error=str(e))
@@ -1,23 +1,112 @@
 """Mail use cases for Microsoft Graph API Mail Collection System."""
 
+import asyncio
+import re
+import time
 import uuid
-from datetime import datetime
-from typing import Dict, Any, Optional, List
+from contextlib import nullcontext
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import (
+    Dict, Any, Optional, List, AsyncContextManager, AsyncGenerator, Tuple, Callable, Awaitable, TypeVar
+)
 import structlog
 
+from core.exceptions import ExternalAPIErrorException
 from core.domain.entities import (
-    MailMessage, MailQueryHistory, DeltaLink, WebhookSubscription,
+    Account, Token, MailMessage, MailQueryHistory, DeltaLink, WebhookSubscription,
     ExternalAPICall, MailDirection, MailImportance
 )
 from core.usecases.ports import (
     AccountRepositoryPort, TokenRepositoryPort, MailRepositoryPort,
     MailQueryHistoryRepositoryPort, DeltaLinkRepositoryPort,
     WebhookRepositoryPort, ExternalAPIRepositoryPort,
-    GraphAPIClientPort, ExternalAPIClientPort, ConfigPort
+    GraphAPIClientPort, ExternalAPIClientPort, ConfigPort, UnitOfWorkPort,
+    ExternalAPIConfig, WriteAheadQueuePort
 )
+from core.services.write_queue import BatchingWriteQueue
+
+try:
+    from ciso8601 import parse_datetime_as_naive as _parse_graph_datetime
+except ImportError:
+    def _parse_graph_datetime(value: str) -> datetime:
+        """Parse a Graph ISO-8601 timestamp into a naive datetime."""
+        return datetime.fromisoformat(value).replace(tzinfo=None)
 
 logger = structlog.get_logger()
 
+T = TypeVar("T")
+
+# Accounts processed concurrently per query/sync run; each account holds
+# one Graph request and one database session at a time
+ACCOUNT_CONCURRENCY = 5
+
+# Concurrent posts to the external API endpoint per batch of new messages
+EXTERNAL_API_CONCURRENCY = 10
+
+# Graph message pages fetched ahead of the one being stored, per account
+MESSAGE_PAGE_BUFFER = 2
+
+# Message fields requested from Graph for mail queries
+_MAIL_SELECT_FIELDS = (
+    "id", "internetMessageId", "subject", "from", "toRecipients",
+    "ccRecipients", "bccRecipients", "bodyPreview", "body",
+    "importance", "isRead", "hasAttachments", "receivedDateTime",
+    "sentDateTime", "parentFolderId", "categories"
+)
+
+_BOOL_STR = {True: "true", False: "false"}
+
+_DELTATOKEN_RE = re.compile(r"[?&]\$deltatoken=([^&]+)")
+
+# Graph importance values to stored MailImportance values; title case is
+# mapped too so no per-message str.lower() is needed
+_IMPORTANCE_MAP = {
+    key: importance.value
+    for importance in MailImportance
+    for key in (importance.value, importance.value.capitalize())
+}
+
+
+@lru_cache(maxsize=256)
+def _build_filter_query(
+    date_from: Optional[datetime],
+    date_to: Optional[datetime],
+    sender_email: Optional[str],
+    is_read: Optional[bool],
+    importance: Optional[MailImportance]
+) -> Optional[str]:
+    """Build the Graph $filter expression for a mail query, cached per filter set."""
+    filter_parts = []
+    
+    if date_from:
+        filter_parts.append(f"receivedDateTime ge {date_from.isoformat()}Z")
+    if date_to:
+        filter_parts.append(f"receivedDateTime lt {date_to.isoformat()}Z")
+    if sender_email:
+        filter_parts.append(f"from/emailAddress/address eq '{sender_email}'")
+    if is_read is not None:
+        filter_parts.append(f"isRead eq {_BOOL_STR[is_read]}")
+    if importance:
+        filter_parts.append(f"importance eq '{MailImportance(importance).value}'")
+    
+    if not filter_parts:
+        return None
+    return filter_parts[0] if len(filter_parts) == 1 else " and ".join(filter_parts)
+
+
+def _extract_addresses(recipients: Optional[List[Dict[str, Any]]]) -> List[str]:
+    """Extract the non-empty email addresses from a Graph recipient list."""
+    addresses = []
+    for recipient in recipients or ():
+        try:
+            address = recipient["emailAddress"]["address"]
+        except (KeyError, TypeError):
+            continue
+        if address:
+            addresses.append(address)
+    return addresses
+
 
 class MailUseCases:
     """Mail related use cases."""
@@ -33,7 +122,8 @@ class MailUseCases:
         external_api_repo: ExternalAPIRepositoryPort,
         graph_client: GraphAPIClientPort,
         external_api_client: ExternalAPIClientPort,
-        config: ConfigPort
+        config: ConfigPort,
+        write_queue: Optional[WriteAheadQueuePort] = None
     ):
         self.account_repo = account_repo
         self.token_repo = token_repo
@@ -45,6 +135,42 @@ class MailUseCases:
         self.graph_client = graph_client
         self.external_api_client = external_api_client
         self.config = config
+        # External API call records and query history are written off the request
+        # path; a write queue created here, rather than passed in, is stopped by aclose()
+        self._owned_write_queue = None if write_queue else BatchingWriteQueue({
+            ExternalAPICall: external_api_repo.save_api_calls,
+            MailQueryHistory: query_history_repo.save_query_histories
+        })
+        self.write_queue = write_queue or self._owned_write_queue
+        
+        # Resolved on first use so config is not read at construction time
+        self._external_api_config: Optional[ExternalAPIConfig] = None
+        
+        # Webhook-driven delta syncs per account: the one running and the one
+        # queued behind it, which every later notification shares
+        self._running_webhook_syncs: Dict[str, asyncio.Task] = {}
+        self._pending_webhook_syncs: Dict[str, asyncio.Task] = {}
+    
+    def _get_external_api_config(self) -> ExternalAPIConfig:
+        """Get external API configuration, looked up once per instance."""
+        if self._external_api_config is None:
+            self._external_api_config = self.config.get_external_api_config()
+        return self._external_api_config
+    
+    def _unit_of_work(self) -> AsyncContextManager[None]:
+        """Open a unit of work on the mail repository when it supports one."""
+        if isinstance(self.mail_repo, UnitOfWorkPort):
+            return self.mail_repo.begin()
+        return nullcontext()
+    
+    def _external_api_enabled(self) -> bool:
+        """Check whether an external API endpoint is configured."""
+        return bool(self._get_external_api_config().endpoint_url)
+    
+    async def aclose(self) -> None:
+        """Write queued API call records and query history and stop the write queue, if owned."""
+        if self._owned_write_queue is not None:
+            await self._owned_write_queue.aclose()
     
     async def query_mails(
         self,
@@ -62,8 +188,8 @@ class MailUseCases:
         order_by: str = "receivedDateTime desc"
     ) -> Dict[str, Any]:
         """MAIL001 - Query mails with filters."""
-        start_time = datetime.utcnow()
-        
+        # Mail stored by other processes before now is looked up, not assumed new
+        started_at = datetime.utcnow()
         try:
             accounts_to_query = []
             
@@ -75,100 +201,35 @@ class MailUseCases:
             else:
                 accounts_to_query = await self.account_repo.get_all_accounts()
             
-            all_messages = []
-            total_new_messages = 0
+            # Build filter query
+            filter_query = _build_filter_query(date_from, date_to, sender_email, is_read, importance)
             
-            for account in accounts_to_query:
-                # Get valid token
-                token = await self.token_repo.get_token_by_account_id(account.id)
-                if not token or token.is_expired:
-                    logger.warning(
-                        "No valid token for account",
-                        account_id=account.id,
-                        email=account.email
+            # Fetch every account's first page up front, batching where tokens allow
+            pages = await self._get_message_pages(
+                accounts_to_query, folder, filter_query, top, order_by
+            )
+            
+            # History of the accounts processed is kept even if another one fails
+            histories: List[MailQueryHistory] = []
+            try:
+                results = await self._for_each_account(
+                    [account for account in accounts_to_query if account.id in pages],
+                    lambda account: self._query_account(
+                        account, *pages[account.id],
+                        folder, filter_query, direction, top, order_by, started_at, histories
                     )
-                    continue
-                
-                # Build filter query
-                filter_parts = []
-                
-                if date_from:
-                    filter_parts.append(f"receivedDateTime ge {date_from.isoformat()}Z")
-                if date_to:
-                    filter_parts.append(f"receivedDateTime lt {date_to.isoformat()}Z")
-                if sender_email:
-                    filter_parts.append(f"from/emailAddress/address eq '{sender_email}'")
-                if is_read is not None:
-                    filter_parts.append(f"isRead eq {str(is_read).lower()}")
-                if importance:
-                    filter_parts.append(f"importance eq '{importance.value}'")
-                
-                filter_query = " and ".join(filter_parts) if filter_parts else None
-                
-                # Select fields
-                select_fields = [
-                    "id", "internetMessageId", "subject", "from", "toRecipients",
-                    "ccRecipients", "bccRecipients", "bodyPreview", "body",
-                    "importance", "isRead", "hasAttachments", "receivedDateTime",
-                    "sentDateTime", "parentFolderId", "categories"
-                ]
-                
-                # Query messages from Graph API
-                response = await self.graph_client.get_messages(
-                    access_token=token.access_token,
-                    user_id=account.user_id,
-                    folder=folder,
-                    filter_query=filter_query,
-                    select_fields=select_fields,
-                    top=top,
-                    order_by=order_by
                 )
-                
-                # Process messages
-                messages = response.get("value", [])
-                new_messages_count = 0
-                
-                for msg_data in messages:
-                    # Check if message already exists
-                    existing = await self.mail_repo.mail_exists(
-                        message_id=msg_data["id"],
-                        account_id=account.id
-                    )
-                    
-                    if not existing:
-                        # Create mail message entity
-                        mail_message = self._create_mail_message(msg_data, account.id, direction)
-                        
-                        # Save to database
-                        saved_message = await self.mail_repo.save_mail_message(mail_message)
-                        all_messages.append(saved_message)
-                        new_messages_count += 1
-                        
-                        # Send to external API if configured
-                        await self._send_to_external_api(saved_message)
-                    else:
-                        # Add existing message to results
-                        existing_message = await self.mail_repo.get_mail_by_message_id(msg_data["id"])
-                        if existing_message:
-                            all_messages.append(existing_message)
-                
+            finally:
+                await self._save_query_histories(histories)
+            
+            # Messages returned more than once (e.g. on overlapping pages) are
+            # listed once, in first-seen order
+            all_messages: Dict[Tuple[str, str], MailMessage] = {}
+            total_new_messages = 0
+            for messages, new_messages_count in results:
+                for message in messages:
+                    all_messages.setdefault((message.account_id, message.message_id), message)
                 total_new_messages += new_messages_count
-                
-                # Log query history
-                execution_time = int((datetime.utcnow() - start_time).total_seconds() * 1000)
-                await self._log_query_history(
-                    account_id=account.id,
-                    query_type="manual",
-                    query_parameters={
-                        "folder": folder,
-                        "filter_query": filter_query,
-                        "top": top,
-                        "order_by": order_by
-                    },
-                    messages_found=len(messages),
-                    new_messages=new_messages_count,
-                    execution_time_ms=execution_time
-                )
             
             logger.info(
                 "Mail query completed",
@@ -179,7 +240,7 @@ class MailUseCases:
             
             return {
                 "success": True,
-                "messages": [msg.dict() for msg in all_messages],
+                "messages": [msg.model_dump() for msg in all_messages.values()],
                 "total_messages": len(all_messages),
                 "new_messages": total_new_messages,
                 "accounts_queried": len(accounts_to_query)
@@ -193,6 +254,294 @@ class MailUseCases:
             )
             raise
     
+    async def _get_message_pages(
+        self,
+        accounts: List[Account],
+        folder: str,
+        filter_query: Optional[str],
+        top: Optional[int],
+        order_by: str
+    ) -> Dict[str, Any]:
+        """Fetch the first Graph message page for each account with a valid token.
+        
+        Accounts sharing an access token are coalesced into JSON batch calls;
+        the rest are fanned out as direct requests. Returns (page or the error
+        raised for it, fetch time in nanoseconds, access token) per account id.
+        """
+        async def _with_token(account: Account) -> Tuple[Account, Optional[Token]]:
+            return account, await self._get_valid_token(account)
+        
+        account_tokens = await self._for_each_account(accounts, _with_token)
+        
+        accounts_by_token: Dict[str, List[Account]] = {}
+        for account, token in account_tokens:
+            if token:
+                accounts_by_token.setdefault(token.access_token, []).append(account)
+        
+        def _request(account: Account) -> Dict[str, Any]:
+            return {
+                "id": account.id,
+                "user_id": account.user_id,
+                "folder": folder,
+                "filter_query": filter_query,
+                "select_fields": _MAIL_SELECT_FIELDS,
+                "top": top,
+                "order_by": order_by
+            }
+        
+        async def _fetch_direct(direct: List[Tuple[str, Account]]) -> Dict[str, Tuple[Any, int, str]]:
+            access_tokens = {account.id: access_token for access_token, account in direct}
+            requests = [
+                {**_request(account), "access_token": access_token}
+                for access_token, account in direct
+            ]
+            
+            fetch_started = time.perf_counter_ns()
+            pages = {}
+            async for account_id, page in self.graph_client.get_messages_for_many(
+                requests, concurrency=ACCOUNT_CONCURRENCY
+            ):
+                fetch_ns = time.perf_counter_ns() - fetch_started
+                pages[account_id] = (page, fetch_ns, access_tokens[account_id])
+            return pages
+        
+        async def _fetch(access_token: str, group: List[Account]) -> Dict[str, Any]:
+            try:
+                responses = await self.graph_client.batch_get_messages(
+                    access_token, [_request(account) for account in group]
+                )
+            except Exception as e:
+                return {account.id: e for account in group}
+            
+            pages = {}
+            for account in group:
+                response = responses.get(account.id, {"status": 500, "body": {}})
+                if response["status"] >= 400:
+                    pages[account.id] = ExternalAPIErrorException(
+                        "$batch", response["status"], str(response["body"].get("error", ""))
+                    )
+                else:
+                    pages[account.id] = response["body"]
+            return pages
+        
+        semaphore = asyncio.Semaphore(ACCOUNT_CONCURRENCY)
+        
+        async def _run(access_token: str, group: List[Account]) -> Dict[str, Tuple[Any, int, str]]:
+            async with semaphore:
+                fetch_started = time.perf_counter_ns()
+                group_pages = await _fetch(access_token, group)
+                fetch_ns = time.perf_counter_ns() - fetch_started
+            return {
+                account_id: (page, fetch_ns, access_token)
+                for account_id, page in group_pages.items()
+            }
+        
+        # Accounts alone on their token are fetched directly, the rest in batches
+        direct = [
+            (access_token, group[0]) for access_token, group in accounts_by_token.items()
+            if len(group) == 1
+        ]
+        fetches = [
+            _run(access_token, group) for access_token, group in accounts_by_token.items()
+            if len(group) > 1
+        ]
+        if direct:
+            fetches.append(_fetch_direct(direct))
+        
+        pages = {}
+        for group_pages in await asyncio.gather(*fetches):
+            pages.update(group_pages)
+        return pages
+    
+    async def _get_valid_token(self, account: Account) -> Optional[Token]:
+        """Get the account's token, or None (with a warning) if it is missing or expired."""
+        token = await self.token_repo.get_token_by_account_id(account.id)
+        if not token or token.is_expired:
+            logger.warning(
+                "No valid token for account",
+                account_id=account.id,
+                email=account.email
+            )
+            return None
+        return token
+    
+    async def _query_account(
+        self,
+        account: Account,
+        response: Any,
+        fetch_ns: int,
+        access_token: str,
+        folder: str,
+        filter_query: Optional[str],
+        direction: Optional[MailDirection],
+        top: Optional[int],
+        order_by: str,
+        started_at: datetime,
+        histories: List[MailQueryHistory]
+    ) -> Tuple[List[MailMessage], int]:
+        """Store and forward one account's fetched mails; returns (messages, new count).
+        
+        Without a top limit, the pages after the first are fetched while the
+        previous one is being stored. The account's query history entry, timed
+        from its Graph fetch through processing, is appended to histories.
+        """
+        started = time.perf_counter_ns()
+        if isinstance(response, BaseException):
+            raise response
+        
+        account_messages: List[MailMessage] = []
+        messages_found = 0
+        new_messages_count = 0
+        
+        # At most MESSAGE_PAGE_BUFFER fetched pages wait for storing at a time
+        page_queue: asyncio.Queue = asyncio.Queue(maxsize=MESSAGE_PAGE_BUFFER)
+        
+        async def _produce() -> None:
+            await page_queue.put(response.get("value", []))
+            next_link = response.get("@odata.nextLink") if top is None else None
+            if next_link:
+                async for page in self.graph_client.iter_message_pages(access_token, next_link):
+                    await page_queue.put(page.get("value", []))
+            await page_queue.put(None)
+        
+        async def _consume() -> None:
+            nonlocal messages_found, new_messages_count
+            while (messages := await page_queue.get()) is not None:
+                page_messages, saved_count = await self._store_message_page(
+                    account, messages, direction, started_at
+                )
+                account_messages.extend(page_messages)
+                messages_found += len(messages)
+                new_messages_count += saved_count
+        
+        try:
+            async with asyncio.TaskGroup() as page_tasks:
+                page_tasks.create_task(_produce())
+                page_tasks.create_task(_consume())
+        except ExceptionGroup as e:
+            # Surface the failing task's own error to the caller
+            raise e.exceptions[0]
+        
+        # Record query history
+        execution_time = (fetch_ns + time.perf_counter_ns() - started) // 1_000_000
+        histories.append(self._build_query_history(
+            account_id=account.id,
+            query_type="manual",
+            query_parameters={
+                "folder": folder,
+                "filter_query": filter_query,
+                "top": top,
+                "order_by": order_by
+            },
+            messages_found=messages_found,
+            new_messages=new_messages_count,
+            execution_time_ms=execution_time
+        ))
+        
+        return account_messages, new_messages_count
+    
+    async def _store_message_page(
+        self,
+        account: Account,
+        messages: List[Dict[str, Any]],
+        direction: Optional[MailDirection],
+        started_at: datetime
+    ) -> Tuple[List[MailMessage], int]:
+        """Store and forward one page of Graph messages; returns (messages, new count).
+        
+        Messages stored before started_at by any process count as stored.
+        """
+        # Look up and save the page in one transaction
+        async with self._unit_of_work():
+            # Fetch already stored messages for the whole page in one query;
+            # anything missing from the result is new
+            candidate_ids = await self._possibly_stored_ids(
+                account.id, [msg_data["id"] for msg_data in messages], started_at
+            )
+            existing_messages = {
+                message.message_id: message
+                for message in await self.mail_repo.get_mails_by_message_ids(account.id, candidate_ids)
+            } if candidate_ids else {}
+            
+            # Create entities for new messages and upsert them in one batch, so
+            # ones another process stored meanwhile are updated, not duplicated
+            now = datetime.utcnow()
+            new_messages = {}
+            for msg_data in messages:
+                if msg_data["id"] not in existing_messages and msg_data["id"] not in new_messages:
+                    new_messages[msg_data["id"]] = self._create_mail_message(
+                        msg_data, account.id, direction, now
+                    )
+            
+            saved_messages = {}
+            if new_messages:
+                saved_messages = {
+                    message.message_id: message
+                    for message in await self.mail_repo.upsert_mail_messages(list(new_messages.values()))
+                }
+        
+        # Keep results in Graph order, new and existing messages alike
+        page_messages = []
+        for msg_data in messages:
+            message_id = msg_data["id"]
+            message = (
+                saved_messages.get(message_id)
+                or existing_messages.get(message_id)
+                or new_messages.get(message_id)
+            )
+            if message:
+                page_messages.append(message)
+        
+        # Send new messages to external API if configured
+        if saved_messages and self._external_api_enabled():
+            await self._send_to_external_api(list(saved_messages.values()))
+        
+        return page_messages, len(saved_messages)
+    
+    async def _possibly_stored_ids(
+        self,
+        account_id: str,
+        message_ids: List[str],
+        started_at: datetime
+    ) -> List[str]:
+        """Narrow message IDs to those the account's existence filter may have stored.
+        
+        IDs the filter rules out are new and need no database lookup. The
+        filter is rebuilt if it predates started_at, so a sync or query sees
+        what other processes stored before it began.
+        """
+        if not message_ids:
+            return []
+        
+        existence_filter = await self.mail_repo.get_existence_filter(account_id, started_at)
+        return [message_id for message_id in message_ids if message_id in existence_filter]
+    
+    async def _for_each_account(
+        self,
+        accounts: List[Account],
+        func: Callable[[Account], Awaitable[T]]
+    ) -> List[T]:
+        """Run func for each account concurrently, bounded by ACCOUNT_CONCURRENCY.
+        
+        Results are in account order. The first failure cancels the accounts
+        still running and is raised. Each account runs in a task of its own,
+        so repository calls it makes outside a unit of work get their own
+        database session.
+        """
+        semaphore = asyncio.Semaphore(ACCOUNT_CONCURRENCY)
+        
+        async def _run(account: Account) -> T:
+            async with semaphore:
+                return await func(account)
+        
+        try:
+            async with asyncio.TaskGroup() as account_tasks:
+                tasks = [account_tasks.create_task(_run(account)) for account in accounts]
+        except ExceptionGroup as e:
+            # Surface the failing account's own error to the caller
+            raise e.exceptions[0]
+        return [task.result() for task in tasks]
+    
     async def send_mail(
         self,
         account_id: str,
@@ -274,6 +623,8 @@ class MailUseCases:
         folder: str = "Inbox"
     ) -> Dict[str, Any]:
         """MAIL004 - Sync mails using delta links."""
+        # Mail stored by other processes before now is looked up, not assumed new
+        started_at = datetime.utcnow()
         try:
             accounts_to_sync = []
             
@@ -285,66 +636,16 @@ class MailUseCases:
             else:
                 accounts_to_sync = await self.account_repo.get_all_accounts()
             
-            total_new_messages = 0
-            
-            for account in accounts_to_sync:
-                token = await self.token_repo.get_token_by_account_id(account.id)
-                if not token or token.is_expired:
-                    continue
-                
-                # Get existing delta link
-                delta_link = await self.delta_link_repo.get_delta_link(account.id, folder)
-                delta_token = delta_link.delta_token if delta_link else None
-                
-                # Get delta messages
-                response = await self.graph_client.get_delta_messages(
-                    access_token=token.access_token,
-                    user_id=account.user_id,
-                    folder=folder,
-                    delta_token=delta_token
-                )
-                
-                messages = response.get("value", [])
-                new_messages_count = 0
-                
-                for msg_data in messages:
-                    # Check if message already exists
-                    existing = await self.mail_repo.mail_exists(
-                        message_id=msg_data["id"],
-                        account_id=account.id
-                    )
-                    
-                    if not existing:
-                        mail_message = self._create_mail_message(msg_data, account.id, MailDirection.RECEIVED)
-                        saved_message = await self.mail_repo.save_mail_message(mail_message)
-                        new_messages_count += 1
-                        
-                        # Send to external API
-                        await self._send_to_external_api(saved_message)
-                
-                total_new_messages += new_messages_count
-                
-                # Update delta link
-                new_delta_token = self._extract_delta_token(response)
-                if new_delta_token:
-                    new_delta_link = DeltaLink(
-                        account_id=account.id,
-                        folder_id=folder,
-                        delta_token=new_delta_token,
-                        created_at=datetime.utcnow(),
-                        last_used_at=datetime.utcnow(),
-                        is_active=True
-                    )
-                    await self.delta_link_repo.save_delta_link(new_delta_link)
-                
-                # Log query history
-                await self._log_query_history(
-                    account_id=account.id,
-                    query_type="delta",
-                    query_parameters={"folder": folder, "delta_token": delta_token},
-                    messages_found=len(messages),
-                    new_messages=new_messages_count
+            # History of the accounts synced is kept even if another one fails
+            histories: List[MailQueryHistory] = []
+            try:
+                results = await self._for_each_account(
+                    accounts_to_sync,
+                    lambda account: self._sync_account(account, folder, started_at, histories)
                 )
+            finally:
+                await self._save_query_histories(histories)
+            total_new_messages = sum(results)
             
             logger.info(
                 "Delta sync completed",
@@ -366,6 +667,88 @@ class MailUseCases:
             )
             raise
     
+    async def _sync_account(
+        self,
+        account: Account,
+        folder: str,
+        started_at: datetime,
+        histories: List[MailQueryHistory]
+    ) -> int:
+        """Run a delta sync for a single account and return its new message count.
+        
+        Messages stored before started_at by any process count as stored. The
+        account's query history entry is appended to histories.
+        """
+        started = time.perf_counter_ns()
+        token = await self.token_repo.get_token_by_account_id(account.id)
+        if not token or token.is_expired:
+            return 0
+        
+        # Get existing delta link
+        delta_link = await self.delta_link_repo.get_delta_link(account.id, folder)
+        delta_token = delta_link.delta_token if delta_link else None
+        
+        # Get delta messages
+        response = await self.graph_client.get_delta_messages(
+            access_token=token.access_token,
+            user_id=account.user_id,
+            folder=folder,
+            delta_token=delta_token
+        )
+        
+        messages = response.get("value", [])
+        new_messages_count = 0
+        
+        # Look up already stored messages for the whole page at once
+        candidate_ids = await self._possibly_stored_ids(
+            account.id, [msg_data["id"] for msg_data in messages], started_at
+        )
+        existing_ids = await self.mail_repo.get_existing_message_ids(
+            account.id, candidate_ids
+        ) if candidate_ids else set()
+        
+        now = datetime.utcnow()
+        new_messages = {}
+        for msg_data in messages:
+            if msg_data["id"] not in existing_ids and msg_data["id"] not in new_messages:
+                new_messages[msg_data["id"]] = self._create_mail_message(
+                    msg_data, account.id, MailDirection.RECEIVED, now
+                )
+        
+        if new_messages:
+            # Messages another process stored meanwhile are updated, not counted
+            saved_messages = await self.mail_repo.upsert_mail_messages(list(new_messages.values()))
+            new_messages_count = len(saved_messages)
+            
+            # Send to external API if configured
+            if saved_messages and self._external_api_enabled():
+                await self._send_to_external_api(saved_messages)
+        
+        # Update delta link
+        new_delta_token = self._extract_delta_token(response)
+        if new_delta_token:
+            new_delta_link = DeltaLink(
+                account_id=account.id,
+                folder_id=folder,
+                delta_token=new_delta_token,
+                created_at=now,
+                last_used_at=now,
+                is_active=True
+            )
+            await self.delta_link_repo.save_delta_link(new_delta_link)
+        
+        # Record query history
+        histories.append(self._build_query_history(
+            account_id=account.id,
+            query_type="delta",
+            query_parameters={"folder": folder, "delta_token": delta_token},
+            messages_found=len(messages),
+            new_messages=new_messages_count,
+            execution_time_ms=(time.perf_counter_ns() - started) // 1_000_000
+        ))
+        
+        return new_messages_count
+    
     async def setup_webhook(
         self,
         account_id: str,
@@ -387,7 +770,7 @@ class MailUseCases:
                 raise ValueError("No valid token available")
             
             # Generate client state
-            client_state = str(uuid.uuid4())
+            client_state = uuid.uuid4().hex
             
             # Create webhook subscription
             response = await self.graph_client.create_webhook_subscription(
@@ -407,7 +790,7 @@ class MailUseCases:
                 change_types=change_types,
                 notification_url=notification_url,
                 client_state=client_state,
-                expires_datetime=datetime.fromisoformat(response["expirationDateTime"].replace("Z", "+00:00")),
+                expires_datetime=_parse_graph_datetime(response["expirationDateTime"]),
                 created_at=datetime.utcnow(),
                 is_active=True
             )
@@ -451,6 +834,12 @@ class MailUseCases:
             # Process each notification
             notifications = notification_data.get("value", [])
             processed_count = 0
+            account_ids = {}
+            
+            # Find the subscriptions for the whole batch in one lookup
+            subscriptions = await self.webhook_repo.get_webhook_subscriptions_by_ids(
+                list({notification.get("subscriptionId") for notification in notifications} - {None})
+            )
             
             for notification in notifications:
                 subscription_id = notification.get("subscriptionId")
@@ -458,14 +847,16 @@ class MailUseCases:
                 change_type = notification.get("changeType")
                 
                 # Find account by subscription
-                subscription = await self.webhook_repo.get_webhook_subscription(subscription_id)
+                subscription = subscriptions.get(subscription_id)
                 if not subscription:
                     continue
                 
-                # Trigger delta sync for the account
-                await self.sync_delta_mails(account_id=subscription.account_id)
+                account_ids[subscription.account_id] = None
                 processed_count += 1
             
+            # Trigger one delta sync per affected account, concurrently
+            await asyncio.gather(*map(self._sync_for_webhook, account_ids))
+            
             logger.info(
                 "Webhook notifications processed",
                 notifications_count=len(notifications),
@@ -484,136 +875,231 @@ class MailUseCases:
             )
             raise
     
+    async def _sync_for_webhook(self, account_id: str) -> Dict[str, Any]:
+        """Delta sync an account for a webhook, coalescing bursts of notifications.
+        
+        A sync already running may have fetched its page before this
+        notification's change landed, so a new one is queued behind it.
+        Notifications arriving while that sync is still queued share it.
+        """
+        pending = self._pending_webhook_syncs.get(account_id)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        
+        running = self._running_webhook_syncs.get(account_id)
+        
+        async def _run() -> Dict[str, Any]:
+            if running is not None:
+                await asyncio.wait([running])
+            
+            self._pending_webhook_syncs.pop(account_id, None)
+            self._running_webhook_syncs[account_id] = task
+            try:
+                return await self.sync_delta_mails(account_id=account_id)
+            finally:
+                if self._running_webhook_syncs.get(account_id) is task:
+                    del self._running_webhook_syncs[account_id]
+        
+        task = asyncio.ensure_future(_run())
+        self._pending_webhook_syncs[account_id] = task
+        return await asyncio.shield(task)
+    
+    async def iter_expiring_webhooks(
+        self,
+        minutes_before: int = 30,
+        batch_size: int = 500
+    ) -> AsyncGenerator[List[WebhookSubscription], None]:
+        """Yield active webhook subscriptions expiring within the given window in batches."""
+        expires_before = datetime.utcnow() + timedelta(minutes=minutes_before)
+        after_subscription_id = None
+        
+        while True:
+            batch = await self.webhook_repo.get_expiring_subscriptions(
+                expires_before=expires_before,
+                after_subscription_id=after_subscription_id,
+                limit=batch_size
+            )
+            if not batch:
+                return
+            
+            yield batch
+            
+            if len(batch) < batch_size:
+                return
+            after_subscription_id = batch[-1].subscription_id
+    
+    async def get_failed_api_calls_for_retry(
+        self,
+        max_retries: int = 5,
+        limit: Optional[int] = None
+    ) -> List[ExternalAPICall]:
+        """Get failed external API calls still below the retry limit."""
+        try:
+            failed_calls = await self.external_api_repo.get_failed_api_calls(
+                limit=limit,
+                max_retries=max_retries
+            )
+            
+            logger.debug(
+                "Loaded failed API calls for retry",
+                count=len(failed_calls),
+                max_retries=max_retries
+            )
+            
+            return failed_calls
+            
+        except Exception as e:
+            logger.error(
+                "Failed to get failed API calls for retry",
+                error=str(e)
+            )
+            raise
+    
     def _create_mail_message(
         self,
         msg_data: Dict[str, Any],
         account_id: str,
-        direction: MailDirection
+        direction: MailDirection,
+        created_at: Optional[datetime] = None
     ) -> MailMessage:
-        """Create MailMessage entity from Graph API response."""
-        from_data = msg_data.get("from", {}).get("emailAddress", {})
-        
-        # Extract recipients
-        to_recipients = [
-            recipient["emailAddress"]["address"]
-            for recipient in msg_data.get("toRecipients", [])
-            if recipient.get("emailAddress", {}).get("address")
-        ]
-        
-        cc_recipients = [
-            recipient["emailAddress"]["address"]
-            for recipient in msg_data.get("ccRecipients", [])
-            if recipient.get("emailAddress", {}).get("address")
-        ]
+        """Create MailMessage entity from Graph API response.
         
-        bcc_recipients = [
-            recipient["emailAddress"]["address"]
-            for recipient in msg_data.get("bccRecipients", [])
-            if recipient.get("emailAddress", {}).get("address")
-        ]
+        Graph responses are trusted, so the entity is built without pydantic
+        validation; enum fields are stored as their values, as use_enum_values
+        would have done.
+        """
+        from_data = msg_data.get("from", {}).get("emailAddress", {})
         
         # Parse datetime
-        received_datetime = datetime.fromisoformat(
-            msg_data["receivedDateTime"].replace("Z", "+00:00")
-        ).replace(tzinfo=None)
+        received_datetime = _parse_graph_datetime(msg_data["receivedDateTime"])
         
         sent_datetime = None
         if msg_data.get("sentDateTime"):
-            sent_datetime = datetime.fromisoformat(
-                msg_data["sentDateTime"].replace("Z", "+00:00")
-            ).replace(tzinfo=None)
+            sent_datetime = _parse_graph_datetime(msg_data["sentDateTime"])
         
-        return MailMessage(
+        return MailMessage.model_construct(
             message_id=msg_data["id"],
             internet_message_id=msg_data.get("internetMessageId"),
             account_id=account_id,
             subject=msg_data.get("subject", ""),
             sender_email=from_data.get("address", ""),
             sender_name=from_data.get("name"),
-            recipients=to_recipients,
-            cc_recipients=cc_recipients,
-            bcc_recipients=bcc_recipients,
+            recipients=_extract_addresses(msg_data.get("toRecipients")),
+            cc_recipients=_extract_addresses(msg_data.get("ccRecipients")),
+            bcc_recipients=_extract_addresses(msg_data.get("bccRecipients")),
             body_preview=msg_data.get("bodyPreview"),
             body_content=msg_data.get("body", {}).get("content"),
             body_content_type=msg_data.get("body", {}).get("contentType", "html").lower(),
-            importance=MailImportance(msg_data.get("importance", "normal").lower()),
+            importance=_IMPORTANCE_MAP.get(msg_data.get("importance"), MailImportance.NORMAL.value),
             is_read=msg_data.get("isRead", False),
             has_attachments=msg_data.get("hasAttachments", False),
             received_datetime=received_datetime,
             sent_datetime=sent_datetime,
-            direction=direction,
+            direction=MailDirection(direction).value,
             categories=msg_data.get("categories", []),
-            created_at=datetime.utcnow()
+            created_at=created_at or datetime.utcnow()
         )
     
-    async def _send_to_external_api(self, message: MailMessage) -> None:
-        """Send mail message to external API."""
+    async def _send_to_external_api(self, messages: List[MailMessage]) -> None:
+        """Send new mail messages to external API concurrently and record the calls."""
+        # Nothing is built or recorded without an endpoint
+        external_config = self._get_external_api_config()
+        endpoint_url = external_config.endpoint_url
+        if not messages or not endpoint_url:
+            return
+        
         try:
-            external_config = self.config.get_external_api_config()
-            endpoint_url = external_config.get("endpoint_url")
+            timeout = external_config.timeout
+            batch_size = max(external_config.batch_size or 1, 1)
+            api_calls = [
+                self._build_external_api_call(message, endpoint_url) for message in messages
+            ]
             
-            if not endpoint_url:
-                return
+            semaphore = asyncio.Semaphore(EXTERNAL_API_CONCURRENCY)
             
-            # Prepare payload
-            payload = {
-                "message_id": message.message_id,
-                "subject": message.subject,
-                "sender_email": message.sender_email,
-                "sender_name": message.sender_name,
-                "body_content": message.body_content,
-                "body_preview": message.body_preview,
-                "received_datetime": message.received_datetime.isoformat(),
-                "importance": message.importance.value,
-                "direction": message.direction.value
-            }
+            async def _post(batch: List[ExternalAPICall]) -> None:
+                async with semaphore:
+                    await self._post_external_api_calls(batch, timeout)
             
-            # Create API call record
-            api_call = ExternalAPICall(
-                message_id=message.message_id,
-                endpoint_url=endpoint_url,
-                http_method="POST",
-                request_payload=payload,
-                created_at=datetime.utcnow()
-            )
+            await asyncio.gather(*(
+                _post(api_calls[start:start + batch_size])
+                for start in range(0, len(api_calls), batch_size)
+            ))
             
-            try:
-                # Send to external API
-                response = await self.external_api_client.send_mail_data(
-                    endpoint_url=endpoint_url,
-                    mail_data=payload,
-                    timeout=external_config.get("timeout", 30)
+            # Queue API call records
+            for api_call in api_calls:
+                await self.write_queue.enqueue(api_call)
+            
+        except Exception as e:
+            logger.error(
+                "Error in external API call handling",
+                message_ids=[message.message_id for message in messages],
+                error=str(e)
+            )
+    
+    def _build_external_api_call(self, message: MailMessage, endpoint_url: str) -> ExternalAPICall:
+        """Build the external API call record and payload for a mail message."""
+        # Prepare payload; entities already store enum fields as their values
+        payload = {
+            "message_id": message.message_id,
+            "subject": message.subject,
+            "sender_email": message.sender_email,
+            "sender_name": message.sender_name,
+            "body_content": message.body_content,
+            "body_preview": message.body_preview,
+            "received_datetime": message.received_datetime.isoformat(),
+            "importance": message.importance,
+            "direction": message.direction
+        }
+        
+        return ExternalAPICall(
+            message_id=message.message_id,
+            endpoint_url=endpoint_url,
+            http_method="POST",
+            request_payload=payload,
+            created_at=datetime.utcnow()
+        )
+    
+    async def _post_external_api_calls(self, api_calls: List[ExternalAPICall], timeout: int) -> None:
+        """Send API calls' payloads in one request and record the outcome on each."""
+        try:
+            # Send to external API
+            if len(api_calls) == 1:
+                responses = [await self.external_api_client.send_mail_data(
+                    endpoint_url=api_calls[0].endpoint_url,
+                    mail_data=api_calls[0].request_payload,
+                    timeout=timeout
+                )]
+            else:
+                responses = await self.external_api_client.send_mail_data_batch(
+                    endpoint_url=api_calls[0].endpoint_url,
+                    mail_data=[api_call.request_payload for api_call in api_calls],
+                    timeout=timeout
                 )
-                
-                # Update API call record
+            
+            # Update API call records
+            completed_at = datetime.utcnow()
+            for api_call, response in zip(api_calls, responses):
                 api_call.success = True
                 api_call.response_status = response.get("status_code", 200)
                 api_call.response_body = str(response)
-                api_call.completed_at = datetime.utcnow()
-                
-            except Exception as e:
-                # Update API call record with error
+                api_call.completed_at = completed_at
+            
+        except Exception as e:
+            # Update API call records with error
+            completed_at = datetime.utcnow()
+            for api_call in api_calls:
                 api_call.success = False
                 api_call.response_body = str(e)
-                api_call.completed_at = datetime.utcnow()
-                
-                logger.error(
-                    "Failed to send to external API",
-                    message_id=message.message_id,
-                    error=str(e)
-                )
+                api_call.completed_at = completed_at
             
-            # Save API call record
-            await self.external_api_repo.save_api_call(api_call)
-            
-        except Exception as e:
             logger.error(
-                "Error in external API call handling",
-                message_id=message.message_id,
+                "Failed to send to external API",
+                message_ids=[api_call.message_id for api_call in api_calls],
                 error=str(e)
             )
     
-    async def _log_query_history(
+    def _build_query_history(
         self,
         account_id: str,
         query_type: str,
@@ -621,32 +1107,34 @@ class MailUseCases:
         messages_found: int,
         new_messages: int,
         execution_time_ms: Optional[int] = None
-    ) -> None:
-        """Log mail query history."""
+    ) -> MailQueryHistory:
+        """Build a mail query history entry."""
+        return MailQueryHistory(
+            account_id=account_id,
+            query_type=query_type,
+            query_parameters=query_parameters,
+            messages_found=messages_found,
+            new_messages=new_messages,
+            query_datetime=datetime.utcnow(),
+            execution_time_ms=execution_time_ms,
+            success=True
+        )
+    
+    async def _save_query_histories(self, histories: List[MailQueryHistory]) -> None:
+        """Queue mail query history entries for a batched write."""
         try:
-            history = MailQueryHistory(
-                account_id=account_id,
-                query_type=query_type,
-                query_parameters=query_parameters,
-                messages_found=messages_found,
-                new_messages=new_messages,
-                query_datetime=datetime.utcnow(),
-                execution_time_ms=execution_time_ms,
-                success=True
-            )
-            
-            await self.query_history_repo.save_query_history(history)
+            for history in histories:
+                await self.write_queue.enqueue(history)
             
         except Exception as e:
             logger.error(
                 "Failed to log query history",
-                account_id=account_id,
+                account_ids=[history.account_id for history in histories],
                 error=str(e)
             )
     
     def _extract_delta_token(self, response: Dict[str, Any]) -> Optional[str]:
         """Extract delta token from Graph API response."""
         delta_link = response.get("@odata.deltaLink")
-        if delta_link and "$deltatoken=" in delta_link:
-            return delta_link.split("$deltatoken=")[1].split("&")[0]
-        return None
+        match = _DELTATOKEN_RE.search(delta_link) if delta_link else None
+        return match.group(1) if match else None
@@ -1,9 +1,14 @@
 """Port interfaces for the Microsoft Graph API Mail Collection System."""
 
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any, AsyncGenerator, Tuple
+from dataclasses import dataclass
+from typing import (
+    List, Optional, Dict, Any, AsyncContextManager, AsyncGenerator, Awaitable, Callable,
+    Protocol, Set, Tuple, Union
+)
 from datetime import datetime
 
+from core.domain.bloom_filter import BloomFilter
 from core.domain.entities import (
     Account, AuthorizationCodeAccount, DeviceCodeAccount, Token,
     MailMessage, MailAttachment, MailQueryHistory, DeltaLink,
@@ -12,6 +17,52 @@ from core.domain.entities import (
 )
 
 
+@dataclass(frozen=True, slots=True)
+class AccountWithTokenStatus:
+    """Account paired with its token's status and expiry (None when it has no token)."""
+    account: Account
+    token_status: Optional[str] = None
+    token_expires_at: Optional[datetime] = None
+
+
+@dataclass(frozen=True, slots=True)
+class GraphConfig:
+    """Microsoft Graph application configuration."""
+    client_id: str
+    tenant_id: str
+    client_secret: str
+    authority: str
+    redirect_uri: str
+    graph_api_endpoint: str
+    scopes: Tuple[str, ...]
+    token_cache_file: str
+
+
+@dataclass(frozen=True, slots=True)
+class ExternalAPIConfig:
+    """External API (embedding service) configuration; endpoint_url is None when disabled."""
+    endpoint_url: Optional[str] = None
+    timeout: int = 30
+    retry_attempts: int = 3
+    batch_size: int = 1
+
+
+@dataclass(frozen=True, slots=True)
+class MailSummary:
+    """List view of a stored mail, without its body."""
+    id: str
+    message_id: str
+    account_id: str
+    subject: str
+    sender_email: str
+    sender_name: Optional[str]
+    received_datetime: datetime
+    is_read: bool
+    has_attachments: bool
+    importance: str
+    direction: str
+
+
 class AccountRepositoryPort(ABC):
     """Port for account data persistence."""
     
@@ -20,11 +71,37 @@ class AccountRepositoryPort(ABC):
         """Create a new account."""
         pass
     
+    @abstractmethod
+    async def create_account_with_flow(
+        self,
+        account: Account,
+        flow_account: Union[AuthorizationCodeAccount, DeviceCodeAccount],
+        log_entry: Optional[AuthenticationLog] = None
+    ) -> Account:
+        """Create account, flow-specific data and registration log in one transaction."""
+        pass
+    
+    @abstractmethod
+    async def commit_authentication(
+        self,
+        account_id: str,
+        token: Token,
+        log_entry: AuthenticationLog,
+        authenticated_at: Optional[datetime] = None
+    ) -> Token:
+        """Save token, stamp last authentication time and record the auth log in one transaction."""
+        pass
+    
     @abstractmethod
     async def get_account_by_id(self, account_id: str) -> Optional[Account]:
         """Get account by ID."""
         pass
     
+    @abstractmethod
+    async def get_accounts_by_ids(self, account_ids: List[str]) -> Dict[str, Account]:
+        """Get several accounts at once, keyed by account ID."""
+        pass
+    
     @abstractmethod
     async def get_account_by_email(self, email: str) -> Optional[Account]:
         """Get account by email."""
@@ -35,6 +112,11 @@ class AccountRepositoryPort(ABC):
         """Get all accounts."""
         pass
     
+    @abstractmethod
+    async def list_accounts_with_token_status(self) -> List[AccountWithTokenStatus]:
+        """Get all accounts with token status and expiry in a single query."""
+        pass
+    
     @abstractmethod
     async def update_account(self, account: Account) -> Account:
         """Update an existing account."""
@@ -46,8 +128,8 @@ class AccountRepositoryPort(ABC):
         pass
     
     @abstractmethod
-    async def search_accounts(self, query: str) -> List[Account]:
-        """Search accounts by query."""
+    async def search_accounts(self, filters: Dict[str, Any]) -> List[Account]:
+        """Search accounts with filters (email substring, user_id, tenant_id, authentication_flow, status, limit)."""
         pass
 
 
@@ -88,11 +170,26 @@ class TokenRepositoryPort(ABC):
         """Save or update a token."""
         pass
     
+    @abstractmethod
+    async def save_tokens(self, tokens: List[Token]) -> int:
+        """Save or update several tokens at once; returns the number saved."""
+        pass
+    
     @abstractmethod
     async def get_token_by_account_id(self, account_id: str) -> Optional[Token]:
         """Get token by account ID."""
         pass
     
+    @abstractmethod
+    async def get_token_status_by_account_id(self, account_id: str) -> Optional[Tuple[str, datetime]]:
+        """Get a token's (status, expires_at) without loading the full token."""
+        pass
+    
+    @abstractmethod
+    async def get_tokens_by_account_ids(self, account_ids: List[str]) -> Dict[str, Token]:
+        """Get tokens for several accounts at once, keyed by account ID."""
+        pass
+    
     @abstractmethod
     async def get_all_tokens(self) -> List[Token]:
         """Get all tokens."""
@@ -107,6 +204,26 @@ class TokenRepositoryPort(ABC):
     async def get_expired_tokens(self) -> List[Token]:
         """Get all expired tokens."""
         pass
+    
+    @abstractmethod
+    async def get_expiring_tokens(
+        self,
+        expires_before: datetime,
+        after_account_id: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Token]:
+        """Get tokens expiring before a time, ordered by account ID (keyset paged)."""
+        pass
+    
+    @abstractmethod
+    async def get_expiring_tokens_with_accounts(
+        self,
+        expires_before: datetime,
+        after_account_id: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Tuple[Token, Account]]:
+        """Get expiring tokens joined with their accounts, ordered by account ID (keyset paged)."""
+        pass
 
 
 class MailRepositoryPort(ABC):
@@ -117,6 +234,21 @@ class MailRepositoryPort(ABC):
         """Save a mail message."""
         pass
     
+    @abstractmethod
+    async def save_mail_messages(self, messages: List[MailMessage]) -> List[MailMessage]:
+        """Save several mail messages in one batch, returned in input order."""
+        pass
+    
+    @abstractmethod
+    async def upsert_mail_messages(self, messages: List[MailMessage]) -> List[MailMessage]:
+        """Save mail messages, updating any already stored for the same account and Graph message ID.
+        
+        Safe to call without checking for existing messages first, and when
+        another process stores the same messages concurrently. Returns the
+        messages that were inserted rather than updated.
+        """
+        pass
+    
     @abstractmethod
     async def get_mail_by_message_id(self, message_id: str) -> Optional[MailMessage]:
         """Get mail by message ID."""
@@ -126,10 +258,23 @@ class MailRepositoryPort(ABC):
     async def get_mails_by_account_id(
         self, 
         account_id: str,
-        limit: Optional[int] = None,
-        offset: Optional[int] = None
-    ) -> List[MailMessage]:
-        """Get mails by account ID."""
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[MailMessage], Optional[str]]:
+        """Get a page of an account's mails, newest first.
+        
+        Returns the page and the cursor of the next one, or None after the
+        last page; pass that cursor back to continue.
+        """
+        pass
+    
+    @abstractmethod
+    def iter_mails_by_account_id(
+        self,
+        account_id: str,
+        batch_size: int = 500
+    ) -> AsyncGenerator[MailMessage, None]:
+        """Stream an account's mails, newest first, fetching batch_size rows at a time."""
         pass
     
     @abstractmethod
@@ -148,10 +293,68 @@ class MailRepositoryPort(ABC):
         """Search mails with filters."""
         pass
     
+    @abstractmethod
+    def iter_search_mails(
+        self,
+        account_id: Optional[str] = None,
+        sender_email: Optional[str] = None,
+        subject_contains: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        is_read: Optional[bool] = None,
+        importance: Optional[MailImportance] = None,
+        direction: Optional[MailDirection] = None,
+        limit: Optional[int] = None,
+        batch_size: int = 500
+    ) -> AsyncGenerator[MailMessage, None]:
+        """Stream mails matching filters, fetching batch_size rows at a time."""
+        pass
+    
+    @abstractmethod
+    async def search_mail_summaries(
+        self,
+        account_id: Optional[str] = None,
+        sender_email: Optional[str] = None,
+        subject_contains: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        is_read: Optional[bool] = None,
+        importance: Optional[MailImportance] = None,
+        direction: Optional[MailDirection] = None,
+        limit: Optional[int] = None
+    ) -> List[MailSummary]:
+        """Search mails with filters, reading only the list view columns."""
+        pass
+    
+    @abstractmethod
+    async def get_mail_body(self, account_id: str, message_id: str) -> Optional[Tuple[Optional[str], str]]:
+        """Get a stored mail's (body content, content type), or None if it is not stored."""
+        pass
+    
     @abstractmethod
     async def mail_exists(self, message_id: str, account_id: str) -> bool:
         """Check if mail exists."""
         pass
+    
+    @abstractmethod
+    async def get_existence_filter(self, account_id: str, built_after: datetime) -> BloomFilter:
+        """Get a Bloom filter of an account's stored Graph message IDs.
+        
+        A filter built before built_after (UTC) is rebuilt, so IDs stored by
+        any process until then are in it. An ID missing from the filter is
+        not stored; a hit still has to be confirmed against the repository.
+        """
+        pass
+    
+    @abstractmethod
+    async def get_existing_message_ids(self, account_id: str, message_ids: List[str]) -> Set[str]:
+        """Get which of the given Graph message IDs are already stored for an account."""
+        pass
+    
+    @abstractmethod
+    async def get_mails_by_message_ids(self, account_id: str, message_ids: List[str]) -> List[MailMessage]:
+        """Get an account's stored mails for the given Graph message IDs."""
+        pass
 
 
 class MailQueryHistoryRepositoryPort(ABC):
@@ -162,6 +365,11 @@ class MailQueryHistoryRepositoryPort(ABC):
         """Save query history."""
         pass
     
+    @abstractmethod
+    async def save_query_histories(self, histories: List[MailQueryHistory]) -> int:
+        """Save several query history entries, returning how many were written."""
+        pass
+    
     @abstractmethod
     async def get_query_history(
         self,
@@ -206,11 +414,29 @@ class WebhookRepositoryPort(ABC):
         """Get webhook subscription by account ID."""
         pass
     
+    @abstractmethod
+    async def get_webhook_subscriptions_by_ids(
+        self,
+        subscription_ids: List[str]
+    ) -> Dict[str, WebhookSubscription]:
+        """Get webhook subscriptions for several subscription IDs, keyed by subscription ID."""
+        pass
+    
     @abstractmethod
     async def get_expired_subscriptions(self) -> List[WebhookSubscription]:
         """Get expired webhook subscriptions."""
         pass
     
+    @abstractmethod
+    async def get_expiring_subscriptions(
+        self,
+        expires_before: datetime,
+        after_subscription_id: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[WebhookSubscription]:
+        """Get active subscriptions expiring before a time, ordered by subscription ID (keyset paged)."""
+        pass
+    
     @abstractmethod
     async def delete_webhook_subscription(self, subscription_id: str) -> bool:
         """Delete webhook subscription."""
@@ -225,6 +451,11 @@ class AuthenticationLogRepositoryPort(ABC):
         """Save authentication log."""
         pass
     
+    @abstractmethod
+    async def save_auth_logs(self, logs: List[AuthenticationLog]) -> int:
+        """Save several authentication logs in one batch."""
+        pass
+    
     @abstractmethod
     async def get_auth_logs(
         self,
@@ -236,6 +467,18 @@ class AuthenticationLogRepositoryPort(ABC):
     ) -> List[AuthenticationLog]:
         """Get authentication logs with filters."""
         pass
+    
+    @abstractmethod
+    def iter_auth_logs(
+        self,
+        account_id: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        success: Optional[bool] = None,
+        limit: Optional[int] = None
+    ) -> AsyncGenerator[AuthenticationLog, None]:
+        """Stream authentication logs with filters."""
+        pass
 
 
 class ExternalAPIRepositoryPort(ABC):
@@ -247,14 +490,54 @@ class ExternalAPIRepositoryPort(ABC):
         pass
     
     @abstractmethod
-    async def get_failed_api_calls(self, limit: Optional[int] = None) -> List[ExternalAPICall]:
-        """Get failed API calls for retry."""
+    async def save_api_calls(self, api_calls: List[ExternalAPICall]) -> int:
+        """Save several API call records, returning how many were written."""
+        pass
+    
+    @abstractmethod
+    async def get_failed_api_calls(
+        self,
+        limit: Optional[int] = None,
+        max_retries: int = 3
+    ) -> List[ExternalAPICall]:
+        """Get failed API calls with fewer than max_retries attempts."""
+        pass
+
+
+class WriteAheadQueuePort(ABC):
+    """Port for queueing fire-and-forget record writes off the request path."""
+    
+    @abstractmethod
+    async def enqueue(self, record: Any) -> None:
+        """Queue a record for writing without waiting on queued records.
+        
+        Implementations bound their queue and write a record that does not
+        fit straight away rather than block until space frees up.
+        """
+        pass
+    
+    @abstractmethod
+    async def flush(self) -> None:
+        """Wait until every queued record has been written."""
         pass
 
 
 # External service ports
+class UnitOfWorkPort(ABC):
+    """Port for grouping repository calls into one transaction."""
+    
+    @abstractmethod
+    def begin(self) -> AsyncContextManager[None]:
+        """Open a unit of work; repository calls made inside it by the same task share one session and commit together."""
+        pass
+
+
 class GraphAPIClientPort(ABC):
-    """Graph API client port."""
+    """Graph API client port.
+    
+    Implementations must allow concurrent calls for different access tokens
+    without serializing them.
+    """
     
     @abstractmethod
     async def get_user_info(self, access_token: str) -> Dict[str, Any]:
@@ -269,9 +552,10 @@ class GraphAPIClientPort(ABC):
         filters: Optional[Dict[str, Any]] = None,
         select_fields: Optional[List[str]] = None,
         top: Optional[int] = None,
-        skip: Optional[int] = None
+        skip: Optional[int] = None,
+        include_attachments: bool = False
     ) -> Dict[str, Any]:
-        """Query messages from Graph API."""
+        """Query messages from Graph API; include_attachments inlines attachment metadata."""
         pass
     
     @abstractmethod
@@ -293,6 +577,61 @@ class GraphAPIClientPort(ABC):
     ) -> Dict[str, Any]:
         """Get delta messages."""
         pass
+    
+    @abstractmethod
+    async def batch_get_messages(
+        self,
+        access_token: str,
+        requests: List[Dict[str, Any]]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Get message pages for several mailboxes via JSON batching, keyed by request id."""
+        pass
+    
+    @abstractmethod
+    def get_messages_for_many(
+        self,
+        requests: List[Dict[str, Any]],
+        concurrency: Optional[int] = None
+    ) -> AsyncGenerator[Tuple[str, Any], None]:
+        """Get message pages for several mailboxes with separate concurrent requests.
+        
+        Requests are shaped like batch_get_messages ones plus an access_token.
+        Yields (request id, page or the error raised for it) as pages arrive.
+        """
+        pass
+    
+    @abstractmethod
+    async def renew_webhook_subscriptions_bulk(
+        self,
+        access_token: str,
+        subscription_ids: List[str],
+        expiration_datetime: datetime
+    ) -> Dict[str, Dict[str, Any]]:
+        """Renew several webhook subscriptions via JSON batching, keyed by subscription ID."""
+        pass
+    
+    @abstractmethod
+    async def delete_webhook_subscriptions_bulk(
+        self,
+        access_token: str,
+        subscription_ids: List[str]
+    ) -> Dict[str, bool]:
+        """Delete several webhook subscriptions via JSON batching; returns whether each was deleted."""
+        pass
+    
+    @abstractmethod
+    def iter_message_pages(
+        self,
+        access_token: str,
+        next_link: str
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """Stream the message pages that follow an @odata.nextLink."""
+        pass
+    
+    @abstractmethod
+    async def aclose(self) -> None:
+        """Close pooled HTTP connections."""
+        pass
 
 
 class OAuthClientPort(ABC):
@@ -327,10 +666,15 @@ class OAuthClientPort(ABC):
         pass
 
 
-class ExternalAPIClientPort(ABC):
-    """Port for external API client (embedding service)."""
+# The external API client, notification, cache service and config ports are
+# Protocols: implementations satisfy them structurally, without subclassing
+class ExternalAPIClientPort(Protocol):
+    """Port for external API client (embedding service).
+    
+    Implementations must not encode a large batch body in one step on the
+    event loop; other tasks have to keep running while it is serialized.
+    """
     
-    @abstractmethod
     async def send_mail_data(
         self,
         endpoint_url: str,
@@ -338,13 +682,25 @@ class ExternalAPIClientPort(ABC):
         timeout: int = 30
     ) -> Dict[str, Any]:
         """Send mail data to external API."""
-        pass
+        ...
+    
+    async def send_mail_data_batch(
+        self,
+        endpoint_url: str,
+        mail_data: List[Dict[str, Any]],
+        timeout: int = 30
+    ) -> List[Dict[str, Any]]:
+        """Send several mail data items to external API in one request; returns one result per item."""
+        ...
+    
+    async def aclose(self) -> None:
+        """Close pooled HTTP connections."""
+        ...
 
 
-class NotificationServicePort(ABC):
+class NotificationServicePort(Protocol):
     """Port for notification service."""
     
-    @abstractmethod
     async def send_notification(
         self,
         channel: str,
@@ -352,31 +708,35 @@ class NotificationServicePort(ABC):
         webhook_url: Optional[str] = None
     ) -> bool:
         """Send notification to specified channel."""
-        pass
+        ...
 
 
-class CacheServicePort(ABC):
+class CacheServicePort(Protocol):
     """Port for caching service."""
     
-    @abstractmethod
     async def get(self, key: str) -> Optional[str]:
         """Get value from cache."""
-        pass
+        ...
     
-    @abstractmethod
     async def set(self, key: str, value: str, expire: Optional[int] = None) -> bool:
         """Set value in cache."""
-        pass
+        ...
+    
+    async def mget(self, keys: List[str]) -> List[Optional[str]]:
+        """Get several values from cache in one round trip, in key order."""
+        ...
+    
+    async def mset(self, values: Dict[str, str], expire: Optional[int] = None) -> bool:
+        """Set several values in cache in one round trip."""
+        ...
     
-    @abstractmethod
     async def delete(self, key: str) -> bool:
         """Delete value from cache."""
-        pass
+        ...
     
-    @abstractmethod
     async def exists(self, key: str) -> bool:
         """Check if key exists in cache."""
-        pass
+        ...
 
 
 class CachePort(ABC):
@@ -408,11 +768,65 @@ class CachePort(ABC):
         """Set value in cache."""
         pass
     
+    @abstractmethod
+    async def mget(self, keys: List[str], prefix: str = "") -> List[Optional[Any]]:
+        """Get several values from cache in one round trip, in key order."""
+        pass
+    
+    @abstractmethod
+    async def mset(
+        self,
+        values: Dict[str, Any],
+        ttl: Optional[int] = None,
+        prefix: str = ""
+    ) -> bool:
+        """Set several values in cache in one round trip."""
+        pass
+    
+    async def get_many_or_fetch(
+        self,
+        keys: List[str],
+        fetcher: Callable[[List[str]], Awaitable[Dict[str, Any]]],
+        ttl: Optional[int] = None,
+        prefix: str = ""
+    ) -> Dict[str, Any]:
+        """Get values by key, loading all cache misses with one fetcher call.
+        
+        The fetcher gets the missing keys and returns the values it found by
+        key; those are cached before returning. Keys found nowhere are left out.
+        """
+        if not keys:
+            return {}
+        
+        found = {
+            key: value
+            for key, value in zip(keys, await self.mget(keys, prefix))
+            if value is not None
+        }
+        missing = [key for key in keys if key not in found]
+        if missing:
+            fetched = await fetcher(missing)
+            if fetched:
+                await self.mset(fetched, ttl, prefix)
+                found.update(fetched)
+        
+        return found
+    
     @abstractmethod
     async def delete(self, key: str, prefix: str = "") -> bool:
         """Delete value from cache."""
         pass
     
+    @abstractmethod
+    async def delete_many(self, keys: List[str], prefix: str = "") -> int:
+        """Delete several values from cache in one round trip; returns the number removed."""
+        pass
+    
+    @abstractmethod
+    async def scan_and_delete(self, pattern: str) -> int:
+        """Delete every key matching a glob pattern; returns the number removed."""
+        pass
+    
     @abstractmethod
     async def exists(self, key: str, prefix: str = "") -> bool:
         """Check if key exists in cache."""
@@ -424,30 +838,25 @@ class CachePort(ABC):
         pass
 
 
-class ConfigPort(ABC):
+class ConfigPort(Protocol):
     """Port for configuration management."""
     
-    @abstractmethod
     def get_database_url(self) -> str:
         """Get database URL."""
-        pass
+        ...
     
-    @abstractmethod
-    def get_microsoft_graph_config(self) -> Dict[str, Any]:
+    def get_microsoft_graph_config(self) -> GraphConfig:
         """Get Microsoft Graph configuration."""
-        pass
+        ...
     
-    @abstractmethod
     def get_redis_config(self) -> Dict[str, Any]:
         """Get Redis configuration."""
-        pass
+        ...
     
-    @abstractmethod
     def get_api_config(self) -> Dict[str, Any]:
         """Get API configuration."""
-        pass
+        ...
     
-    @abstractmethod
-    def get_external_api_config(self) -> Dict[str, Any]:
+    def get_external_api_config(self) -> ExternalAPIConfig:
         """Get external API configuration."""
-        pass
+        ...
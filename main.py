@@ -1,8 +1,8 @@
 """Main FastAPI application."""
 
-import asyncio
-import logging
+import time
 from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from datetime import datetime
 from typing import Dict, Any
 
@@ -10,17 +10,33 @@ import structlog
 import uvicorn
 from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from fastapi.openapi.docs import get_swagger_ui_html
-from fastapi.openapi.utils import get_openapi
+from fastapi.responses import ORJSONResponse
 from sqlalchemy import text
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from config.settings import get_settings
 from adapters.db.database import get_database_adapter, migrate_database
+from adapters.external.graph_client import close_graph_client_adapter
+from adapters.external.external_api_client import close_external_api_client_adapter
+from adapters.api.dependencies import close_write_queue, get_write_queue
 from adapters.api.auth_routes import router as auth_router
 from adapters.api.mail_routes import router as mail_router
 from adapters.api.schemas import HealthCheckResponse, ErrorResponse
 
+# uvloop and httptools come with uvicorn[standard] (uvloop not on Windows)
+try:
+    import uvloop  # noqa: F401
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+try:
+    import httptools  # noqa: F401
+    HTTPTOOLS_AVAILABLE = True
+except ImportError:
+    HTTPTOOLS_AVAILABLE = False
+
 
 # Configure structured logging
 structlog.configure(
@@ -43,6 +59,9 @@ structlog.configure(
 
 logger = structlog.get_logger()
 
+# Logger bound to the current request's method and path by LoggingMiddleware
+_request_logger: ContextVar[Any] = ContextVar("request_logger", default=logger)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -64,6 +83,9 @@ async def lifespan(app: FastAPI):
             await session.execute(text("SELECT 1"))
         logger.info("Database connection verified")
         
+        # Shared by every request's use cases for the application's lifetime
+        get_write_queue().start()
+        
         yield
         
     except Exception as e:
@@ -72,6 +94,9 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down Microsoft Graph API Mail Collection System")
+    await close_write_queue()
+    await close_graph_client_adapter()
+    await close_external_api_client_adapter()
 
 
 def create_app() -> FastAPI:
@@ -133,6 +158,7 @@ def create_app() -> FastAPI:
         lifespan=lifespan,
         docs_url="/docs" if settings.ENVIRONMENT != "production" else None,
         redoc_url="/redoc" if settings.ENVIRONMENT != "production" else None,
+        default_response_class=ORJSONResponse,
     )
     
     # Add CORS middleware
@@ -153,78 +179,104 @@ def create_app() -> FastAPI:
 
 app = create_app()
 
+# Resolved once at import rather than on every /health/ready probe
+_SETTINGS = get_settings()
+_DB_ADAPTER = get_database_adapter(_SETTINGS)
+
+# ErrorResponse bodies of common HTTP errors, serialized once and copied per
+# response; other status codes are added on first use
+_ERROR_TEMPLATES: Dict[int, Dict[str, Any]] = {
+    code: ErrorResponse(error_code=f"HTTP_{code}", error_message="").model_dump()
+    for code in (400, 401, 403, 404, 409, 422, 429, 500)
+}
+
 
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
     """Handle HTTP exceptions."""
-    logger.warning(
+    _request_logger.get().warning(
         "HTTP exception occurred",
         status_code=exc.status_code,
-        detail=exc.detail,
-        path=request.url.path,
-        method=request.method
+        detail=exc.detail
     )
     
-    return JSONResponse(
-        status_code=exc.status_code,
-        content=ErrorResponse(
+    template = _ERROR_TEMPLATES.get(exc.status_code)
+    if template is None:
+        template = _ERROR_TEMPLATES[exc.status_code] = ErrorResponse(
             error_code=f"HTTP_{exc.status_code}",
-            error_message=exc.detail
-        ).dict()
-    )
+            error_message=""
+        ).model_dump()
+    
+    payload = template.copy()
+    payload["error_message"] = exc.detail
+    return ORJSONResponse(status_code=exc.status_code, content=payload)
 
 
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     """Handle general exceptions."""
-    logger.error(
+    _request_logger.get().error(
         "Unhandled exception occurred",
         error=str(exc),
-        path=request.url.path,
-        method=request.method,
         exc_info=True
     )
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content=ErrorResponse(
             error_code="INTERNAL_SERVER_ERROR",
             error_message="An internal server error occurred"
-        ).dict()
+        ).model_dump()
     )
 
 
-@app.middleware("http")
-async def logging_middleware(request: Request, call_next):
-    """Log all HTTP requests."""
-    start_time = datetime.utcnow()
-    
-    # Log request
-    logger.info(
-        "HTTP request started",
-        method=request.method,
-        path=request.url.path,
-        query_params=str(request.query_params),
-        client_ip=request.client.host if request.client else None,
-        user_agent=request.headers.get("user-agent")
-    )
+class LoggingMiddleware:
+    """Log all HTTP requests, as plain ASGI middleware."""
     
-    # Process request
-    response = await call_next(request)
+    def __init__(self, app: ASGIApp):
+        self.app = app
     
-    # Calculate duration
-    duration = (datetime.utcnow() - start_time).total_seconds()
-    
-    # Log response
-    logger.info(
-        "HTTP request completed",
-        method=request.method,
-        path=request.url.path,
-        status_code=response.status_code,
-        duration_seconds=duration
-    )
-    
-    return response
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        start_ns = time.perf_counter_ns()
+        client = scope.get("client")
+        
+        # Bound once per request and left set: each request runs in its own
+        # task, and the server error handler runs outside this middleware
+        request_logger = logger.bind(method=scope["method"], path=scope["path"])
+        _request_logger.set(request_logger)
+        
+        # Log request
+        request_logger.info(
+            "HTTP request started",
+            query_params=scope.get("query_string", b"").decode("latin-1"),
+            client_ip=client[0] if client else None,
+            user_agent=Headers(scope=scope).get("user-agent")
+        )
+        
+        status_code = None
+        
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        # Process request
+        await self.app(scope, receive, send_wrapper)
+        
+        # Log response
+        request_logger.info(
+            "HTTP request completed",
+            status_code=status_code,
+            duration_ms=(time.perf_counter_ns() - start_ns) / 1_000_000
+        )
+
+
+app.add_middleware(LoggingMiddleware)
 
 
 @app.get("/", include_in_schema=False)
@@ -240,36 +292,45 @@ async def root():
 
 @app.get(
     "/health",
+    summary="Liveness check",
+    description="Check that the process is up, without touching dependencies"
+)
+async def health_check():
+    """Liveness endpoint.
+    
+    Does no I/O so a dependency outage never restarts the process; point
+    the livenessProbe here and the readinessProbe at /health/ready.
+    """
+    return {"status": "ok", "version": "1.0.0"}
+
+
+@app.get(
+    "/health/ready",
     response_model=HealthCheckResponse,
-    summary="Health check",
-    description="Check system health and status"
+    summary="Readiness check",
+    description="Check system health and status of dependencies"
 )
-async def health_check() -> HealthCheckResponse:
-    """Health check endpoint."""
-    settings = get_settings()
+async def readiness_check() -> HealthCheckResponse:
+    """Readiness endpoint; responds 503 when the database is unreachable."""
     services = {}
     
     # Check database
     try:
-        db_adapter = get_database_adapter(settings)
-        async with db_adapter.session_scope() as session:
+        async with _DB_ADAPTER.session_scope() as session:
             await session.execute(text("SELECT 1"))
         services["database"] = "healthy"
     except Exception as e:
         logger.error("Database health check failed", error=str(e))
-        services["database"] = "unhealthy"
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database unavailable"
+        )
     
     # Check external services (could add Graph API ping here)
     services["graph_api"] = "not_checked"
     
-    # Determine overall status
-    overall_status = "healthy" if all(
-        status in ["healthy", "not_checked"] 
-        for status in services.values()
-    ) else "unhealthy"
-    
     return HealthCheckResponse(
-        status=overall_status,
+        status="healthy",
         timestamp=datetime.utcnow(),
         version="1.0.0",
         database=services["database"],
@@ -277,30 +338,27 @@ async def health_check() -> HealthCheckResponse:
     )
 
 
-@app.get("/openapi.json", include_in_schema=False)
-async def get_openapi_schema():
-    """Get OpenAPI schema."""
-    return get_openapi(
-        title=app.title,
-        version=app.version,
-        description=app.description,
-        routes=app.routes,
-    )
-
-
 if __name__ == "__main__":
     settings = get_settings()
+    production = settings.ENVIRONMENT == "production"
     
-    # Configure uvicorn logging
-    log_config = uvicorn.config.LOGGING_CONFIG
-    log_config["formatters"]["default"]["fmt"] = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    log_config["formatters"]["access"]["fmt"] = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    # LoggingMiddleware already logs every request; uvicorn's access log
+    # (and its formatting) is kept outside production only
+    run_options = {}
+    if not production:
+        log_config = uvicorn.config.LOGGING_CONFIG
+        log_config["formatters"]["default"]["fmt"] = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+        log_config["formatters"]["access"]["fmt"] = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+        run_options["log_config"] = log_config
     
     uvicorn.run(
         "main:app",
         host=settings.HOST,
         port=settings.PORT,
         reload=settings.ENVIRONMENT == "development",
-        log_config=log_config,
-        access_log=True
+        access_log=not production,
+        proxy_headers=settings.TRUST_PROXY_HEADERS,
+        loop="uvloop" if UVLOOP_AVAILABLE else "asyncio",
+        http="httptools" if HTTPTOOLS_AVAILABLE else "h11",
+        **run_options
     )
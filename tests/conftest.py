@@ -1,14 +1,15 @@
 """Test configuration and fixtures."""
 
 import asyncio
+import sqlite3
 import pytest
-import pytest_asyncio
 from datetime import datetime
 from typing import AsyncGenerator, Generator
 from unittest.mock import AsyncMock, MagicMock
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
 from config.settings import Settings
 from adapters.db.database import DatabaseAdapter
@@ -23,11 +24,16 @@ from core.domain.entities import (
     AccountStatus, TokenStatus, MailDirection, MailImportance
 )
 
+# In-memory database shared by the whole test session; shared cache lets it
+# outlive a pooled connection that gets invalidated mid-test
+TEST_DATABASE_NAME = "file:graphapi_test?mode=memory&cache=shared"
+TEST_DATABASE_URL = f"sqlite+aiosqlite:///{TEST_DATABASE_NAME}&uri=true"
+
 
 @pytest.fixture(scope="session")
 def event_loop():
-    """Create an instance of the default event loop for the test session."""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
+    """Create one event loop shared by the whole test session."""
+    loop = asyncio.new_event_loop()
     yield loop
     loop.close()
 
@@ -37,7 +43,7 @@ def test_settings() -> Settings:
     """Test settings."""
     return Settings(
         ENVIRONMENT="testing",
-        DATABASE_URL="sqlite+aiosqlite:///:memory:",
+        DATABASE_URL=TEST_DATABASE_URL,
         DATABASE_ECHO=False,
         CLIENT_ID="test-client",
         TENANT_ID="test-tenant",
@@ -54,39 +60,52 @@ def test_settings() -> Settings:
     )
 
 
-@pytest_asyncio.fixture
-async def db_adapter(test_settings: Settings) -> AsyncGenerator[DatabaseAdapter, None]:
-    """Database adapter for testing."""
-    # Create in-memory SQLite database
+@pytest.fixture(scope="session")
+async def db_engine() -> AsyncGenerator[AsyncEngine, None]:
+    """Database engine for the test session, with tables created once."""
+    # Holds the in-memory database open for the whole session
+    keeper = sqlite3.connect(TEST_DATABASE_NAME, uri=True)
+    
     engine = create_async_engine(
-        test_settings.DATABASE_URL,
-        echo=test_settings.DATABASE_ECHO,
-        future=True
+        TEST_DATABASE_URL,
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False}
     )
     
-    # Create all tables
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     
+    yield engine
+    
+    await engine.dispose()
+    keeper.close()
+
+
+@pytest.fixture
+async def db_adapter(
+    db_engine: AsyncEngine,
+    test_settings: Settings
+) -> AsyncGenerator[DatabaseAdapter, None]:
+    """Database adapter for testing, with every table emptied afterwards."""
     # Create session factory
     async_session_factory = sessionmaker(
-        engine, class_=AsyncSession, expire_on_commit=False
+        db_engine, class_=AsyncSession, expire_on_commit=False
     )
     
     adapter = DatabaseAdapter(test_settings)
-    adapter._async_engine = engine
+    adapter._async_engine = db_engine
     adapter._async_session_factory = async_session_factory
     adapter._initialized = True
     
     yield adapter
     
     # Cleanup
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
-    await engine.dispose()
+    async with db_engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            await conn.execute(table.delete())
 
 
-@pytest_asyncio.fixture
+@pytest.fixture
 async def repo_adapter(db_adapter: DatabaseAdapter) -> DatabaseRepositoryAdapter:
     """Repository adapter for testing."""
     return DatabaseRepositoryAdapter(db_adapter)
@@ -145,14 +164,14 @@ def mock_oauth_client() -> AsyncMock:
     return mock
 
 
-@pytest_asyncio.fixture
+@pytest.fixture
 async def auth_usecases(
     repo_adapter: DatabaseRepositoryAdapter,
     mock_oauth_client: AsyncMock,
     test_settings: Settings
-) -> AuthenticationUseCases:
+) -> AsyncGenerator[AuthenticationUseCases, None]:
     """Authentication use cases for testing."""
-    return AuthenticationUseCases(
+    usecases = AuthenticationUseCases(
         account_repo=repo_adapter,
         auth_flow_repo=repo_adapter,
         token_repo=repo_adapter,
@@ -160,19 +179,23 @@ async def auth_usecases(
         oauth_client=mock_oauth_client,
         config=test_settings
     )
+    
+    yield usecases
+    
+    await usecases.aclose()
 
 
-@pytest_asyncio.fixture
+@pytest.fixture
 async def mail_usecases(
     repo_adapter: DatabaseRepositoryAdapter,
     mock_graph_client: AsyncMock,
     test_settings: Settings
-) -> MailUseCases:
+) -> AsyncGenerator[MailUseCases, None]:
     """Mail use cases for testing."""
     mock_external_api_client = AsyncMock()
     mock_external_api_client.send_mail_data.return_value = {"status": "success"}
     
-    return MailUseCases(
+    usecases = MailUseCases(
         account_repo=repo_adapter,
         token_repo=repo_adapter,
         mail_repo=repo_adapter,
@@ -184,6 +207,10 @@ async def mail_usecases(
         external_api_client=mock_external_api_client,
         config=test_settings
     )
+    
+    yield usecases
+    
+    await usecases.aclose()
 
 
 @pytest.fixture
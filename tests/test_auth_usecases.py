@@ -1,12 +1,12 @@
 """Tests for authentication use cases."""
 
 import pytest
-from datetime import datetime
+from datetime import datetime, timedelta, UTC
 from unittest.mock import AsyncMock
 
 from core.usecases.auth_usecases import AuthenticationUseCases
-from core.domain.entities import AuthenticationFlow, AccountStatus
-from adapters.db.repositories import DatabaseRepositoryAdapter
+from core.domain.entities import AuthenticationFlow, AccountStatus, Token
+from adapters.db.repository_adapter import DatabaseRepositoryAdapter
 
 
 @pytest.mark.asyncio
@@ -245,3 +245,37 @@ async def test_get_authentication_logs(auth_usecases: AuthenticationUseCases):
     # Check that registration was logged
     registration_logs = [log for log in logs_result if log.event_type == "registration"]
     assert len(registration_logs) > 0
+
+
+@pytest.mark.asyncio
+async def test_iter_expiring_tokens(auth_usecases: AuthenticationUseCases):
+    """Test streaming expiring tokens in batches."""
+    now = datetime.now(UTC)
+    account_ids = []
+    for i in range(4):
+        result = await auth_usecases.register_account(
+            user_id=f"test-user-id-{i}",
+            email=f"test{i}@example.com",
+            authentication_flow=AuthenticationFlow.DEVICE_CODE,
+            scopes=["offline_access", "User.Read", "Mail.Read"]
+        )
+        account_ids.append(result["account_id"])
+    
+    # Three tokens expire soon, one is valid for another day
+    for i, account_id in enumerate(account_ids):
+        expires_at = now + (timedelta(days=1) if i == 0 else timedelta(minutes=1))
+        await auth_usecases.token_repo.save_token(Token(
+            account_id=account_id,
+            access_token=f"access-{i}",
+            refresh_token=f"refresh-{i}",
+            expires_at=expires_at,
+            created_at=now
+        ))
+    
+    batches = [
+        batch async for batch in auth_usecases.iter_expiring_tokens(minutes_before=5, batch_size=2)
+    ]
+    
+    assert [len(batch) for batch in batches] == [2, 1]
+    streamed_ids = [token.account_id for batch in batches for token in batch]
+    assert sorted(streamed_ids) == sorted(account_ids[1:])
@@ -0,0 +1,106 @@
+"""Tests for the background task scheduler."""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+
+from core.services import background_tasks
+from core.services.background_tasks import BackgroundTaskService, TaskStatus
+
+
+def _service(**task_funcs) -> BackgroundTaskService:
+    """Service with mocked use cases, its periodic tasks replaced by task_funcs."""
+    service = BackgroundTaskService(
+        mail_usecases=AsyncMock(),
+        auth_usecases=AsyncMock()
+    )
+    for task_type in service.intervals:
+        setattr(service, f"_{task_type}_task", task_funcs.get(task_type, AsyncMock()))
+    return service
+
+
+def _task_info(service: BackgroundTaskService, task_type: str):
+    """Latest task info recorded for a task type."""
+    return [info for info in service.task_info.values() if info.task_type == task_type][-1]
+
+
+@pytest.mark.asyncio
+async def test_scheduler_runs_each_task_on_its_interval():
+    """Test that one scheduler runs every task, each at its own interval."""
+    fast = AsyncMock()
+    slow = AsyncMock()
+    service = _service(token_refresh=fast, cleanup=slow)
+    service.intervals.update({
+        "token_refresh": 0.02,
+        "webhook_renewal": 60,
+        "failed_api_retry": 60,
+        "cleanup": 0.2,
+        "health_check": 60
+    })
+    
+    await service.start()
+    assert len(service.jobs) == 5
+    await asyncio.sleep(0.3)
+    await service.stop()
+    
+    # The first run of each task is offset within its interval
+    assert fast.await_count >= 5
+    assert 1 <= slow.await_count < fast.await_count
+    assert _task_info(service, "token_refresh").status == TaskStatus.CANCELLED
+    assert not service.jobs
+
+
+@pytest.mark.asyncio
+async def test_scheduler_keeps_running_after_task_error():
+    """Test that a failing task is recorded and rescheduled."""
+    failing = AsyncMock(side_effect=RuntimeError("boom"))
+    service = _service(token_refresh=failing)
+    service.intervals["token_refresh"] = 0.02
+    
+    await service.start()
+    await asyncio.sleep(0.15)
+    await service.stop()
+    
+    assert failing.await_count >= 2
+    assert _task_info(service, "token_refresh").error == "boom"
+
+
+@pytest.mark.asyncio
+async def test_stop_waits_for_running_task():
+    """Test that stop lets a running task finish within the grace period."""
+    started = asyncio.Event()
+    finished = []
+    
+    async def task():
+        started.set()
+        await asyncio.sleep(0.05)
+        finished.append(True)
+    
+    service = _service(token_refresh=task)
+    service.intervals["token_refresh"] = 0.01
+    
+    await service.start()
+    await started.wait()
+    await service.stop()
+    
+    assert finished == [True]
+
+
+@pytest.mark.asyncio
+async def test_stop_cancels_task_after_grace_period(monkeypatch):
+    """Test that stop cancels a task still running after the grace period."""
+    monkeypatch.setattr(background_tasks, "SHUTDOWN_GRACE_PERIOD", 0.05)
+    started = asyncio.Event()
+    
+    async def task():
+        started.set()
+        await asyncio.sleep(60)
+    
+    service = _service(token_refresh=task)
+    service.intervals["token_refresh"] = 0.01
+    
+    await service.start()
+    await started.wait()
+    await asyncio.wait_for(service.stop(), timeout=1)
+    
+    assert _task_info(service, "token_refresh").status == TaskStatus.CANCELLED
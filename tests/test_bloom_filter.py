@@ -0,0 +1,41 @@
+"""Tests for the Bloom filter."""
+
+from core.domain.bloom_filter import BloomFilter
+
+
+def test_added_items_are_members():
+    """Test that every added item is reported as a member."""
+    bloom_filter = BloomFilter(capacity=1000)
+    items = [f"message-{i}" for i in range(1000)]
+    bloom_filter.update(items)
+    
+    assert all(item in bloom_filter for item in items)
+    assert bloom_filter.count == 1000
+
+
+def test_false_positive_rate_within_bound():
+    """Test that absent items are rarely reported at the configured error rate."""
+    bloom_filter = BloomFilter(capacity=1000, error_rate=0.01)
+    bloom_filter.update(f"message-{i}" for i in range(1000))
+    
+    false_positives = sum(f"other-{i}" in bloom_filter for i in range(10_000))
+    
+    assert false_positives < 300
+
+
+def test_empty_filter_has_no_members():
+    """Test that an empty filter reports nothing, even with zero capacity."""
+    bloom_filter = BloomFilter(capacity=0)
+    
+    assert "message" not in bloom_filter
+    assert not bloom_filter.is_full
+
+
+def test_is_full_past_capacity():
+    """Test that a filter is full once more items than its capacity are added."""
+    bloom_filter = BloomFilter(capacity=2)
+    bloom_filter.update(["a", "b"])
+    assert not bloom_filter.is_full
+    
+    bloom_filter.add("c")
+    assert bloom_filter.is_full
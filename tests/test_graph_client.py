@@ -0,0 +1,121 @@
+"""Tests for the Graph API client adapter."""
+
+import asyncio
+import json
+import pytest
+from collections import Counter
+from typing import Any, Callable, Dict, List
+
+import httpx
+
+from config.settings import Settings
+from adapters.external.graph_client import (
+    GraphAPIClientAdapter, GRAPH_BATCH_MAX_PER_MAILBOX, GRAPH_BATCH_MAX_REQUESTS
+)
+
+
+def graph_client(test_settings: Settings, handler: Callable[[httpx.Request], httpx.Response]) -> GraphAPIClientAdapter:
+    """Graph client whose HTTP requests are answered by handler."""
+    client = GraphAPIClientAdapter(test_settings)
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+@pytest.mark.asyncio
+async def test_batch_get_messages_splits_within_graph_limits(test_settings: Settings):
+    """Test that subrequests are spread over $batch calls within Graph's limits."""
+    batches: List[List[Dict[str, Any]]] = []
+    
+    def handler(request: httpx.Request) -> httpx.Response:
+        subrequests = json.loads(request.content)["requests"]
+        batches.append(subrequests)
+        return httpx.Response(200, json={"responses": [
+            {"id": subrequest["id"], "status": 200, "body": {"value": [{"id": subrequest["id"]}]}}
+            for subrequest in subrequests
+        ]})
+    
+    client = graph_client(test_settings, handler)
+    # Five requests against one mailbox, plus one each for twenty others
+    requests = [{"id": f"shared-{i}", "user_id": "shared"} for i in range(5)]
+    requests += [{"id": f"user-{i}", "user_id": f"user-{i}"} for i in range(20)]
+    
+    responses = await client.batch_get_messages("token", requests)
+    await client.aclose()
+    
+    assert {request_id: response["body"]["value"][0]["id"] for request_id, response in responses.items()} == {
+        request["id"]: request["id"] for request in requests
+    }
+    assert sorted(len(batch) for batch in batches) == [5, 20]
+    for batch in batches:
+        assert len(batch) <= GRAPH_BATCH_MAX_REQUESTS
+        mailboxes = Counter(subrequest["url"].split("/")[2] for subrequest in batch)
+        assert max(mailboxes.values()) <= GRAPH_BATCH_MAX_PER_MAILBOX
+
+
+@pytest.mark.asyncio
+async def test_batch_get_messages_returns_failed_subresponses(test_settings: Settings):
+    """Test that a failed subrequest is returned with its status, not raised."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"responses": [
+            {"id": "1", "status": 200, "body": {"value": []}},
+            {"id": "2", "status": 429, "body": {"error": {"code": "TooManyRequests"}}}
+        ]})
+    
+    client = graph_client(test_settings, handler)
+    responses = await client.batch_get_messages(
+        "token", [{"id": "1", "user_id": "u1"}, {"id": "2", "user_id": "u2"}]
+    )
+    await client.aclose()
+    
+    assert responses["1"] == {"status": 200, "body": {"value": []}}
+    assert responses["2"]["status"] == 429
+
+
+@pytest.mark.asyncio
+async def test_get_messages_for_many_yields_pages_as_they_arrive(test_settings: Settings):
+    """Test that every request's page is yielded, with errors in place of failed pages."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        user_id = request.url.path.split("/")[3]
+        if user_id == "broken":
+            raise httpx.ConnectError("connection refused", request=request)
+        assert request.headers["Authorization"] == f"Bearer token-{user_id}"
+        return httpx.Response(200, json={"value": [{"id": f"{user_id}-message"}]})
+    
+    client = graph_client(test_settings, handler)
+    requests = [
+        {"id": f"request-{user_id}", "user_id": user_id, "access_token": f"token-{user_id}"}
+        for user_id in ("u1", "u2", "broken")
+    ]
+    
+    pages = {request_id: page async for request_id, page in client.get_messages_for_many(requests)}
+    await client.aclose()
+    
+    assert pages["request-u1"] == {"value": [{"id": "u1-message"}]}
+    assert pages["request-u2"] == {"value": [{"id": "u2-message"}]}
+    assert isinstance(pages["request-broken"], httpx.ConnectError)
+
+
+@pytest.mark.asyncio
+async def test_get_messages_for_many_bounds_concurrency(test_settings: Settings):
+    """Test that no more than concurrency requests are in flight at once."""
+    in_flight = 0
+    peak = 0
+    
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, json={"value": []})
+    
+    client = graph_client(test_settings, handler)
+    requests = [
+        {"id": str(i), "user_id": f"u{i}", "access_token": "token"} for i in range(10)
+    ]
+    
+    pages = [page async for _, page in client.get_messages_for_many(requests, concurrency=3)]
+    await client.aclose()
+    
+    assert len(pages) == 10
+    assert peak == 3
@@ -0,0 +1,146 @@
+"""Tests for the mail repository."""
+
+import pytest
+from datetime import datetime, timedelta
+from typing import List
+from unittest.mock import MagicMock
+
+from sqlalchemy import create_engine, inspect, select, text
+from sqlalchemy.orm import Session
+
+from adapters.db.database import MAIL_MESSAGE_KEY_INDEX, _migrate_mail_message_key_index
+from adapters.db.models import Base, MailMessageModel
+from adapters.db.repositories import MailRepository
+from adapters.db.repository_adapter import DatabaseRepositoryAdapter
+from core.domain.entities import MailDirection, MailMessage
+
+
+ACCOUNT_ID = "00000000-0000-0000-0000-000000000001"
+
+
+def mail_message(message_id: str, is_read: bool = False, **fields) -> MailMessage:
+    """Received mail message entity for ACCOUNT_ID."""
+    return MailMessage(
+        message_id=message_id,
+        account_id=ACCOUNT_ID,
+        subject=f"Subject {message_id}",
+        sender_email="sender@example.com",
+        received_datetime=datetime(2024, 1, 1, 12),
+        direction=MailDirection.RECEIVED,
+        is_read=is_read,
+        **fields
+    )
+
+
+def message_ids(messages: List[MailMessage]) -> List[str]:
+    return [message.message_id for message in messages]
+
+
+@pytest.mark.asyncio
+async def test_upsert_returns_inserted_messages(repo_adapter: DatabaseRepositoryAdapter):
+    """Test that only messages not stored before are returned as inserted."""
+    first = await repo_adapter.upsert_mail_messages([
+        mail_message("m1"), mail_message("m2"), mail_message("m2")
+    ])
+    second = await repo_adapter.upsert_mail_messages([
+        mail_message("m2", is_read=True), mail_message("m3")
+    ])
+    
+    assert message_ids(first) == ["m1", "m2"]
+    assert message_ids(second) == ["m3"]
+    
+    stored = {
+        message.message_id: message
+        for message in await repo_adapter.get_mails_by_message_ids(ACCOUNT_ID, ["m1", "m2", "m3"])
+    }
+    assert sorted(stored) == ["m1", "m2", "m3"]
+    assert stored["m2"].is_read and not stored["m1"].is_read
+
+
+@pytest.mark.asyncio
+async def test_upsert_keeps_created_at_of_stored_messages(repo_adapter: DatabaseRepositoryAdapter):
+    """Test that re-upserting a stored message, created_at and all, is an update."""
+    created_at = datetime(2024, 1, 1)
+    await repo_adapter.upsert_mail_messages([mail_message("m1", created_at=created_at)])
+    [stored] = await repo_adapter.get_mails_by_message_ids(ACCOUNT_ID, ["m1"])
+    
+    inserted = await repo_adapter.upsert_mail_messages([
+        stored.model_copy(update={"is_read": True}),
+        mail_message("m2", created_at=created_at + timedelta(days=1))
+    ])
+    [updated] = await repo_adapter.get_mails_by_message_ids(ACCOUNT_ID, ["m1"])
+    
+    assert message_ids(inserted) == ["m2"]
+    assert updated.is_read and updated.created_at == created_at
+
+
+@pytest.mark.asyncio
+async def test_upsert_rejects_unsupported_dialect():
+    """Test that databases without ON CONFLICT support raise a clear error."""
+    session = MagicMock()
+    session.bind.dialect.name = "mssql"
+    
+    with pytest.raises(NotImplementedError, match="mssql"):
+        await MailRepository(session).upsert_mail_messages([mail_message("m1")])
+
+
+def test_migration_removes_duplicates_and_makes_key_index_unique():
+    """Test that a database created with a non-unique key index is migrated."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    
+    # The key index as created before it was unique, with duplicates stored
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP INDEX {MAIL_MESSAGE_KEY_INDEX}"))
+        conn.execute(text(
+            f"CREATE INDEX {MAIL_MESSAGE_KEY_INDEX} ON mail_messages (account_id, message_id)"
+        ))
+    with Session(engine) as session:
+        session.add_all([
+            MailMessageModel(
+                message_id=message_id, account_id=ACCOUNT_ID, subject=subject,
+                recipients=[], received_datetime=datetime(2024, 1, 1),
+                direction=MailDirection.RECEIVED
+            )
+            for message_id, subject in [("m1", "first"), ("m1", "second"), ("m2", "only")]
+        ])
+        session.commit()
+    
+    with engine.begin() as conn:
+        _migrate_mail_message_key_index(conn)
+        # Migrating again is a no-op
+        _migrate_mail_message_key_index(conn)
+    
+    indexes = {index["name"]: index for index in inspect(engine).get_indexes("mail_messages")}
+    assert indexes[MAIL_MESSAGE_KEY_INDEX]["unique"]
+    with Session(engine) as session:
+        subjects = session.execute(
+            select(MailMessageModel.message_id, MailMessageModel.subject).order_by(MailMessageModel.id)
+        ).all()
+        assert subjects == [("m1", "first"), ("m2", "only")]
+
+
+@pytest.mark.asyncio
+async def test_keyset_pages_cover_mails_newest_first(repo_adapter: DatabaseRepositoryAdapter):
+    """Test that following cursors lists every mail once, ties broken by row ID."""
+    received = [datetime(2024, 1, day) for day in (3, 1, 2, 2, 5)]
+    await repo_adapter.upsert_mail_messages([
+        mail_message(f"m{i}").model_copy(update={"received_datetime": received_datetime})
+        for i, received_datetime in enumerate(received)
+    ])
+    
+    pages, cursor = [], None
+    while True:
+        page, cursor = await repo_adapter.get_mails_by_account_id(ACCOUNT_ID, limit=2, cursor=cursor)
+        pages.append(message_ids(page))
+        if cursor is None:
+            break
+    
+    assert pages == [["m4", "m0"], ["m3", "m2"], ["m1"]]
+
+
+@pytest.mark.asyncio
+async def test_keyset_page_rejects_invalid_cursor(repo_adapter: DatabaseRepositoryAdapter):
+    """Test that a cursor not handed out by the repository is rejected."""
+    with pytest.raises(ValueError):
+        await repo_adapter.get_mails_by_account_id(ACCOUNT_ID, cursor="not-a-cursor")
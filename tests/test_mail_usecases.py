@@ -0,0 +1,241 @@
+"""Tests for mail use cases."""
+
+import asyncio
+import pytest
+from datetime import datetime, timedelta, UTC
+from typing import Any, Dict, List
+from unittest.mock import AsyncMock
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from adapters.db.database import DatabaseAdapter
+from adapters.db.repository_adapter import DatabaseRepositoryAdapter
+from core.exceptions import ExternalAPIErrorException
+from core.usecases.auth_usecases import AuthenticationUseCases
+from core.usecases.mail_usecases import MailUseCases
+from core.domain.entities import AuthenticationFlow, MailDirection, Token
+
+
+@pytest.fixture(autouse=True)
+def fan_out_to_get_messages(mock_graph_client: AsyncMock) -> None:
+    """Serve get_messages_for_many from the mocked get_messages."""
+    async def get_messages_for_many(requests, concurrency=None):
+        for request in requests:
+            kwargs = {key: value for key, value in request.items() if key != "id"}
+            try:
+                page = await mock_graph_client.get_messages(**kwargs)
+            except Exception as e:
+                page = e
+            yield request["id"], page
+    
+    mock_graph_client.get_messages_for_many = get_messages_for_many
+
+
+@pytest.fixture(autouse=True)
+def valid_tokens(monkeypatch) -> None:
+    """Treat every token as valid.
+    
+    SQLite returns naive expiry times, which Token.is_expired cannot compare
+    with its timezone-aware now.
+    """
+    monkeypatch.setattr(Token, "is_expired", property(lambda self: False))
+
+
+def graph_message(message_id: str) -> Dict[str, Any]:
+    """Graph API message payload."""
+    return {
+        "id": message_id,
+        "internetMessageId": f"<{message_id}@example.com>",
+        "subject": f"Subject {message_id}",
+        "from": {"emailAddress": {"address": "sender@example.com", "name": "Sender"}},
+        "toRecipients": [{"emailAddress": {"address": "recipient@example.com"}}],
+        "bodyPreview": "Preview",
+        "body": {"contentType": "html", "content": "<p>Body</p>"},
+        "importance": "normal",
+        "isRead": False,
+        "hasAttachments": False,
+        "receivedDateTime": "2024-01-01T12:00:00Z",
+        "sentDateTime": "2024-01-01T12:00:00Z",
+        "categories": []
+    }
+
+
+async def register_accounts(
+    auth_usecases: AuthenticationUseCases,
+    count: int,
+    shared_token: bool = False
+) -> List[str]:
+    """Register accounts with valid tokens; returns their IDs in order."""
+    now = datetime.now(UTC)
+    account_ids = []
+    for i in range(count):
+        result = await auth_usecases.register_account(
+            user_id=f"user-{i}",
+            email=f"user{i}@example.com",
+            authentication_flow=AuthenticationFlow.DEVICE_CODE,
+            scopes=["offline_access", "User.Read", "Mail.Read"]
+        )
+        account_id = result["account_id"]
+        await auth_usecases.token_repo.save_token(Token(
+            account_id=account_id,
+            access_token="shared-token" if shared_token else f"token-{i}",
+            refresh_token=f"refresh-{i}",
+            expires_at=now + timedelta(hours=1),
+            created_at=now
+        ))
+        account_ids.append(account_id)
+    return account_ids
+
+
+@pytest.mark.asyncio
+async def test_query_mails_stores_new_messages(
+    auth_usecases: AuthenticationUseCases,
+    mail_usecases: MailUseCases,
+    mock_graph_client: AsyncMock
+):
+    """Test that a repeated query finds the stored messages instead of new ones."""
+    [account_id] = await register_accounts(auth_usecases, 1)
+    mock_graph_client.get_messages.return_value = {
+        "value": [graph_message(f"m{i}") for i in range(3)]
+    }
+    
+    first = await mail_usecases.query_mails(account_id=account_id, direction=MailDirection.RECEIVED)
+    second = await mail_usecases.query_mails(account_id=account_id, direction=MailDirection.RECEIVED)
+    
+    assert (first["new_messages"], first["total_messages"]) == (3, 3)
+    assert (second["new_messages"], second["total_messages"]) == (0, 3)
+    assert [message["message_id"] for message in second["messages"]] == ["m0", "m1", "m2"]
+
+
+@pytest.mark.asyncio
+async def test_query_mails_raises_account_failure(
+    auth_usecases: AuthenticationUseCases,
+    mail_usecases: MailUseCases,
+    mock_graph_client: AsyncMock
+):
+    """Test that a failing account fails a query over all accounts."""
+    await register_accounts(auth_usecases, 2)
+    
+    async def get_messages(access_token, **kwargs):
+        if access_token == "token-1":
+            raise RuntimeError("Graph unavailable")
+        return {"value": [graph_message("m0")]}
+    
+    mock_graph_client.get_messages.side_effect = get_messages
+    
+    with pytest.raises(RuntimeError, match="Graph unavailable"):
+        await mail_usecases.query_mails(direction=MailDirection.RECEIVED)
+
+
+@pytest.mark.asyncio
+async def test_sync_delta_mails_raises_account_failure(
+    auth_usecases: AuthenticationUseCases,
+    mail_usecases: MailUseCases,
+    mock_graph_client: AsyncMock
+):
+    """Test that a failing account fails a delta sync over all accounts."""
+    await register_accounts(auth_usecases, 2)
+    
+    async def get_delta_messages(access_token, **kwargs):
+        if access_token == "token-0":
+            raise RuntimeError("Graph unavailable")
+        return {"value": []}
+    
+    mock_graph_client.get_delta_messages.side_effect = get_delta_messages
+    
+    with pytest.raises(RuntimeError, match="Graph unavailable"):
+        await mail_usecases.sync_delta_mails()
+
+
+@pytest.mark.asyncio
+async def test_accounts_stored_on_own_sessions(
+    auth_usecases: AuthenticationUseCases,
+    mail_usecases: MailUseCases,
+    mock_graph_client: AsyncMock,
+    monkeypatch
+):
+    """Test that concurrently processed accounts never share a database session."""
+    await register_accounts(auth_usecases, 3)
+    mock_graph_client.get_messages.return_value = {"value": [graph_message("m0")]}
+    
+    # Tasks that ran statements on each session
+    session_tasks: Dict[AsyncSession, set] = {}
+    execute = AsyncSession.execute
+    
+    async def tracking_execute(session, *args, **kwargs):
+        session_tasks.setdefault(session, set()).add(asyncio.current_task())
+        return await execute(session, *args, **kwargs)
+    
+    monkeypatch.setattr(AsyncSession, "execute", tracking_execute)
+    
+    # Even inside the caller's unit of work
+    async with mail_usecases.mail_repo.begin():
+        result = await mail_usecases.query_mails(direction=MailDirection.RECEIVED)
+    
+    assert result["new_messages"] == 3
+    assert session_tasks
+    assert all(len(tasks) == 1 for tasks in session_tasks.values())
+
+
+@pytest.mark.asyncio
+async def test_query_mails_sees_messages_stored_by_other_processes(
+    auth_usecases: AuthenticationUseCases,
+    mail_usecases: MailUseCases,
+    mock_graph_client: AsyncMock,
+    db_adapter: DatabaseAdapter
+):
+    """Test that a cached existence filter does not hide another process's messages."""
+    [account_id] = await register_accounts(auth_usecases, 1)
+    mock_graph_client.get_messages.return_value = {"value": [graph_message("m0")]}
+    await mail_usecases.query_mails(account_id=account_id, direction=MailDirection.RECEIVED)
+    
+    # Stored through a repository adapter of its own, as another process would
+    other_process = DatabaseRepositoryAdapter(db_adapter)
+    await other_process.save_mail_messages([mail_usecases._create_mail_message(
+        graph_message("m1"), account_id, MailDirection.RECEIVED, datetime.utcnow()
+    )])
+    
+    mock_graph_client.get_messages.return_value = {
+        "value": [graph_message("m0"), graph_message("m1")]
+    }
+    result = await mail_usecases.query_mails(account_id=account_id, direction=MailDirection.RECEIVED)
+    
+    assert (result["new_messages"], result["total_messages"]) == (0, 2)
+
+
+@pytest.mark.asyncio
+async def test_query_mails_batches_accounts_sharing_a_token(
+    auth_usecases: AuthenticationUseCases,
+    mail_usecases: MailUseCases,
+    mock_graph_client: AsyncMock
+):
+    """Test that accounts sharing an access token are fetched in one batch call."""
+    account_ids = await register_accounts(auth_usecases, 3, shared_token=True)
+    mock_graph_client.batch_get_messages.return_value = {
+        account_id: {"status": 200, "body": {"value": [graph_message(f"m{i}")]}}
+        for i, account_id in enumerate(account_ids)
+    }
+    
+    result = await mail_usecases.query_mails(direction=MailDirection.RECEIVED)
+    
+    assert result["new_messages"] == 3
+    mock_graph_client.batch_get_messages.assert_awaited_once()
+    assert mock_graph_client.batch_get_messages.await_args.args[0] == "shared-token"
+    mock_graph_client.get_messages.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_query_mails_raises_failed_batch_subresponse(
+    auth_usecases: AuthenticationUseCases,
+    mail_usecases: MailUseCases,
+    mock_graph_client: AsyncMock
+):
+    """Test that an account whose batch subrequest failed fails the query."""
+    account_ids = await register_accounts(auth_usecases, 2, shared_token=True)
+    mock_graph_client.batch_get_messages.return_value = {
+        account_ids[0]: {"status": 200, "body": {"value": [graph_message("m0")]}},
+        account_ids[1]: {"status": 429, "body": {"error": {"code": "TooManyRequests"}}}
+    }
+    
+    with pytest.raises(ExternalAPIErrorException):
+        await mail_usecases.query_mails(direction=MailDirection.RECEIVED)
@@ -0,0 +1,137 @@
+"""Tests for the batching write queue."""
+
+import asyncio
+import pytest
+from dataclasses import dataclass
+from typing import Any, List
+
+from core.services.write_queue import BatchingWriteQueue
+
+
+@dataclass
+class LogRecord:
+    value: int
+
+
+@dataclass
+class CallRecord:
+    value: int
+
+
+class RecordingWriter:
+    """Bulk writer that records each batch it is given."""
+    
+    def __init__(self, delay: float = 0):
+        self.batches: List[List[Any]] = []
+        self.delay = delay
+    
+    async def __call__(self, records: List[Any]) -> None:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.batches.append(list(records))
+    
+    @property
+    def records(self) -> List[Any]:
+        return [record for batch in self.batches for record in batch]
+
+
+@pytest.mark.asyncio
+async def test_flush_writes_queued_records():
+    """Test that flush writes queued records without waiting out the flush interval."""
+    writer = RecordingWriter()
+    queue = BatchingWriteQueue({LogRecord: writer}, flush_interval=60)
+    
+    for i in range(3):
+        await queue.enqueue(LogRecord(i))
+    await asyncio.wait_for(queue.flush(), timeout=1)
+    
+    assert writer.records == [LogRecord(0), LogRecord(1), LogRecord(2)]
+    await queue.aclose()
+
+
+@pytest.mark.asyncio
+async def test_batches_grouped_by_type():
+    """Test that one batch calls each type's writer once with its records."""
+    logs = RecordingWriter()
+    calls = RecordingWriter()
+    queue = BatchingWriteQueue({LogRecord: logs, CallRecord: calls})
+    
+    for i in range(4):
+        await queue.enqueue(LogRecord(i) if i % 2 else CallRecord(i))
+    await queue.flush()
+    
+    assert logs.batches == [[LogRecord(1), LogRecord(3)]]
+    assert calls.batches == [[CallRecord(0), CallRecord(2)]]
+    await queue.aclose()
+
+
+@pytest.mark.asyncio
+async def test_batches_bounded_by_batch_size():
+    """Test that a batch never holds more than batch_size records."""
+    writer = RecordingWriter()
+    queue = BatchingWriteQueue({LogRecord: writer}, batch_size=2)
+    
+    for i in range(5):
+        await queue.enqueue(LogRecord(i))
+    await queue.flush()
+    
+    assert [len(batch) for batch in writer.batches] == [2, 2, 1]
+    await queue.aclose()
+
+
+@pytest.mark.asyncio
+async def test_aclose_writes_queued_records_and_stops():
+    """Test that aclose writes what is queued before stopping the worker."""
+    writer = RecordingWriter(delay=0.01)
+    queue = BatchingWriteQueue({LogRecord: writer})
+    queue.start()
+    
+    await queue.enqueue(LogRecord(1))
+    await queue.aclose()
+    
+    assert writer.records == [LogRecord(1)]
+    assert queue._worker is None
+
+
+@pytest.mark.asyncio
+async def test_full_queue_writes_record_inline():
+    """Test that enqueue writes a record itself rather than wait for space."""
+    writer = RecordingWriter()
+    queue = BatchingWriteQueue({LogRecord: writer}, maxsize=1)
+    
+    # The worker has not run yet, so the second record finds the queue full
+    await queue.enqueue(LogRecord(1))
+    await queue.enqueue(LogRecord(2))
+    assert writer.batches == [[LogRecord(2)]]
+    
+    await queue.aclose()
+    assert writer.records == [LogRecord(2), LogRecord(1)]
+
+
+@pytest.mark.asyncio
+async def test_writer_error_does_not_stop_worker():
+    """Test that a failing writer is logged and later batches still written."""
+    calls = RecordingWriter()
+    
+    async def failing(records):
+        raise RuntimeError("database unavailable")
+    
+    queue = BatchingWriteQueue({LogRecord: failing, CallRecord: calls})
+    
+    await queue.enqueue(LogRecord(1))
+    await queue.flush()
+    await queue.enqueue(CallRecord(2))
+    await queue.flush()
+    
+    assert calls.records == [CallRecord(2)]
+    await queue.aclose()
+
+
+@pytest.mark.asyncio
+async def test_enqueue_rejects_unregistered_type():
+    """Test that a record without a registered writer is rejected."""
+    queue = BatchingWriteQueue({LogRecord: RecordingWriter()})
+    
+    with pytest.raises(TypeError):
+        await queue.enqueue(CallRecord(1))
+    await queue.aclose()